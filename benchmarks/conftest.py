@@ -0,0 +1,84 @@
+"""Fixtures for benchmarks parameterized by number of fabrication elements.
+
+Run using ``invoke benchmark`` or ``pytest benchmarks``, limit the element
+counts with e.g. ``pytest benchmarks --element-counts 100,1000``.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import pytest
+from compas.geometry import Frame
+from compas_fab.robots import Configuration
+
+from rapid_clay_formations_fab.fab_data import PlaceElement
+from rapid_clay_formations_fab.robots import MinimalTrajectories
+from rapid_clay_formations_fab.robots import MinimalTrajectory
+from rapid_clay_formations_fab.robots import PickStation
+
+ELEMENT_COUNTS = (100, 1000, 10000, 50000)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--element-counts",
+        default=",".join(str(n) for n in ELEMENT_COUNTS),
+        help="Comma separated numbers of elements to run benchmarks with.",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "n_elements" in metafunc.fixturenames:
+        option = metafunc.config.getoption("element_counts")
+        counts = [int(n) for n in option.split(",")]
+        metafunc.parametrize("n_elements", counts, scope="session")
+
+
+def _make_element(i):
+    # Grid of 100 elements per row
+    x, y = (i % 100) * 100.0, (i // 100) * 100.0
+    location = Frame([x, y, 0.0], [1, 0, 0], [0, -1, 0])
+
+    configurations = [
+        Configuration.from_revolute_values([0.01 * i + 0.1 * j] * 6) for j in range(3)
+    ]
+    place_frames = [
+        Frame([x, y, z], [1, 0, 0], [0, -1, 0]) for z in (350.0, 150.0, 75.0)
+    ]
+
+    return PlaceElement(
+        location,
+        str(i),
+        travel_trajectories=MinimalTrajectories([MinimalTrajectory(configurations)]),
+        place_trajectories=MinimalTrajectories(
+            [MinimalTrajectory([frame]) for frame in place_frames]
+        ),
+        cycle_time=10.0,
+        placed=True,
+        time_placed=1.6e9,
+    )
+
+
+@pytest.fixture(scope="session")
+def elements(n_elements):
+    """Elements with travel and place trajectories, shared between benchmarks.
+
+    Benchmarks should not modify the elements.
+    """
+    return [_make_element(i) for i in range(n_elements)]
+
+
+@pytest.fixture(scope="session")
+def pick_station():
+    return PickStation(
+        [Frame([-500.0, i * 100.0, 0.0], [1, 0, 0], [0, -1, 0]) for i in range(10)]
+    )
+
+
+@pytest.fixture(scope="session")
+def run_data(elements, pick_station):
+    return {
+        "fab_data": elements,
+        "pick_station": pick_station,
+        "conf_path": "conf.yaml",
+    }
@@ -0,0 +1,51 @@
+"""Time copying data model objects.
+
+Run using ``pytest -s benchmarks``.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import timeit
+
+import pytest
+from compas.geometry import Frame
+from compas_fab.robots import Configuration
+
+from rapid_clay_formations_fab.fab_data import PlaceElement
+from rapid_clay_formations_fab.robots import MinimalTrajectories
+from rapid_clay_formations_fab.robots import MinimalTrajectory
+
+N_ELEMENTS = 10000
+
+
+@pytest.fixture
+def elements():
+    trajectories = MinimalTrajectories(
+        [
+            MinimalTrajectory([Frame.worldXY(), Frame.worldYZ()]),
+            MinimalTrajectory([Configuration.from_revolute_values([0] * 6)]),
+        ]
+    )
+    return [
+        PlaceElement(Frame.worldXY(), str(i), travel_trajectories=trajectories)
+        for i in range(N_ELEMENTS)
+    ]
+
+
+def _time(func, elements):
+    return min(timeit.repeat(lambda: [func(e) for e in elements], number=1, repeat=3))
+
+
+def test_place_element_copy(elements):
+    from_data = _time(lambda e: PlaceElement.from_data(e.data), elements)
+    shallow = _time(lambda e: e.copy(deep=False), elements)
+    deep = _time(lambda e: e.copy(), elements)
+
+    print(
+        "\nCopying {} PlaceElements: {:.3f} s from_data(data), "
+        "{:.3f} s copy(deep=False), {:.3f} s copy()".format(
+            N_ELEMENTS, from_data, shallow, deep
+        )
+    )
+    assert shallow < from_data
@@ -0,0 +1,83 @@
+"""Benchmark data model hot paths with pytest-benchmark.
+
+Run using ``invoke benchmark``, see ``benchmarks/conftest.py`` for options.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import json
+
+from compas.utilities import DataDecoder
+from compas.utilities import DataEncoder
+
+from rapid_clay_formations_fab.fab_data import PlaceElement
+from rapid_clay_formations_fab.fab_data.tools import csv_reports
+
+ROUNDS = 3
+
+
+def _clear_caches(elements):
+    for elem in elements:
+        elem.clear_cache()
+
+
+def test_place_element_to_data(benchmark, elements):
+    benchmark.pedantic(
+        lambda: [elem.to_data() for elem in elements], rounds=ROUNDS, iterations=1
+    )
+
+
+def test_place_element_from_data(benchmark, elements):
+    data = [elem.to_data() for elem in elements]
+    benchmark.pedantic(
+        lambda: [PlaceElement.from_data(d) for d in data], rounds=ROUNDS, iterations=1
+    )
+
+
+def test_run_data_encode(benchmark, run_data):
+    benchmark.pedantic(
+        lambda: json.dumps(run_data, cls=DataEncoder), rounds=ROUNDS, iterations=1
+    )
+
+
+def test_run_data_decode(benchmark, run_data):
+    encoded = json.dumps(run_data, cls=DataEncoder)
+
+    def decode():
+        # Access an attribute so lazily decoded elements are decoded
+        run_data = json.loads(encoded, cls=DataDecoder)
+        return [elem.location for elem in run_data["fab_data"]]
+
+    benchmark.pedantic(decode, rounds=ROUNDS, iterations=1)
+
+
+def test_get_egress_frame(benchmark, elements):
+    benchmark.pedantic(
+        lambda: [elem.get_egress_frame() for elem in elements],
+        setup=lambda: _clear_caches(elements),
+        rounds=ROUNDS,
+        iterations=1,
+    )
+
+
+def test_get_compressed_top_frame(benchmark, elements):
+    benchmark.pedantic(
+        lambda: [elem.get_compressed_top_frame() for elem in elements],
+        setup=lambda: _clear_caches(elements),
+        rounds=ROUNDS,
+        iterations=1,
+    )
+
+
+def test_csv_reports(benchmark, run_data, tmp_path):
+    json_file = tmp_path / "run_data.json"
+    with json_file.open(mode="w") as fp:
+        json.dump(run_data, fp, cls=DataEncoder)
+
+    args = argparse.Namespace(json_files=[str(json_file)], clobber=True)
+
+    benchmark.pedantic(csv_reports, args=(args,), rounds=ROUNDS, iterations=1)
+
+    assert json_file.with_suffix(".csv").exists()
@@ -0,0 +1,56 @@
+"""Memory use of data model objects.
+
+Run using ``pytest benchmarks``.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import gc
+import tracemalloc
+
+import pytest
+from compas.geometry import Frame
+
+from rapid_clay_formations_fab.fab_data import PlaceElement
+
+N_ELEMENTS = 10000
+
+
+class _DictElement(object):
+    """Element attributes in a per instance ``__dict__``, like before ``__slots__``."""
+
+    def __init__(self, element):  # type: (PlaceElement) -> None
+        for cls in type(element).__mro__:
+            for name in getattr(cls, "__slots__", ()):
+                if hasattr(element, name):
+                    self.__dict__[name] = getattr(element, name)
+
+
+def _get_allocated_size(func, frame):
+    gc.collect()
+    tracemalloc.start()
+    elements = [func(PlaceElement(frame, str(i))) for i in range(N_ELEMENTS)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del elements
+    return size
+
+
+@pytest.fixture
+def frame():
+    # Shared, to measure the elements themselves
+    return Frame.worldXY()
+
+
+def test_place_element_memory(frame):
+    slotted = _get_allocated_size(lambda elem: elem, frame)
+    with_dict = _get_allocated_size(_DictElement, frame)
+
+    print(
+        "\n{} PlaceElements: {:.0f} kB with __slots__, {:.0f} kB with __dict__".format(
+            N_ELEMENTS, slotted / 1024, with_dict / 1024
+        )
+    )
+    assert not hasattr(PlaceElement(frame, "elem"), "__dict__")
+    assert slotted < with_dict
@@ -0,0 +1,54 @@
+"""Benchmark trajectory and pick station hot paths with pytest-benchmark.
+
+Run using ``invoke benchmark``, see ``benchmarks/conftest.py`` for options.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from rapid_clay_formations_fab.robots import ArrayTrajectory
+
+ROUNDS = 3
+
+
+def test_travel_trajectory_to_compas_rrc(benchmark, elements):
+    trajectories = [elem.travel_trajectories[0] for elem in elements]
+    benchmark.pedantic(
+        lambda: [trajectory.to_compas_rrc() for trajectory in trajectories],
+        rounds=ROUNDS,
+        iterations=1,
+    )
+
+
+def test_place_trajectory_to_compas_rrc(benchmark, elements):
+    trajectories = [elem.place_trajectories[0] for elem in elements]
+    benchmark.pedantic(
+        lambda: [trajectory.to_compas_rrc() for trajectory in trajectories],
+        rounds=ROUNDS,
+        iterations=1,
+    )
+
+
+def test_reversed_recursively(benchmark, elements):
+    benchmark.pedantic(
+        lambda: [elem.travel_trajectories.reversed_recursively() for elem in elements],
+        rounds=ROUNDS,
+        iterations=1,
+    )
+
+
+def test_get_next_pick_elem(benchmark, elements, pick_station):
+    benchmark.pedantic(
+        lambda: [pick_station.get_next_pick_elem() for _ in elements],
+        rounds=ROUNDS,
+        iterations=1,
+    )
+
+
+def test_array_travel_trajectory_to_compas_rrc(benchmark, elements):
+    trajectories = [ArrayTrajectory(elem.travel_trajectories[0]) for elem in elements]
+    benchmark.pedantic(
+        lambda: [trajectory.to_compas_rrc() for trajectory in trajectories],
+        rounds=ROUNDS,
+        iterations=1,
+    )
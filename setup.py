@@ -40,6 +40,7 @@ def _read(*names, **kwargs):
         "mypy >= 0.790",
         "pydocstyle",
         "pytest >= 3.2",
+        "pytest-benchmark >= 3.2",
         "recommonmark >=0.6",
         "setuptools_scm[toml] >= 4.1.2",
         "sphinx_compas_theme >= 0.11.4",
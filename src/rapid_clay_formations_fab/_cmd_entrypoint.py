@@ -7,7 +7,6 @@
 from __future__ import print_function
 
 import argparse
-import json
 import logging
 import pathlib
 import sys
@@ -16,12 +15,13 @@
 
 import confuse
 from compas.rpc.services.default import start_service as start_rpc_service
-from compas.utilities import DataDecoder
 
 import rapid_clay_formations_fab.robots._scripts as scripts
 from rapid_clay_formations_fab import __version__
+from rapid_clay_formations_fab import metrics
 from rapid_clay_formations_fab.fab_data import ABB_RCF_CONF_TEMPLATE
 from rapid_clay_formations_fab.fab_data import fab_conf
+from rapid_clay_formations_fab.fab_data import read_run_data
 from rapid_clay_formations_fab.rhino.install import install_pkgs_to_rhino
 
 log = logging.getLogger(name=None)  # no name means we get the root logger
@@ -89,6 +89,13 @@ def main() -> None:
     )
     parser_goto.set_defaults(func=scripts.go_to_joint_pos)
 
+    # daemon
+    parser_daemon = subparsers.add_parser(
+        "daemon",
+        help="Keep driver and ROS connection running for other commands.",
+    )
+    parser_daemon.set_defaults(func=scripts.driver_daemon)
+
     # install
     parser_rhino_install = subparsers.add_parser(
         "rhino_install",
@@ -115,12 +122,35 @@ def main() -> None:
         help="File containing fabrication setup.",
     )
 
+    # simulate
+    parser_simulate = subparsers.add_parser(
+        "simulate",
+        aliases=["sim"],
+        help="Estimate cycle times without a robot.",
+    )
+    parser_simulate.set_defaults(func=_simulate_entrypoint)
+
+    parser_simulate.add_argument(
+        "run_data_path",
+        type=pathlib.Path,
+        help="File containing fabrication setup.",
+    )
+
+    parser_simulate.add_argument(
+        "--skip_all_pick_movements",
+        action="store_true",
+        help="Skip all motions included in picking procedure.",
+    )
+
     args = parser.parse_args()
 
     _setup_logger(args)
 
     # Run function defined as default for each subparser.
-    args.func(args)
+    try:
+        args.func(args)
+    finally:
+        metrics.log_metrics()
 
 
 def _rpc_entrypoint(*args):
@@ -155,10 +185,20 @@ def _test_entrypoint(args):
     scripts.test_speeds(run_conf, run_data)
 
 
+def _simulate_entrypoint(args: argparse.Namespace) -> None:
+    run_data = _load_rundata(args.run_data_path)
+    run_conf = _setup_run_conf(args, run_data)
+
+    scripts.simulate(run_conf, run_data)
+
+
 def _load_rundata(run_data_path: pathlib.Path) -> typing.Any:
-    # Load dictionary from file specified on command line
-    with run_data_path.open(mode="r") as f:
-        run_data = json.load(f, cls=DataDecoder)
+    # Load dictionary from file specified on command line, falls back to the
+    # newest valid rotated copy if the file is incomplete or corrupted.
+    # Trajectories are decoded when first used. Progress journaled since
+    # run_data was last written in full is applied.
+    run_data = read_run_data(run_data_path, lazy=True, replay_journal=True)
+
     return typing.cast(dict, run_data)  # cast does not change or check during runtime
 
 
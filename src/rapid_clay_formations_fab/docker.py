@@ -7,6 +7,12 @@
 
 Docker compose commands to be used from python scripts.
 
+Compose files are run with the ``docker-compose`` command line tool. On
+CPython the other commands go through the Docker API using one shared
+client, see :func:`get_docker_client`, and on IronPython through the
+``docker`` command line tool. The duration of each command is recorded in
+:mod:`rapid_clay_formations_fab.metrics`, e.g. as ``docker.compose_up``.
+
 .. autosummary::
     :toctree: generated/
     :nosignatures:
@@ -14,21 +20,49 @@
     compose_up
     compose_down
     restart_container
+    get_container_attrs
+    get_container_health
+    get_docker_client
 """
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import json
 import logging
 import os
 import shlex
 import subprocess
 import sys
+import threading
 
 from compas import IPY
 
+from rapid_clay_formations_fab import metrics
+
 log = logging.getLogger(__name__)
 
+_docker_client = None
+_docker_client_lock = threading.Lock()
+
+
+def get_docker_client():
+    """Get Docker API client shared by all commands, created on first use.
+
+    Returns
+    -------
+    :class:`docker.DockerClient`
+    """
+    global _docker_client
+
+    with _docker_client_lock:
+        if _docker_client is None:
+            import docker
+
+            _docker_client = docker.client.from_env()
+
+        return _docker_client
+
 
 def _setup_env_vars(env_vars):
     list_vars = []
@@ -93,6 +127,29 @@ def compose_up(
     env_vars : :class:`dict`, optional
         Environment variables to set before running ``docker-compose``
     """
+    with metrics.timed("docker.compose_up"):
+        _compose_up_subprocess(
+            path,
+            overrides=overrides,
+            force_recreate=force_recreate,
+            remove_orphans=remove_orphans,
+            ignore_orphans=ignore_orphans,
+            print_output=print_output,
+            check_output=check_output,
+            env_vars=env_vars,
+        )
+
+
+def _compose_up_subprocess(
+    path,
+    overrides=None,
+    force_recreate=False,
+    remove_orphans=False,
+    ignore_orphans=True,
+    print_output=True,
+    check_output=True,
+    env_vars=None,
+):
     env_vars = env_vars if env_vars else {}
 
     run_kwargs = {}
@@ -139,6 +196,13 @@ def compose_down(path, check_output=True, print_output=True):
     check_output : :class:`bool`, optional
         Raise if ``docker-compose`` fails. Defaults to ``True``.
     """
+    with metrics.timed("docker.compose_down"):
+        _compose_down_subprocess(
+            path, check_output=check_output, print_output=print_output
+        )
+
+
+def _compose_down_subprocess(path, check_output=True, print_output=True):
     cmd_str = 'docker-compose --file "{}" down'.format(path)
     cmd = shlex.split(cmd_str)
 
@@ -147,6 +211,15 @@ def compose_down(path, check_output=True, print_output=True):
     _run(cmd, check_output=check_output, print_output=print_output)
 
 
+def _get_container(client, container_name):
+    import docker
+
+    try:
+        return client.containers.get(container_name)
+    except docker.errors.NotFound:
+        return None
+
+
 def restart_container(container_name):
     """Run ``docker restart`` for specified container.
 
@@ -156,7 +229,8 @@ def restart_container(container_name):
         Name of container to restart.
     """
     func = _get_restart_container_func()
-    return func(container_name)
+    with metrics.timed("docker.restart_container"):
+        return func(container_name)
 
 
 def _get_restart_container_func():
@@ -166,7 +240,6 @@ def _get_restart_container_func():
 
 
 def _restart_container_subprocess(container_name):
-    cmd_str = 'docker-compose --file "{}" down'.format(container_name)
     cmd_str = 'docker restart "{}"'.format(container_name)
     cmd = shlex.split(cmd_str)
 
@@ -176,11 +249,73 @@ def _restart_container_subprocess(container_name):
 
 
 def _restart_container_dockerpy(name):
-    import docker
-
-    d = docker.client.from_env()
+    log.debug("Restarting {}".format(name))
 
-    container = d.containers.get(name)
+    container = get_docker_client().containers.get(name)
     container.restart()
 
-    d.close()
+
+def get_container_attrs(container_name):
+    """Get low-level information about container, as from ``docker inspect``.
+
+    Parameters
+    ----------
+    container_name : :class:`str`
+        Name of container.
+
+    Returns
+    -------
+    :class:`dict` or :obj:`None`
+        Container information, e.g. ``State``, ``Config`` and ``Args``.
+        ``None`` if there is no container with that name.
+    """
+    func = _get_container_attrs_func()
+    with metrics.timed("docker.get_container_attrs"):
+        return func(container_name)
+
+
+def _get_container_attrs_func():
+    if IPY:
+        return _get_container_attrs_subprocess
+    return _get_container_attrs_dockerpy
+
+
+def _get_container_attrs_subprocess(container_name):
+    cmd = ["docker", "inspect", "--type", "container", container_name]
+
+    try:
+        output = subprocess.check_output(cmd, stderr=subprocess.STDOUT)
+    except subprocess.CalledProcessError:
+        return None
+
+    return json.loads(output.decode("utf-8"))[0]
+
+
+def _get_container_attrs_dockerpy(container_name):
+    container = _get_container(get_docker_client(), container_name)
+    return container.attrs if container else None
+
+
+def get_container_health(container_name):
+    """Get health of container, or its state if it has no health check.
+
+    Parameters
+    ----------
+    container_name : :class:`str`
+        Name of container.
+
+    Returns
+    -------
+    :class:`str` or :obj:`None`
+        ``"healthy"``, ``"unhealthy"`` or ``"starting"`` for containers with
+        health checks, otherwise the container state, e.g. ``"running"``.
+        ``None`` if there is no container with that name.
+    """
+    attrs = get_container_attrs(container_name)
+    if not attrs:
+        return None
+
+    state = attrs["State"]
+    if state.get("Health"):
+        return state["Health"]["Status"]
+    return state["Status"]
@@ -15,6 +15,9 @@
 from compas import IPY
 
 from .fabrication_element import *  # noqa: F401,F403
+from .run_data import *  # noqa: F401,F403
 
 if not IPY:
     from .fab_conf import *  # noqa: F401,F403
+    from .place_element_array import *  # noqa: F401,F403
+    from .run_data_npz import *  # noqa: F401,F403
@@ -45,7 +45,7 @@ def convert(self, value, view):
     "run_data_path": confuse.Template(),  # Already type checked by argparse
     "robot_client": {
         "controller": str,
-        "docker": {"timeout_ping": float, "sleep_after_up": float},
+        "docker": {"timeout_ping": float, "deadline": float},
         "wobjs": {"pick": str, "place": str},
         "tools": {
             "pick_place": {
@@ -58,6 +58,8 @@ def convert(self, value, view):
         },
         "skip_all_pick_movements": bool,
         "wait_at_place_egress": int,
+        "look_ahead": int,
+        "record_phase_times": bool,
         "robot_movement": {
             "global_speed_accel": {
                 "speed_override": float,
@@ -3,11 +3,16 @@
 from __future__ import division
 from __future__ import print_function
 
+import copy
+import functools
 import math
+import sys
 
 import compas.datastructures
 import compas.geometry as cg
 
+from rapid_clay_formations_fab.fab_data.run_data import EncodedData
+
 try:
     import Rhino.Geometry as rg
 
@@ -19,6 +24,10 @@
     import typing
 
     if typing.TYPE_CHECKING:
+        from typing import Dict
+        from typing import List
+        from typing import Optional
+
         from compas_rrc import FutureResult
 
         from rapid_clay_formations_fab.robots import MinimalTrajectories
@@ -26,6 +35,101 @@
     pass
 
 
+# Phases of a pick and place cycle, in the order they are executed
+CYCLE_PHASES = (
+    "pick_approach",
+    "needles_extend",
+    "travel",
+    "egress_wait",
+    "press",
+    "return",
+)
+
+
+class _LazyDecoded(object):
+    """Attribute decoding :class:`EncodedData` when first accessed.
+
+    The value is stored on the instance under the attribute name prefixed by
+    an underscore.
+    """
+
+    def __init__(self, name):  # type: (str) -> None
+        self.attr_name = "_" + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+
+        value = getattr(obj, self.attr_name)
+        if _is_encoded(value):
+            value = value.decode()
+            setattr(obj, self.attr_name, value)
+        return value
+
+    def __set__(self, obj, value):
+        setattr(obj, self.attr_name, value)
+
+
+def _is_encoded(value):  # type: (object) -> bool
+    """Check if value is :class:`EncodedData` or trajectories packed in ``.npz``."""
+    if isinstance(value, EncodedData):
+        return True
+
+    # Only in sys.modules if run data has been read from a .npz file. Not
+    # imported here since it imports this module and NumPy.
+    run_data_npz = sys.modules.get("rapid_clay_formations_fab.fab_data.run_data_npz")
+    return run_data_npz is not None and isinstance(
+        value, run_data_npz._PackedTrajectories
+    )
+
+
+def _get_slot_names(cls):  # type: (type) -> List[str]
+    """Get names of all slots defined by class and its bases."""
+    try:
+        return _SLOT_NAMES[cls]
+    except KeyError:
+        names = []
+        for klass in reversed(cls.__mro__):
+            names.extend(klass.__dict__.get("__slots__", ()))
+        _SLOT_NAMES[cls] = names
+        return names
+
+
+_SLOT_NAMES = {}  # type: Dict[type, List[str]]
+
+
+def _cached(method):
+    """Cache return value of method until the element is modified.
+
+    See :meth:`FabricationElement.clear_cache`.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (name, args, tuple(sorted(kwargs.items())))
+        if self._cache is None:
+            self._cache = {}
+        try:
+            return self._cache[key]
+        except KeyError:
+            value = self._cache[key] = method(self, *args, **kwargs)
+            return value
+
+    return wrapper
+
+
+def _deepcopy(value):
+    # Encoded data is not modified when decoded and can be shared
+    if _is_encoded(value):
+        return value
+    # copy methods of COMPAS objects and trajectories are deep and a lot faster
+    # than copy.deepcopy
+    if not isinstance(value, (dict, list)) and hasattr(value, "copy"):
+        return value.copy()
+    return copy.deepcopy(value)
+
+
 class FabricationElement(object):
     """Describes a fabrication element in the RCF process.
 
@@ -45,8 +149,47 @@ class FabricationElement(object):
         Distance from top frame to travel to before interacting with element.
     attrs : :obj:`dict`, optional
         Any other attributes needed.
+
+    Notes
+    -----
+    Derived frames and geometry are cached and the same objects are returned
+    until :attr:`location`, :attr:`radius`, :attr:`height`,
+    :attr:`egress_frame_distance` or :attr:`compression_ratio` is set or
+    :meth:`transform` is called. Copy them before modifying them and call
+    :meth:`clear_cache` if :attr:`location` is modified in place.
+
+    Instances use ``__slots__`` to save memory, so only the attributes listed
+    above can be set. Use :attr:`attrs` for anything else.
+
+    :meth:`copy` shares attribute values with the original unless ``deep`` is
+    set, modifying e.g. :attr:`location` in place on a shallow copy also
+    modifies the original.
     """
 
+    __slots__ = (
+        "_cache",
+        "location",
+        "id_",
+        "radius",
+        "height",
+        "egress_frame_distance",
+        "attrs",
+    )
+
+    # Attributes not copied by copy(deep=True)
+    _SHARED_ON_DEEP_COPY = frozenset(("_cache",))
+
+    # Attributes used to derive frames and geometry
+    _CACHE_INVALIDATING_ATTRS = frozenset(
+        (
+            "location",
+            "radius",
+            "height",
+            "egress_frame_distance",
+            "compression_ratio",
+        )
+    )
+
     def __init__(
         self,
         location,  # type: cg.Frame
@@ -56,6 +199,8 @@ def __init__(
         egress_frame_distance=200,  # type: float
         attrs=None,  # type: dict
     ):  # type: (...) -> None
+        self._cache = None  # type: dict
+
         self.location = location
         self.id_ = id_
         self.radius = radius
@@ -63,6 +208,11 @@ def __init__(
         self.egress_frame_distance = egress_frame_distance
         self.attrs = attrs or {}
 
+    def __setattr__(self, name, value):
+        if name in self._CACHE_INVALIDATING_ATTRS:
+            self.clear_cache()
+        super(FabricationElement, self).__setattr__(name, value)
+
     def __repr__(self):
         return "FabricationElement({}, {}, {}, {}. {})".format(
             self.location,
@@ -101,6 +251,13 @@ def transform(self, transformation):  # type: (cg.Transformation) -> None
         transformation : :class:`compas.geometry.Transformation`
         """
         self.location.transform(transformation)
+        self.clear_cache()
+
+    def clear_cache(self):  # type: () -> None
+        """Clear cached derived frames and geometry."""
+        # _cache might not be set yet when called from __setattr__
+        if getattr(self, "_cache", None):
+            self._cache = None
 
     def transformed(self, transformation):
         """Get a transformed copy of :class:`FabricationElement`.
@@ -113,13 +270,14 @@ def transformed(self, transformation):
         -------
         :class:`FabricationElement`
         """
-        copy = self.copy()
-        copy.transform(transformation)
+        copy = self.copy(deep=False)
+        copy.location = self.location.transformed(transformation)
         return copy
 
     # Derived frames
     #####################
 
+    @_cached
     def get_top_frame(self):
         """Top of uncompressed cylinder.
 
@@ -132,6 +290,7 @@ def get_top_frame(self):
 
         return self.location.transformed(T)
 
+    @_cached
     def get_egress_frame(self):
         """Get Frame at end and start of trajectory to and from.
 
@@ -195,6 +354,7 @@ def get_pt(self):
         """  # noqa: E501
         return self.location.point
 
+    @_cached
     def get_normal(self):
         """Get normal direction of cylinder.
 
@@ -207,6 +367,7 @@ def get_normal(self):
         """
         return self.location.normal * -1
 
+    @_cached
     def get_circle(self):
         """Get :class:`compas.geometry.Circle` representing fabrication element.
 
@@ -217,6 +378,7 @@ def get_circle(self):
         plane = cg.Plane(self.get_pt(), self.get_normal())
         return cg.Circle(plane, self.radius)
 
+    @_cached
     def get_cylinder(self):
         """Get :class:`compas.geometry.Cylinder` representing fabrication element.
 
@@ -227,6 +389,7 @@ def get_cylinder(self):
         circle = self.get_circle()
         return cg.Cylinder(circle, self.get_compressed_height())
 
+    @_cached
     def get_cgmesh(self, u_res=18):
         """Generate mesh representation of bullet with custom resolution.
 
@@ -292,16 +455,47 @@ def get_rgmesh(self, u_res=18):
     # Constructors and conversions
     ##############################
 
-    def copy(self):
+    def copy(self, deep=True):
         """Create a copy of this :class:`FabricationElement`.
 
+        Parameters
+        ----------
+        deep : :obj:`bool`, optional
+            Copy attribute values, e.g. :attr:`location`, :attr:`attrs` and
+            trajectories, defaults to ``True``. If ``False`` the values are
+            shared with the copy, so transforming one transforms both.
+
         Returns
         -------
         :class:`FabricationElement`
             An instance of :class:`FabricationElement`
         """
         cls = type(self)
-        return cls.from_data(self.data)
+        obj = cls.__new__(cls)
+
+        # Bypass __setattr__ to keep cache of original
+        for name in _get_slot_names(cls):
+            try:
+                value = getattr(self, name)
+            except AttributeError:
+                continue
+            if deep and name not in self._SHARED_ON_DEEP_COPY:
+                value = _deepcopy(value)
+            object.__setattr__(obj, name, value)
+
+        # Cached geometry is shared with a shallow copy, same as the location
+        if deep:
+            obj._cache = None
+        elif self._cache is not None:
+            obj._cache = dict(self._cache)
+
+        return obj
+
+    def __copy__(self):
+        return self.copy(deep=False)
+
+    def __deepcopy__(self, memo):
+        return self.copy(deep=True)
 
     def to_data(self):
         """Get :obj:`dict` representation of :class:`FabricationElement`."""
@@ -319,7 +513,8 @@ def from_data(cls, data):
         -------
         :class:`FabricationElement`
         """
-        obj = cls(cg.Frame.worldXY())
+        obj = cls.__new__(cls)
+        obj._cache = None
         obj.data = data
         return obj
 
@@ -356,14 +551,49 @@ class PlaceElement(FabricationElement):
         motion to placing egress.
     cycle_time : :obj:`float`, optional
         Cycle time from pick to place and back.
+    phase_times : :obj:`dict`, optional
+        Seconds spent in each phase of the cycle, by phase name in
+        :data:`CYCLE_PHASES`. Phases not measured are ``None``.
     placed : :obj:`bool`, optional
         If fabrication element has been placed or not.
     time_placed : :obj:`int`, optional
         Time in epoch (seconds from 1970) of fabrication element placement.
     attrs : :obj:`dict`, optional
         Any other attributes needed.
+
+    Notes
+    -----
+    Trajectories can be set to :class:`rapid_clay_formations_fab.fab_data.EncodedData`,
+    they are then decoded when first accessed. See
+    :func:`rapid_clay_formations_fab.fab_data.iter_fab_data`.
     """  # noqa: E501
 
+    __slots__ = (
+        "compression_ratio",
+        "_travel_trajectories",
+        "_place_trajectories",
+        "_return_travel_trajectories",
+        "_return_place_trajectories",
+        "cycle_time",
+        "phase_times",
+        "placed",
+        "time_placed",
+        "skip",
+        "skip_pick_movement",
+        "cycle_time_future",
+        "phase_futures",
+    )
+
+    # Run specific, see __init__
+    _SHARED_ON_DEEP_COPY = FabricationElement._SHARED_ON_DEEP_COPY | frozenset(
+        ("cycle_time_future", "phase_futures")
+    )
+
+    travel_trajectories = _LazyDecoded("travel_trajectories")
+    place_trajectories = _LazyDecoded("place_trajectories")
+    return_travel_trajectories = _LazyDecoded("return_travel_trajectories")
+    return_place_trajectories = _LazyDecoded("return_place_trajectories")
+
     def __init__(
         self,
         location,  # type: cg.Frame
@@ -382,6 +612,7 @@ def __init__(
         skip=False,  # type: bool
         skip_pick_movement=False,  # type: bool
         attrs=None,  # type: dict
+        phase_times=None,  # type: Dict[str, Optional[float]]
     ):  # type: (...) -> None
         super(PlaceElement, self).__init__(
             location,
@@ -399,6 +630,7 @@ def __init__(
         self.return_place_trajectories = return_place_trajectories
 
         self.cycle_time = cycle_time
+        self.phase_times = phase_times
         self.placed = placed
         self.time_placed = time_placed
 
@@ -407,6 +639,8 @@ def __init__(
 
         # Not included in data setter and getter since these values are run specific
         self.cycle_time_future = None  # type: FutureResult
+        # Watch readings at the end of phases, by phase name
+        self.phase_futures = None  # type: Dict[str, FutureResult]
 
     @property
     def data(self):
@@ -415,12 +649,14 @@ def data(self):
 
         data["compression_ratio"] = self.compression_ratio
 
-        data["travel_trajectories"] = self.travel_trajectories
-        data["return_travel_trajectories"] = self.return_travel_trajectories
-        data["place_trajectories"] = self.place_trajectories
-        data["return_place_trajectories"] = self.return_place_trajectories
+        # Private attributes to not decode trajectories not yet accessed
+        data["travel_trajectories"] = self._travel_trajectories
+        data["return_travel_trajectories"] = self._return_travel_trajectories
+        data["place_trajectories"] = self._place_trajectories
+        data["return_place_trajectories"] = self._return_place_trajectories
 
         data["cycle_time"] = self.cycle_time
+        data["phase_times"] = self.phase_times
         data["placed"] = self.placed
         data["time_placed"] = self.time_placed
 
@@ -443,6 +679,7 @@ def data(self, data):
         self.return_place_trajectories = data.get("return_place_trajectories")
 
         self.cycle_time = data.get("cycle_time")
+        self.phase_times = data.get("phase_times")
         self.placed = data.get("placed")
         self.time_placed = data.get("time_placed")
 
@@ -463,6 +700,7 @@ def get_uncompressed_top_frame(self):
         """
         return self.get_top_frame()
 
+    @_cached
     def get_compressed_top_frame(self):
         """Top of compressed element.
 
@@ -478,6 +716,7 @@ def get_compressed_top_frame(self):
     # Derived data points
     #####################
 
+    @_cached
     def get_compressed_radius(self):
         """Get radius in mm when compressed to defined compression ratio.
 
@@ -502,6 +741,7 @@ def get_compressed_height(self):
     # Construct geometrical representations of object using :any:`compas.geometry`.
     ###############################################################################
 
+    @_cached
     def get_circle(self):
         """Get :class:`compas.geometry.Circle` representing fabrication element.
 
@@ -512,6 +752,7 @@ def get_circle(self):
         plane = cg.Plane(self.get_pt(), self.get_normal())
         return cg.Circle(plane, self.get_compressed_radius())
 
+    @_cached
     def get_cylinder(self):
         """Get :class:`compas.geometry.Cylinder` representing fabrication element.
 
@@ -552,6 +793,7 @@ def from_data(cls, data):
         -------
         :class:`FabricationElement`
         """
-        obj = cls(cg.Frame.worldXY(), "")
-        obj.data = data
+        obj = super(PlaceElement, cls).from_data(data)
+        obj.cycle_time_future = None
+        obj.phase_futures = None
         return obj
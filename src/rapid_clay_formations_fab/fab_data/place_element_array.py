@@ -0,0 +1,322 @@
+"""Columnar collection of :class:`PlaceElement` and other vectorized operations.
+
+Not available in IronPython.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import math
+
+import numpy as np
+from compas.geometry import Frame
+
+from rapid_clay_formations_fab.fab_data.run_data import LAZY_DECODED_KEYS
+
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
+
+try:
+    import typing
+
+    if typing.TYPE_CHECKING:
+        from typing import Iterable
+        from typing import List
+        from typing import Optional
+        from typing import Tuple
+        from typing import Union
+
+        from compas.geometry import Transformation
+
+        from rapid_clay_formations_fab.fab_data.fabrication_element import PlaceElement
+        from rapid_clay_formations_fab.robots import MinimalTrajectories
+        from rapid_clay_formations_fab.robots import MinimalTrajectory
+        from rapid_clay_formations_fab.robots import PickStation
+except ImportError:
+    pass
+
+
+def frames_to_matrices(frames):  # type: (Iterable[Frame]) -> np.ndarray
+    """Get frames as an array of homogeneous transformation matrices.
+
+    Parameters
+    ----------
+    frames : :obj:`list` of :class:`compas.geometry.Frame`
+
+    Returns
+    -------
+    :class:`numpy.ndarray`
+        Array of shape (N, 4, 4). Columns are x axis, y axis, z axis and
+        origin of each frame.
+    """
+    values = np.array(
+        [list(f.point) + list(f.xaxis) + list(f.yaxis) for f in frames],
+        dtype=np.float64,
+    ).reshape((-1, 3, 3))
+
+    points, xaxes, yaxes = values[:, 0], values[:, 1], values[:, 2]
+
+    matrices = np.zeros((len(values), 4, 4))
+    matrices[:, :3, 0] = xaxes
+    matrices[:, :3, 1] = yaxes
+    matrices[:, :3, 2] = np.cross(xaxes, yaxes)
+    matrices[:, :3, 3] = points
+    matrices[:, 3, 3] = 1.0
+
+    return matrices
+
+
+def matrices_to_frames(matrices):  # type: (np.ndarray) -> List[Frame]
+    """Get frames from an array of homogeneous transformation matrices.
+
+    Parameters
+    ----------
+    matrices : :class:`numpy.ndarray`
+        Array of shape (N, 4, 4), see :func:`frames_to_matrices`.
+
+    Returns
+    -------
+    :obj:`list` of :class:`compas.geometry.Frame`
+    """
+    values = np.concatenate(
+        (matrices[:, :3, 3], matrices[:, :3, 0], matrices[:, :3, 1]), axis=1
+    ).tolist()
+    return [Frame(v[:3], v[3:6], v[6:]) for v in values]
+
+
+def transform_elements(elements, transformation, pick_station=None, copy=False):
+    # type: (List[PlaceElement], Transformation, Optional[PickStation], bool) -> Tuple[List[PlaceElement], Optional[PickStation]]  # noqa: E501
+    """Transform fabrication elements, their trajectories and a pick station.
+
+    All frames, the elements' locations, the frames in their frame
+    trajectories and the pick frames, are transformed by a single matrix
+    multiplication. Joint trajectories are left as they are.
+
+    Parameters
+    ----------
+    elements : :obj:`list` of :class:`PlaceElement`
+    transformation : :class:`compas.geometry.Transformation`
+    pick_station : :class:`rapid_clay_formations_fab.robots.PickStation`, optional
+    copy : :obj:`bool`, optional
+        Return transformed copies instead of modifying the objects in place.
+        Copies share everything that is not transformed, e.g. joint
+        trajectories. Defaults to ``False``.
+
+    Returns
+    -------
+    :obj:`tuple`
+        Elements and pick station, transformed copies if ``copy`` is ``True``.
+    """
+    frames = []
+    for elem in elements:
+        frames.append(elem.location)
+        for key in LAZY_DECODED_KEYS:
+            frames.extend(_iter_trajectory_frames(getattr(elem, key)))
+    if pick_station:
+        frames.extend(pick_station.pick_frames)
+
+    if not frames:
+        return elements, pick_station
+
+    matrix = np.array(transformation.matrix, dtype=np.float64)
+    matrices = np.matmul(matrix, frames_to_matrices(frames))
+
+    transformed = iter(matrices_to_frames(matrices))
+
+    if not copy:
+        for elem in elements:
+            _set_frame(elem.location, next(transformed))
+            for key in LAZY_DECODED_KEYS:
+                for trajectory in getattr(elem, key) or []:
+                    # Assigned back, trajectories may return new frames when
+                    # iterated, e.g. ArrayTrajectory
+                    if _is_frame_trajectory(trajectory):
+                        trajectory[:] = [next(transformed) for _ in trajectory]
+            elem.clear_cache()
+        if pick_station:
+            for frame in pick_station.pick_frames:
+                _set_frame(frame, next(transformed))
+        return elements, pick_station
+
+    elements_copy = []
+    for elem in elements:
+        elem_copy = elem.copy()
+        elem_copy.location = next(transformed)
+        for key in LAZY_DECODED_KEYS:
+            trajectories = getattr(elem, key)
+            if trajectories is not None:
+                setattr(elem_copy, key, _copy_trajectories(trajectories, transformed))
+        elements_copy.append(elem_copy)
+
+    pick_station_copy = None
+    if pick_station:
+        pick_station_copy = pick_station.copy()
+        pick_station_copy.pick_frames = [
+            next(transformed) for _ in pick_station.pick_frames
+        ]
+
+    return elements_copy, pick_station_copy
+
+
+def _set_frame(frame, transformed):  # type: (Frame, Frame) -> None
+    frame.point = transformed.point
+    frame.xaxis = transformed.xaxis
+    frame.yaxis = transformed.yaxis
+
+
+def _iter_trajectory_frames(trajectories):
+    # type: (Optional[MinimalTrajectories]) -> Iterable[Frame]
+    for trajectory in trajectories or []:
+        if _is_frame_trajectory(trajectory):
+            for frame in trajectory:
+                yield frame
+
+
+def _is_frame_trajectory(trajectory):  # type: (MinimalTrajectory) -> bool
+    return len(trajectory) > 0 and (
+        trajectory.trajectory_type == trajectory.FRAME_TRAJECTORY
+    )
+
+
+def _copy_trajectories(trajectories, transformed):
+    # type: (MinimalTrajectories, Iterable[Frame]) -> MinimalTrajectories
+    """Copy trajectories, replacing frames with the next transformed frames."""
+    copies = []
+    for trajectory in trajectories:
+        if _is_frame_trajectory(trajectory):
+            points = [next(transformed) for _ in trajectory]
+        else:
+            points = list(trajectory)
+        copies.append(type(trajectory)(points))
+    return type(trajectories)(copies)
+
+
+class PlaceElementArray(Sequence):
+    """Collection of :class:`PlaceElement` with its geometry stored as arrays.
+
+    Derived frames and values are computed for all elements at once. Indexing
+    returns the :class:`PlaceElement` objects the collection was created
+    from, slicing returns a new :class:`PlaceElementArray`.
+
+    The arrays are a snapshot of the elements' attributes, call :meth:`update`
+    after elements have been modified.
+
+    Parameters
+    ----------
+    elements : :obj:`list` of :class:`PlaceElement`
+    """
+
+    def __init__(self, elements):  # type: (Iterable[PlaceElement]) -> None
+        self.elements = list(elements)
+        self.update()
+
+    def __repr__(self):
+        return "PlaceElementArray({} elements)".format(len(self))
+
+    def __getitem__(self, index):
+        # type: (Union[int, slice]) -> Union[PlaceElement, PlaceElementArray]
+        if isinstance(index, slice):
+            return type(self)(self.elements[index])
+        return self.elements[index]
+
+    def __len__(self):  # type: () -> int
+        return len(self.elements)
+
+    def update(self):  # type: () -> None
+        """Update arrays from elements."""
+        elements = self.elements
+
+        self.locations = frames_to_matrices(e.location for e in elements)
+        self.radii = np.array([e.radius for e in elements], dtype=np.float64)
+        self.heights = np.array([e.height for e in elements], dtype=np.float64)
+        self.egress_frame_distances = np.array(
+            [e.egress_frame_distance for e in elements], dtype=np.float64
+        )
+        self.compression_ratios = np.array(
+            [e.compression_ratio for e in elements], dtype=np.float64
+        )
+
+    # Derived frames
+    ################
+
+    def get_normals(self):  # type: () -> np.ndarray
+        """Get normal directions, see :meth:`PlaceElement.get_normal`.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Array of shape (N, 3).
+        """
+        return self.locations[:, :3, 2] * -1
+
+    def get_top_frames(self):  # type: () -> np.ndarray
+        """Get top frames, see :meth:`PlaceElement.get_top_frame`.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Array of shape (N, 4, 4), see :func:`frames_to_matrices`.
+        """
+        return self._translate_along_normals(self.locations, self.heights)
+
+    def get_egress_frames(self):  # type: () -> np.ndarray
+        """Get egress frames, see :meth:`PlaceElement.get_egress_frame`.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Array of shape (N, 4, 4), see :func:`frames_to_matrices`.
+        """
+        return self._translate_along_normals(
+            self.locations, self.heights + self.egress_frame_distances
+        )
+
+    def get_compressed_top_frames(self):  # type: () -> np.ndarray
+        """Get compressed top frames, see :meth:`PlaceElement.get_compressed_top_frame`.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+            Array of shape (N, 4, 4), see :func:`frames_to_matrices`.
+        """  # noqa: E501
+        return self._translate_along_normals(
+            self.locations, self.get_compressed_heights()
+        )
+
+    def _translate_along_normals(self, matrices, distances):
+        # type: (np.ndarray, np.ndarray) -> np.ndarray
+        translated = matrices.copy()
+        translated[:, :3, 3] += self.get_normals() * distances[:, np.newaxis]
+        return translated
+
+    # Derived data points
+    #####################
+
+    def get_volumes(self):  # type: () -> np.ndarray
+        r"""Get volumes in mm\ :sup:`3`\ , see :meth:`PlaceElement.get_volume`.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+        """
+        return math.pi * self.radii ** 2 * self.heights
+
+    def get_compressed_heights(self):  # type: () -> np.ndarray
+        """Get compressed heights, see :meth:`PlaceElement.get_compressed_height`.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+        """
+        return self.heights * self.compression_ratios
+
+    def get_compressed_radii(self):  # type: () -> np.ndarray
+        """Get compressed radii, see :meth:`PlaceElement.get_compressed_radius`.
+
+        Returns
+        -------
+        :class:`numpy.ndarray`
+        """
+        return np.sqrt(self.get_volumes() / (self.get_compressed_heights() * math.pi))
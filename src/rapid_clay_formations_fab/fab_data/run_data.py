@@ -0,0 +1,778 @@
+"""Persistence of run data, the fabrication data and progress of a fabrication run."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import contextlib
+import gc
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue  # type: ignore
+
+from compas.utilities import DataDecoder
+from compas.utilities import DataEncoder
+
+try:
+    import typing
+
+    if typing.TYPE_CHECKING:
+        from typing import Any
+        from typing import Callable
+        from typing import Iterator
+        from typing import List
+        from typing import Tuple
+
+        from rapid_clay_formations_fab.fab_data import PlaceElement
+except ImportError:
+    pass
+
+log = logging.getLogger(__name__)
+
+JOURNAL_SUFFIX = ".journal"
+CHECKSUM_SUFFIX = ".sha256"
+NPZ_SUFFIX = ".npz"
+
+# Keys in encoded fabrication elements left encoded by lazy loading
+LAZY_DECODED_KEYS = (
+    "travel_trajectories",
+    "place_trajectories",
+    "return_travel_trajectories",
+    "return_place_trajectories",
+)
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+# Rotation number added by RotatingFileHandler, i.e. run_data.json.01
+ROTATION_PATTERN = re.compile(r"\.(\d+)$")
+
+# Attributes of PlaceElement that change during a fabrication run
+JOURNALED_ATTRS = ("placed", "cycle_time", "phase_times", "time_placed")
+
+
+def get_journal_path(run_data_path):  # type: (os.PathLike) -> str
+    """Get path of progress journal belonging to a run data file.
+
+    Parameters
+    ----------
+    run_data_path : :class:`os.PathLike`
+        Path to run data file.
+
+    Returns
+    -------
+    :obj:`str`
+    """
+    return str(run_data_path) + JOURNAL_SUFFIX
+
+
+def get_checksum_path(run_data_path):  # type: (os.PathLike) -> str
+    """Get path of checksum file belonging to a run data file.
+
+    Parameters
+    ----------
+    run_data_path : :class:`os.PathLike`
+        Path to run data file.
+
+    Returns
+    -------
+    :obj:`str`
+    """
+    return str(run_data_path) + CHECKSUM_SUFFIX
+
+
+def get_run_data_rotations(run_data_path):  # type: (os.PathLike) -> List[str]
+    """Get paths to rotated copies of a run data file, newest first.
+
+    Rotated copies are created by the fabrication script using
+    :func:`rotate_run_data` and are named like ``run_data.json.1``,
+    ``run_data.json.2`` and so on.
+
+    Parameters
+    ----------
+    run_data_path : :class:`os.PathLike`
+        Path to run data file, with or without a rotation number.
+
+    Returns
+    -------
+    :obj:`list` of :obj:`str`
+    """
+    base_path = ROTATION_PATTERN.sub("", str(run_data_path))
+    dir_name, base_name = os.path.split(base_path)
+
+    rotations = []
+    for name in os.listdir(dir_name or os.curdir):
+        if not name.startswith(base_name):
+            continue
+        match = ROTATION_PATTERN.match(name[len(base_name) :])
+        if match:
+            rotations.append((int(match.group(1)), os.path.join(dir_name, name)))
+
+    return [path for _, path in sorted(rotations)]
+
+
+def rotate_run_data(path, backup_count=100):  # type: (os.PathLike, int) -> None
+    """Rename run data file to its first rotated copy, shifting older copies.
+
+    Works like :meth:`logging.handlers.RotatingFileHandler.doRollover` but
+    checksum files (see :func:`get_checksum_path`) are renamed together with
+    their data files. A file without an up to date checksum, e.g. edited
+    from Grasshopper, gets a new checksum before it is rotated.
+
+    Parameters
+    ----------
+    path : :class:`os.PathLike`
+        Path to run data file.
+    backup_count : :obj:`int`, optional
+        Number of rotated copies to keep. Defaults to ``100``.
+    """
+    path = str(path)
+
+    for i in range(backup_count - 1, 0, -1):
+        src = "{}.{}".format(path, i)
+        if os.path.exists(src):
+            _rename_with_checksum(src, "{}.{}".format(path, i + 1))
+
+    if not os.path.exists(path):
+        return
+
+    checksum_path = get_checksum_path(path)
+    if not os.path.exists(checksum_path) or (
+        os.path.getmtime(path) > os.path.getmtime(checksum_path)
+    ):
+        with open(path, mode="rb") as fp:
+            checksum = hashlib.sha256(fp.read()).hexdigest()
+        _write_atomic(checksum_path, checksum.encode("ascii"))
+
+    _rename_with_checksum(path, path + ".1")
+
+
+def write_run_data(path, run_data):  # type: (os.PathLike, dict) -> None
+    """Serialize run data to a JSON file.
+
+    Run data is written in the binary format of
+    :mod:`rapid_clay_formations_fab.fab_data.run_data_npz` if ``path`` ends
+    with ``.npz``, otherwise as JSON.
+
+    The file is written to a temporary file which is then synced to disk and
+    renamed to ``path``, so an interrupted write never leaves a truncated file.
+    A SHA-256 checksum of the file is written next to it, see
+    :func:`get_checksum_path`.
+
+    Parameters
+    ----------
+    path : :class:`os.PathLike`
+        Path to run data file.
+    run_data : :obj:`dict`
+        Run data dictionary, containing fabrication elements under ``fab_data``.
+    """
+    if _is_npz(path):
+        from rapid_clay_formations_fab.fab_data.run_data_npz import dumps_run_data_npz
+
+        content = dumps_run_data_npz(run_data)
+    else:
+        content = json.dumps(run_data, cls=DataEncoder).encode("utf-8")
+    checksum = hashlib.sha256(content).hexdigest()
+
+    # Data first, checksum last. See _verify_checksum.
+    _write_atomic(str(path), content)
+    _write_atomic(get_checksum_path(path), checksum.encode("ascii"))
+
+    log.debug("Wrote run_data to {}.".format(path))
+
+
+def read_run_data(path, fallback=True, lazy=False, replay_journal=False):
+    # type: (os.PathLike, bool, bool, bool) -> dict
+    """Load run data from a JSON or ``.npz`` file.
+
+    Parameters
+    ----------
+    path : :class:`os.PathLike`
+        Path to run data file.
+    fallback : :obj:`bool`, optional
+        If the file can't be read, is incomplete or doesn't match its checksum,
+        load the newest valid rotated copy instead (see
+        :func:`get_run_data_rotations`). Rotated copies are only loaded if they
+        match their checksum. Defaults to ``True``.
+    lazy : :obj:`bool`, optional
+        Parse fabrication elements one by one and leave their trajectories
+        encoded until first accessed, see :func:`iter_fab_data`. Defaults to
+        ``False``. Trajectories are always lazily decoded from ``.npz`` files.
+    replay_journal : :obj:`bool`, optional
+        Apply progress from the journal of the loaded file, see
+        :class:`RunDataJournal`. The journal of ``path`` is not replayed on a
+        rotated copy, its records belong to a newer version of the run data.
+        Defaults to ``False``.
+
+    Returns
+    -------
+    :obj:`dict`
+
+    Raises
+    ------
+    :exc:`ValueError`
+        If neither the file nor any of its rotated copies are valid.
+    """
+    candidates = [str(path)]
+    if fallback:
+        candidates += [p for p in get_run_data_rotations(path) if p != str(path)]
+
+    for candidate in candidates:
+        try:
+            run_data = _read_verified(
+                candidate, lazy=lazy, strict=candidate != str(path)
+            )
+        except (IOError, OSError, ValueError) as e:
+            log.warning("Could not load run_data from {}: {}".format(candidate, e))
+            continue
+
+        if candidate != str(path):
+            log.warning("Loaded run_data from rotated copy {}.".format(candidate))
+
+        if replay_journal:
+            _replay_journal(path, candidate, run_data)
+        return run_data
+
+    raise ValueError("No valid run_data found for {}.".format(path))
+
+
+def _replay_journal(path, loaded_path, run_data):  # type: (str, str, dict) -> None
+    journal = RunDataJournal(get_journal_path(loaded_path))
+    if journal.exists():
+        n_records = journal.replay(run_data["fab_data"])
+        log.info(
+            "Replayed {} progress records from {}.".format(n_records, journal.path)
+        )
+
+    if loaded_path != str(path) and os.path.exists(get_journal_path(path)):
+        log.warning(
+            "Progress journaled in {} is not replayed on rotated copy.".format(
+                get_journal_path(path)
+            )
+        )
+
+
+def iter_fab_data(path):  # type: (os.PathLike) -> Iterator[PlaceElement]
+    """Iterate over the fabrication elements in a run data file.
+
+    The file is parsed one element at a time. Trajectories (see
+    :data:`LAZY_DECODED_KEYS`) are kept as :class:`EncodedData` and only
+    decoded when first accessed on the element.
+
+    Parameters
+    ----------
+    path : :class:`os.PathLike`
+        Path to run data file.
+
+    Yields
+    ------
+    :class:`rapid_clay_formations_fab.fab_data.PlaceElement`
+    """
+    with open(str(path), mode="rb") as fp:
+        text = fp.read().decode("utf-8")
+
+    for key, value in _iter_run_data_items(text):
+        if key == "fab_data":
+            yield _decode_element(value)
+
+
+def decode_data(obj):  # type: (Any) -> Any
+    """Decode an object parsed from JSON without :class:`compas.utilities.DataDecoder`.
+
+    Parameters
+    ----------
+    obj
+        :obj:`dict`, :obj:`list` or value parsed from JSON.
+
+    Returns
+    -------
+    Decoded object.
+    """  # noqa: E501
+    return _decode(obj, DataDecoder().object_hook)
+
+
+class EncodedData(object):
+    """Object in its encoded form, to be decoded when needed.
+
+    Serialized by :class:`compas.utilities.DataEncoder` exactly like the object
+    it represents.
+
+    Parameters
+    ----------
+    dtype : :obj:`str`
+        Data type of object, as written by :class:`compas.utilities.DataEncoder`.
+    value : :obj:`dict`
+        Data representation of object, parsed from JSON.
+    """
+
+    __slots__ = ("dtype", "value")
+
+    def __init__(self, dtype, value):  # type: (str, dict) -> None
+        self.dtype = dtype
+        self.value = value
+
+    def __repr__(self):
+        return "EncodedData({})".format(self.dtype)
+
+    def to_data(self):  # type: () -> dict
+        """Get data representation of encoded object."""
+        return self.value
+
+    def decode(self):  # type: () -> Any
+        """Decode object.
+
+        Returns
+        -------
+        Instance of class specified by :attr:`dtype`.
+        """
+        return decode_data({"dtype": self.dtype, "value": self.value})
+
+
+def _decode(obj, object_hook):  # type: (Any, Callable) -> Any
+    if isinstance(obj, dict):
+        return object_hook({k: _decode(v, object_hook) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return [_decode(v, object_hook) for v in obj]
+    return obj
+
+
+def _decode_element(obj):  # type: (dict) -> Any
+    object_hook = DataDecoder().object_hook
+
+    value = {}
+    for key, item in obj["value"].items():
+        if key in LAZY_DECODED_KEYS and isinstance(item, dict) and "dtype" in item:
+            value[key] = EncodedData(item["dtype"], item["value"])
+        else:
+            value[key] = _decode(item, object_hook)
+
+    return object_hook({"dtype": obj["dtype"], "value": value})
+
+
+def _iter_run_data_items(text):  # type: (str) -> Iterator[Tuple[str, Any]]
+    """Yield top level key value pairs, and each element of ``fab_data`` by itself."""
+    decoder = json.JSONDecoder()
+
+    idx = _expect(text, 0, "{")
+    if _peek(text, idx) == "}":
+        return
+
+    while True:
+        key, idx = decoder.raw_decode(text, idx)
+        idx = _expect(text, idx, ":")
+
+        if key == "fab_data" and _peek(text, idx) == "[":
+            idx = _expect(text, idx, "[")
+            while _peek(text, idx) != "]":
+                value, idx = decoder.raw_decode(text, idx)
+                yield key, value
+                idx = _skip_whitespace(text, idx)
+                if _peek(text, idx) == ",":
+                    idx = _skip_whitespace(text, idx + 1)
+            idx += 1
+        else:
+            value, idx = decoder.raw_decode(text, idx)
+            yield key, value
+
+        idx = _skip_whitespace(text, idx)
+        if _peek(text, idx) == "}":
+            return
+        idx = _expect(text, idx, ",")
+
+
+def _skip_whitespace(text, idx):  # type: (str, int) -> int
+    return _WHITESPACE.match(text, idx).end()
+
+
+def _peek(text, idx):  # type: (str, int) -> str
+    """Get character at ``idx``, raise :exc:`ValueError` at end of input."""
+    if idx >= len(text):
+        raise ValueError("Unexpected end of input at char {}.".format(idx))
+    return text[idx]
+
+
+def _expect(text, idx, char):  # type: (str, int, str) -> int
+    """Skip past ``char`` and any surrounding whitespace."""
+    idx = _skip_whitespace(text, idx)
+    if text[idx : idx + 1] != char:
+        raise ValueError("Expecting '{}' at char {}.".format(char, idx))
+    return _skip_whitespace(text, idx + 1)
+
+
+def _read_verified(path, lazy=False, strict=False):
+    # type: (str, bool, bool) -> dict
+    with open(path, mode="rb") as fp:
+        content = fp.read()
+
+    _verify_checksum(path, content, strict=strict)
+
+    if _is_npz(path):
+        from rapid_clay_formations_fab.fab_data.run_data_npz import loads_run_data_npz
+
+        return loads_run_data_npz(content)
+
+    text = content.decode("utf-8")
+
+    # Parsing creates a large number of containers but no reference cycles,
+    # so garbage collection passes triggered meanwhile are wasted time
+    with _gc_disabled():
+        if not lazy:
+            return json.loads(text, cls=DataDecoder)
+
+        run_data = {"fab_data": []}
+        for key, value in _iter_run_data_items(text):
+            if key == "fab_data":
+                run_data[key].append(_decode_element(value))
+            else:
+                run_data[key] = decode_data(value)
+        return run_data
+
+
+@contextlib.contextmanager
+def _gc_disabled():  # type: () -> Iterator[None]
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _is_npz(path):  # type: (os.PathLike) -> bool
+    return ROTATION_PATTERN.sub("", str(path)).endswith(NPZ_SUFFIX)
+
+
+def _verify_checksum(path, content, strict=False):
+    # type: (str, bytes, bool) -> None
+    """Raise :exc:`ValueError` if content doesn't match checksum of path.
+
+    Unless ``strict``, files without a checksum or modified after it was
+    written are accepted.
+    """
+    checksum_path = get_checksum_path(path)
+    if not os.path.exists(checksum_path):
+        if strict:
+            raise ValueError("No checksum for {}.".format(path))
+        return
+
+    with open(checksum_path, mode="rb") as fp:
+        expected = fp.read().decode("ascii").strip()
+
+    if hashlib.sha256(content).hexdigest() == expected:
+        return
+
+    # The checksum file is always written after the data file. A data file
+    # newer than its checksum has been written by something else, e.g. edited
+    # from Grasshopper, or the write was interrupted between the two renames.
+    if not strict and os.path.getmtime(path) > os.path.getmtime(checksum_path):
+        log.warning("{} was modified after its checksum was written.".format(path))
+        return
+
+    raise ValueError("Checksum mismatch for {}.".format(path))
+
+
+def _write_atomic(path, content):  # type: (str, bytes) -> None
+    tmp_path = path + ".tmp"
+    with open(tmp_path, mode="wb") as fp:
+        fp.write(content)
+        fp.flush()
+        os.fsync(fp.fileno())
+
+    _replace(tmp_path, path)
+    _fsync_dir(os.path.dirname(path))
+
+
+def _rename_with_checksum(src, dst):  # type: (str, str) -> None
+    _replace(src, dst)
+
+    # Remove checksum of overwritten file if src has none
+    if os.path.exists(get_checksum_path(src)):
+        _replace(get_checksum_path(src), get_checksum_path(dst))
+    elif os.path.exists(get_checksum_path(dst)):
+        os.remove(get_checksum_path(dst))
+
+
+def _replace(src, dst):  # type: (str, str) -> None
+    if hasattr(os, "replace"):
+        os.replace(src, dst)
+    else:  # IronPython
+        if os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+def _fsync_dir(dir_name):  # type: (str) -> None
+    """Make a rename durable, not possible on Windows."""
+    if os.name != "posix":
+        return
+    fd = os.open(dir_name or os.curdir, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class RunDataJournal(object):
+    """Append-only journal of progress made during a fabrication run.
+
+    Instead of serializing the whole run data after every placed element only
+    the attributes changed during a run (see :data:`JOURNALED_ATTRS`) are
+    appended as one JSON object per line. The journal is replayed on top of
+    the run data it belongs to when the run data is loaded and compacted back
+    into a full run data file at the end of a run or when a run is resumed.
+
+    Parameters
+    ----------
+    path : :class:`os.PathLike`
+        Path to journal file, see :func:`get_journal_path`.
+    """
+
+    def __init__(self, path):  # type: (os.PathLike) -> None
+        self.path = str(path)
+
+    def __repr__(self):
+        return "RunDataJournal({})".format(self.path)
+
+    def exists(self):  # type: () -> bool
+        """Check if journal file exists.
+
+        Returns
+        -------
+        :obj:`bool`
+        """
+        return os.path.exists(self.path)
+
+    @staticmethod
+    def get_record(idx, element):  # type: (int, PlaceElement) -> dict
+        """Get journal record of an element's progress.
+
+        Parameters
+        ----------
+        idx : :obj:`int`
+            Index of element in run data's ``fab_data``.
+        element : :class:`rapid_clay_formations_fab.fab_data.PlaceElement`
+
+        Returns
+        -------
+        :obj:`dict`
+        """
+        record = {"idx": idx, "id_": element.id_}
+        for attr in JOURNALED_ATTRS:
+            record[attr] = getattr(element, attr)
+        return record
+
+    def append(self, idx, element):  # type: (int, PlaceElement) -> None
+        """Append progress of element to journal.
+
+        Parameters
+        ----------
+        idx : :obj:`int`
+            Index of element in run data's ``fab_data``.
+        element : :class:`rapid_clay_formations_fab.fab_data.PlaceElement`
+        """
+        self.append_records([self.get_record(idx, element)])
+
+    def append_records(self, records):  # type: (List[dict]) -> None
+        """Append journal records to journal file.
+
+        Parameters
+        ----------
+        records : :obj:`list` of :obj:`dict`
+            Records created using :meth:`get_record`.
+        """
+        lines = "".join(json.dumps(record) + "\n" for record in records)
+        with open(self.path, mode="a") as fp:
+            fp.write(lines)
+            fp.flush()
+
+    def read(self):  # type: () -> List[dict]
+        """Read records from journal.
+
+        A trailing incomplete record, left by an interrupted write, is ignored.
+
+        Returns
+        -------
+        :obj:`list` of :obj:`dict`
+        """
+        records = []
+        with open(self.path, mode="r") as fp:
+            for line in fp:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    log.warning("Skipping malformed record in {}.".format(self.path))
+        return records
+
+    def replay(self, fab_elements):  # type: (List[PlaceElement]) -> int
+        """Apply journaled progress to fabrication elements.
+
+        Parameters
+        ----------
+        fab_elements : :obj:`list` of :class:`rapid_clay_formations_fab.fab_data.PlaceElement`
+            Elements from the run data the journal belongs to.
+
+        Returns
+        -------
+        :obj:`int`
+            Number of records applied.
+        """  # noqa: E501
+        applied = 0
+        for record in self.read():
+            idx = record["idx"]
+            if idx >= len(fab_elements) or fab_elements[idx].id_ != record["id_"]:
+                log.warning(
+                    "Journal record for index {} and id {} does not match run data, skipping.".format(  # noqa: E501
+                        idx, record["id_"]
+                    )
+                )
+                continue
+
+            for attr in JOURNALED_ATTRS:
+                # Journals from older versions lack attributes added later
+                if attr in record:
+                    setattr(fab_elements[idx], attr, record[attr])
+            applied += 1
+
+        return applied
+
+    def compact(self, run_data_path, run_data):  # type: (os.PathLike, dict) -> None
+        """Write full run data and clear the journal.
+
+        Parameters
+        ----------
+        run_data_path : :class:`os.PathLike`
+            Path to run data file.
+        run_data : :obj:`dict`
+            Run data with journaled progress applied.
+        """
+        write_run_data(run_data_path, run_data)
+        self.clear()
+
+    def clear(self):  # type: () -> None
+        """Remove journal file."""
+        if self.exists():
+            os.remove(self.path)
+            log.debug("Removed journal {}.".format(self.path))
+
+
+class RunDataWriter(object):
+    """Persist run data progress from a background thread.
+
+    Journal records are created on the calling thread, so they reflect the
+    state of an element when it was passed to the writer, and written to disk
+    by a worker thread. Pending records for the same element and pending
+    snapshots to the same path are coalesced so that only the latest state is
+    written.
+
+    Use as a context manager to make sure everything is written on exit,
+    including exits caused by :exc:`KeyboardInterrupt` or :func:`sys.exit`.
+
+    Parameters
+    ----------
+    journal : :class:`RunDataJournal`
+        Journal to append progress to.
+    maxsize : :obj:`int`, optional
+        Maximum number of pending writes before :meth:`append` and
+        :meth:`write_snapshot` block. Defaults to ``100``.
+    """
+
+    _STOP = object()
+
+    def __init__(self, journal, maxsize=100):  # type: (RunDataJournal, int) -> None
+        self.journal = journal
+
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._run, name="RunDataWriter")
+        self._thread.daemon = True
+        self._thread.start()
+
+    def __enter__(self):  # type: () -> RunDataWriter
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def closed(self):  # type: () -> bool
+        """:obj:`bool` : ``True`` if writer thread has stopped."""
+        return not self._thread.is_alive()
+
+    def append(self, idx, element):  # type: (int, PlaceElement) -> None
+        """Queue progress of element to be appended to the journal.
+
+        Parameters
+        ----------
+        idx : :obj:`int`
+            Index of element in run data's ``fab_data``.
+        element : :class:`rapid_clay_formations_fab.fab_data.PlaceElement`
+        """
+        self._queue.put(("record", RunDataJournal.get_record(idx, element)))
+
+    def write_snapshot(self, path, run_data):  # type: (os.PathLike, dict) -> None
+        """Queue a full write of run data.
+
+        Parameters
+        ----------
+        path : :class:`os.PathLike`
+            Path to run data file.
+        run_data : :obj:`dict`
+            Run data dictionary, serialized when the write is carried out.
+        """
+        self._queue.put(("snapshot", (path, run_data)))
+
+    def flush(self):  # type: () -> None
+        """Block until all queued writes are done."""
+        self._queue.join()
+
+    def close(self):  # type: () -> None
+        """Write everything queued and stop writer thread."""
+        if self.closed:
+            return
+        self._queue.put(self._STOP)
+        self._thread.join()
+
+    def _run(self):  # type: () -> None
+        stop = False
+        while not stop:
+            items = [self._queue.get()]
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = self._STOP in items
+            try:
+                self._write([item for item in items if item is not self._STOP])
+            except Exception:
+                log.exception("Failed to write run data.")
+            finally:
+                for _ in items:
+                    self._queue.task_done()
+
+    def _write(self, items):  # type: (list) -> None
+        records = {}
+        snapshots = {}
+        for kind, payload in items:
+            if kind == "snapshot":
+                path, run_data = payload
+                snapshots[str(path)] = run_data
+            else:
+                # Records contain the full journaled state, so the last one wins
+                records[payload["idx"]] = payload
+
+        if records:
+            self.journal.append_records(sorted(records.values(), key=_get_idx))
+        for path, run_data in snapshots.items():
+            write_run_data(path, run_data)
+
+
+def _get_idx(record):  # type: (dict) -> int
+    return record["idx"]
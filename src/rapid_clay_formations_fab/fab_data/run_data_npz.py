@@ -0,0 +1,326 @@
+"""Binary run data format using NumPy's ``.npz`` archives.
+
+Fabrication elements are stored as a table of columns, one array per
+attribute, and their trajectories in packed tables of frames and
+configurations. Other run data (pick station, configuration path etc) is
+stored as JSON.
+
+Not available in IronPython.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import io
+import json
+
+import numpy as np
+from compas.geometry import Frame
+from compas.utilities import DataEncoder
+from compas_fab.robots import Configuration
+
+from rapid_clay_formations_fab.fab_data.fabrication_element import CYCLE_PHASES
+from rapid_clay_formations_fab.fab_data.fabrication_element import PlaceElement
+from rapid_clay_formations_fab.fab_data.run_data import LAZY_DECODED_KEYS
+from rapid_clay_formations_fab.fab_data.run_data import decode_data
+
+try:
+    import typing
+
+    if typing.TYPE_CHECKING:
+        from typing import Any
+        from typing import Dict
+        from typing import List
+        from typing import Optional
+
+        from rapid_clay_formations_fab.robots import MinimalTrajectories
+except ImportError:
+    pass
+
+_FLOAT_COLUMNS = (
+    "radius",
+    "height",
+    "egress_frame_distance",
+    "compression_ratio",
+    "cycle_time",
+    "time_placed",
+)
+_BOOL_COLUMNS = ("placed", "skip", "skip_pick_movement")
+
+# Values of trajectory_types for empty trajectories, other values are
+# MinimalTrajectory.JOINT_TRAJECTORY and MinimalTrajectory.FRAME_TRAJECTORY
+_EMPTY_TRAJECTORY = -1
+
+
+def dumps_run_data_npz(run_data):  # type: (dict) -> bytes
+    """Serialize run data to ``.npz`` format.
+
+    Parameters
+    ----------
+    run_data : :obj:`dict`
+        Run data dictionary, containing fabrication elements under ``fab_data``.
+
+    Returns
+    -------
+    :obj:`bytes`
+    """
+    elements = run_data["fab_data"]  # type: List[PlaceElement]
+
+    columns = {}  # type: Dict[str, Any]
+
+    columns["id_"] = np.array([json.dumps(e.id_) for e in elements], dtype=np.str_)
+    columns["attrs"] = np.array(
+        [json.dumps(e.attrs, cls=DataEncoder) for e in elements], dtype=np.str_
+    )
+    columns["location"] = np.array(
+        [_frame_to_list(e.location) for e in elements], dtype=np.float64
+    ).reshape((-1, 9))
+
+    for key in _FLOAT_COLUMNS:
+        values = [getattr(e, key) for e in elements]
+        columns[key] = np.array(
+            [np.nan if v is None else v for v in values], dtype=np.float64
+        )
+    for key in _BOOL_COLUMNS:
+        # -1 for None
+        values = [getattr(e, key) for e in elements]
+        columns[key] = np.array(
+            [-1 if v is None else int(v) for v in values], dtype=np.int8
+        )
+
+    # One column per phase in CYCLE_PHASES, rows of NaN for elements without
+    columns["phase_times"] = np.array(
+        [
+            [np.nan if v is None else v for v in _phase_times_to_list(e.phase_times)]
+            for e in elements
+        ],
+        dtype=np.float64,
+    ).reshape((-1, len(CYCLE_PHASES)))
+
+    packer = _TrajectoryPacker()
+    trajectories_index = [
+        [packer.add(getattr(e, key)) for key in LAZY_DECODED_KEYS] for e in elements
+    ]
+    columns["trajectories_index"] = np.array(
+        trajectories_index, dtype=np.int64
+    ).reshape((-1, len(LAZY_DECODED_KEYS), 2))
+    columns.update(packer.to_columns())
+
+    others = {k: v for k, v in run_data.items() if k != "fab_data"}
+    columns["run_data"] = np.array(json.dumps(others, cls=DataEncoder))
+
+    buffer = io.BytesIO()
+    np.savez(buffer, **columns)
+    return buffer.getvalue()
+
+
+def loads_run_data_npz(content):  # type: (bytes) -> dict
+    """Load run data from ``.npz`` format.
+
+    Trajectories are decoded when first accessed on an element.
+
+    Parameters
+    ----------
+    content : :obj:`bytes`
+
+    Returns
+    -------
+    :obj:`dict`
+    """
+    with np.load(io.BytesIO(content), allow_pickle=False) as npz:
+        columns = {key: npz[key] for key in npz.files}
+
+    run_data = decode_data(json.loads(str(columns["run_data"])))
+
+    float_columns = {
+        key: [None if np.isnan(v) else v for v in columns[key].tolist()]
+        for key in _FLOAT_COLUMNS
+    }
+    bool_columns = {
+        key: [None if v < 0 else bool(v) for v in columns[key].tolist()]
+        for key in _BOOL_COLUMNS
+    }
+    # Not in files written before phase times were added
+    phase_times = [None] * len(columns["location"])
+    if "phase_times" in columns:
+        phase_times = [_phase_times_from_row(row) for row in columns["phase_times"]]
+
+    table = _TrajectoryTable(columns)
+    trajectories_index = columns["trajectories_index"].tolist()
+
+    elements = []
+    for i, loc in enumerate(columns["location"].tolist()):
+        elem = PlaceElement(
+            Frame(loc[:3], loc[3:6], loc[6:]),
+            json.loads(columns["id_"][i]),
+            attrs=decode_data(json.loads(columns["attrs"][i])),
+        )
+        for key in _FLOAT_COLUMNS:
+            setattr(elem, key, float_columns[key][i])
+        for key in _BOOL_COLUMNS:
+            setattr(elem, key, bool_columns[key][i])
+        elem.phase_times = phase_times[i]
+        for key, (start, stop) in zip(LAZY_DECODED_KEYS, trajectories_index[i]):
+            if start >= 0:
+                setattr(elem, key, _PackedTrajectories(table, start, stop))
+        elements.append(elem)
+
+    run_data["fab_data"] = elements
+    return run_data
+
+
+def _frame_to_list(frame):  # type: (Frame) -> List[float]
+    return list(frame.point) + list(frame.xaxis) + list(frame.yaxis)
+
+
+def _phase_times_to_list(phase_times):
+    # type: (Optional[Dict[str, Optional[float]]]) -> List[Optional[float]]
+    phase_times = phase_times or {}
+    return [phase_times.get(phase) for phase in CYCLE_PHASES]
+
+
+def _phase_times_from_row(row):
+    # type: (np.ndarray) -> Optional[Dict[str, Optional[float]]]
+    if np.isnan(row).all():
+        return None
+    return {
+        phase: None if np.isnan(v) else v
+        for phase, v in zip(CYCLE_PHASES, row.tolist())
+    }
+
+
+class _TrajectoryPacker(object):
+    """Builds packed tables from :class:`MinimalTrajectories`."""
+
+    def __init__(self):
+        self.types = []
+        self.spans = []
+        self.frames = []
+        self.config_offsets = [0]
+        self.config_values = []
+        self.config_types = []
+        self.config_joint_names = []
+
+    def add(self, trajectories):  # type: (MinimalTrajectories) -> List[int]
+        """Add trajectories and return their span in the trajectory table."""
+        if trajectories is None:
+            return [-1, -1]
+
+        start = len(self.types)
+        for trajectory in trajectories:
+            self._add_trajectory(trajectory)
+        return [start, len(self.types)]
+
+    def _add_trajectory(self, trajectory):
+        if len(trajectory) == 0:
+            self.types.append(_EMPTY_TRAJECTORY)
+            self.spans.append([0, 0])
+            return
+
+        type_ = trajectory.trajectory_type
+        self.types.append(type_)
+
+        if type_ == trajectory.FRAME_TRAJECTORY:
+            start = len(self.frames)
+            for frame in trajectory:
+                self.frames.append(_frame_to_list(frame))
+            self.spans.append([start, len(self.frames)])
+        else:
+            start = len(self.config_joint_names)
+            for config in trajectory:
+                self.config_values.extend(config.values)
+                self.config_types.extend(config.types)
+                self.config_offsets.append(len(self.config_values))
+                self.config_joint_names.append(json.dumps(config.joint_names))
+            self.spans.append([start, len(self.config_joint_names)])
+
+    def to_columns(self):  # type: () -> Dict[str, Any]
+        return {
+            "trajectory_types": np.array(self.types, dtype=np.int8),
+            "trajectory_spans": np.array(self.spans, dtype=np.int64).reshape((-1, 2)),
+            "frames": np.array(self.frames, dtype=np.float64).reshape((-1, 9)),
+            "config_offsets": np.array(self.config_offsets, dtype=np.int64),
+            "config_values": np.array(self.config_values, dtype=np.float64),
+            "config_types": np.array(self.config_types, dtype=np.int8),
+            "config_joint_names": np.array(self.config_joint_names, dtype=np.str_),
+        }
+
+
+class _TrajectoryTable(object):
+    """Packed trajectory tables read from ``.npz`` file."""
+
+    def __init__(self, columns):  # type: (Dict[str, Any]) -> None
+        self.types = columns["trajectory_types"]
+        self.spans = columns["trajectory_spans"]
+        self.frames = columns["frames"]
+        self.config_offsets = columns["config_offsets"]
+        self.config_values = columns["config_values"]
+        self.config_types = columns["config_types"]
+        self.config_joint_names = columns["config_joint_names"]
+
+    def get_trajectories(self, start, stop):  # type: (int, int) -> MinimalTrajectories
+        from rapid_clay_formations_fab import robots
+
+        trajectories = []
+        for i in range(start, stop):
+            first, last = self.spans[i].tolist()
+            if self.types[i] == robots.MinimalTrajectory.FRAME_TRAJECTORY:
+                points = [
+                    Frame(f[:3], f[3:6], f[6:])
+                    for f in self.frames[first:last].tolist()
+                ]
+            else:
+                points = [self._get_configuration(j) for j in range(first, last)]
+            trajectories.append(robots.MinimalTrajectory(points))
+
+        return robots.MinimalTrajectories(trajectories)
+
+    def _get_configuration(self, i):  # type: (int) -> Configuration
+        first, last = self.config_offsets[i : i + 2].tolist()
+        return Configuration(
+            self.config_values[first:last].tolist(),
+            self.config_types[first:last].tolist(),
+            json.loads(self.config_joint_names[i]),
+        )
+
+
+class _PackedTrajectories(object):
+    """:class:`MinimalTrajectories` in packed trajectory table, decoded on demand.
+
+    Has the interface of :class:`EncodedData`, and like it is decoded by
+    fabrication elements when the trajectories are first accessed.
+
+    Parameters
+    ----------
+    table : :class:`_TrajectoryTable`
+    start : :obj:`int`
+        Index of first trajectory in table.
+    stop : :obj:`int`
+        Index after last trajectory in table.
+    """
+
+    __slots__ = ("_table", "_start", "_stop")
+
+    dtype = "rapid_clay_formations_fab.robots/MinimalTrajectories"
+
+    def __init__(self, table, start, stop):
+        # type: (_TrajectoryTable, int, int) -> None
+        self._table = table
+        self._start = start
+        self._stop = stop
+
+    def __repr__(self):
+        return "_PackedTrajectories({}, {})".format(self._start, self._stop)
+
+    def to_data(self):  # type: () -> dict
+        """Get data representation of packed trajectories."""
+        return self.decode().to_data()
+
+    def decode(self):  # type: () -> MinimalTrajectories
+        """Decode trajectories.
+
+        Returns
+        -------
+        :class:`rapid_clay_formations_fab.robots.MinimalTrajectories`
+        """
+        return self._table.get_trajectories(self._start, self._stop)
@@ -9,6 +9,7 @@
 
 from compas.utilities import DataDecoder
 
+from rapid_clay_formations_fab.fab_data.fabrication_element import CYCLE_PHASES
 
 try:
     from pathlib import Path
@@ -63,15 +64,25 @@ def csv_reports(args):
             )
         )
 
+        # One column per phase of PlaceElement.phase_times
+        phase_headers = [
+            "{} time (s)".format(phase.replace("_", " ")) for phase in CYCLE_PHASES
+        ]
+
         with csv_file.open(mode="w", encoding="utf8", newline="") as out_file:
             csv_w = csv.writer(out_file)
-            csv_w.writerow(headers_attrs.keys())
+            csv_w.writerow(list(headers_attrs.keys()) + phase_headers)
 
             for elem in elements:
                 row = []
                 for attr in headers_attrs.values():
                     row.append(getattr(elem, attr, None))
 
+                phase_times = getattr(elem, "phase_times", None) or {}
+                row.extend(phase_times.get(phase) for phase in CYCLE_PHASES)
+
+                csv_w.writerow(row)
+
 
 def get_average_cycle_time(elements):
     sum_ = 0
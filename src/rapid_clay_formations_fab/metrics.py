@@ -0,0 +1,136 @@
+"""
+******************************************************************************
+rapid_clay_formations_fab.metrics
+******************************************************************************
+
+.. currentmodule:: rapid_clay_formations_fab.metrics
+
+Counters and timings collected during a session, e.g. how long the robot
+took to become ready.
+
+.. autosummary::
+    :toctree: generated/
+    :nosignatures:
+
+    increment
+    record
+    timed
+    get_metrics
+    log_metrics
+    reset_metrics
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import contextlib
+import logging
+import threading
+import time
+
+try:
+    import typing
+
+    if typing.TYPE_CHECKING:
+        from typing import Dict
+        from typing import Iterator
+        from typing import List
+        from typing import Union
+except ImportError:
+    pass
+
+log = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_counters = {}  # type: Dict[str, int]
+_samples = {}  # type: Dict[str, List[float]]
+
+
+def increment(name, value=1):  # type: (str, int) -> None
+    """Increment counter.
+
+    Parameters
+    ----------
+    name : :obj:`str`
+        Name of counter.
+    value : :obj:`int`, optional
+        Amount to increment with, defaults to ``1``.
+    """
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def record(name, value):  # type: (str, float) -> None
+    """Record a sample, e.g. a duration in seconds.
+
+    Parameters
+    ----------
+    name : :obj:`str`
+        Name of metric.
+    value : :obj:`float`
+    """
+    log.debug("{}: {}".format(name, value))
+    with _lock:
+        _samples.setdefault(name, []).append(value)
+
+
+@contextlib.contextmanager
+def timed(name):  # type: (str) -> Iterator[None]
+    """Record the seconds spent in context, also if it raises.
+
+    Parameters
+    ----------
+    name : :obj:`str`
+        Name of metric.
+
+    Examples
+    --------
+    >>> with timed("docker.restart"):  # doctest: +SKIP
+    ...     restart_container("abb-driver")
+    """
+    start = time.time()
+    try:
+        yield
+    finally:
+        record(name, time.time() - start)
+
+
+def get_metrics():  # type: () -> Dict[str, Union[int, List[float]]]
+    """Get copy of counters and recorded samples.
+
+    Returns
+    -------
+    :obj:`dict`
+        Counter values and lists of samples by name.
+    """
+    with _lock:
+        metrics = dict(_counters)
+        metrics.update({name: list(values) for name, values in _samples.items()})
+    return metrics
+
+
+def log_metrics(level=logging.INFO):  # type: (int) -> None
+    """Log counters and a summary of recorded samples, e.g. at exit.
+
+    Parameters
+    ----------
+    level : :obj:`int`, optional
+        Logging level, defaults to :data:`logging.INFO`.
+    """
+    for name, value in sorted(get_metrics().items()):
+        if isinstance(value, list):
+            log.log(
+                level,
+                "{}: {} samples, mean {:.3f}, max {:.3f}".format(
+                    name, len(value), sum(value) / len(value), max(value)
+                ),
+            )
+        else:
+            log.log(level, "{}: {}".format(name, value))
+
+
+def reset_metrics():  # type: () -> None
+    """Remove all counters and samples."""
+    with _lock:
+        _counters.clear()
+        _samples.clear()
@@ -14,3 +14,11 @@
 # PY3
 if sys.version_info.major > 2:
     from .abb_rcf_client import *  # noqa: F401,F403
+    from .array_trajectory import *  # noqa: F401,F403
+    from .async_client import *  # noqa: F401,F403
+    from .cycle_time_simulator import *  # noqa: F401,F403
+    from .driver_daemon import *  # noqa: F401,F403
+    from .element_pipeline import *  # noqa: F401,F403
+    from .futures import *  # noqa: F401,F403
+    from .instruction_programs import *  # noqa: F401,F403
+    from .mock_controller import *  # noqa: F401,F403
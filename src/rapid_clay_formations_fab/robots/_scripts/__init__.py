@@ -4,9 +4,11 @@
 from __future__ import print_function
 
 from .common import *  # noqa: F401,F403
+from .driver_daemon import *  # noqa: F401,F403
 from .fabrication import *  # noqa: F401,F403
 from .go_to_joint_pos import *  # noqa: F401,F403
 from .record_poses import *  # noqa: F401,F403
+from .simulate import *  # noqa: F401,F403
 from .test_speeds import *  # noqa: F401,F403
 
 # This reduces latency, see:
@@ -4,10 +4,14 @@
 
 import logging
 import os
+import typing
 
+from rapid_clay_formations_fab import metrics
 from rapid_clay_formations_fab.docker import compose_up
 from rapid_clay_formations_fab.robots import DOCKER_COMPOSE_PATHS
 from rapid_clay_formations_fab.robots import ROBOT_IPS
+from rapid_clay_formations_fab.robots import DriverDaemonConnection
+from rapid_clay_formations_fab.robots import is_driver_running
 
 log = logging.getLogger(__name__)
 
@@ -28,12 +32,49 @@ def warn_about_scipy_fortran_ctrl_c() -> None:
 def compose_up_driver(target_controller: str):
     """Compose up ROS application for compas_rrc ABB driver.
 
+    Skipped if the driver is already running for the target controller. Skips
+    are logged and counted in metric ``docker.compose_up_skipped``, logged
+    with the other metrics when the ``rcf`` command exits.
+
     Parameters
     ----------
     target_controller
         Target key, either ``"real"`` or ``"virtual"``, used as key for
         dictionary of controller IPs.
     """
-    ip = {"ROBOT_IP": ROBOT_IPS[target_controller]}
+    robot_ip = ROBOT_IPS[target_controller]
+
+    # Running docker-compose takes seconds even if there is nothing to do
+    if is_driver_running(robot_ip):
+        metrics.increment("docker.compose_up_skipped")
+        log.info(
+            f"Driver application is already running for {target_controller} "
+            + "controller, skipped docker-compose up."
+        )
+        return
+
+    ip = {"ROBOT_IP": robot_ip}
     compose_up(DOCKER_COMPOSE_PATHS["driver"], check_output=True, env_vars=ip)
     log.debug("Driver application is running.")
+
+
+def connect_driver(target_controller: str) -> typing.Optional[DriverDaemonConnection]:
+    """Attach to driver daemon if it is running, otherwise compose up driver.
+
+    Parameters
+    ----------
+    target_controller
+        Target key, either ``"real"`` or ``"virtual"``.
+
+    Returns
+    -------
+    :class:`rapid_clay_formations_fab.robots.DriverDaemonConnection` or :obj:`None`
+        Connection to pass on to the client, ``None`` if no daemon is running.
+    """
+    daemon = DriverDaemonConnection.attach(target_controller)
+    if daemon:
+        log.info("Attached to running driver daemon.")
+        return daemon
+
+    compose_up_driver(target_controller)
+    return None
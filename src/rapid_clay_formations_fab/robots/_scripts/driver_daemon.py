@@ -0,0 +1,35 @@
+"""Daemon keeping the driver and its ROS connection up between commands."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import argparse
+import logging
+
+from rapid_clay_formations_fab.robots import AbbRcfClient
+from rapid_clay_formations_fab.robots import DriverDaemon
+from rapid_clay_formations_fab.robots._scripts import compose_up_driver
+
+log: logging.Logger = logging.getLogger(__name__)
+
+
+def driver_daemon(args: argparse.Namespace) -> None:
+    """Start driver and serve other commands until Ctrl+C is pressed.
+
+    Parameters
+    ----------
+    args : :class:`argparse.Namespace`
+    """
+    compose_up_driver(args.controller)
+
+    with AbbRcfClient() as client:
+        client.ensure_connection()
+
+        daemon = DriverDaemon(client, args.controller)
+        log.info(f"Driver daemon listening on port {daemon.port}.")
+        log.info("Press CTRL+C to stop.")
+
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            log.info("Stopping driver daemon.")
@@ -3,27 +3,29 @@
 from __future__ import division
 from __future__ import print_function
 
-import json
 import logging
-import re
 import sys
-import time
 from datetime import datetime
-from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from typing import Any
 from typing import List
-from typing import Optional
 
 import compas_rrc
 import confuse
 import questionary
-from compas.utilities import DataEncoder
 
+from rapid_clay_formations_fab.fab_data import ROTATION_PATTERN
 from rapid_clay_formations_fab.fab_data import PlaceElement
+from rapid_clay_formations_fab.fab_data import RunDataJournal
+from rapid_clay_formations_fab.fab_data import RunDataWriter
+from rapid_clay_formations_fab.fab_data import get_journal_path
+from rapid_clay_formations_fab.fab_data import rotate_run_data
+from rapid_clay_formations_fab.fab_data import write_run_data
 from rapid_clay_formations_fab.robots import AbbRcfFabricationClient
+from rapid_clay_formations_fab.robots import ElementPipeline
+from rapid_clay_formations_fab.robots import InstructionPrograms
 from rapid_clay_formations_fab.robots import PrintTextNoErase
-from rapid_clay_formations_fab.robots._scripts import compose_up_driver
+from rapid_clay_formations_fab.robots import get_programs_path
+from rapid_clay_formations_fab.robots._scripts import connect_driver
 
 log: logging.Logger = logging.getLogger(__name__)
 
@@ -31,7 +33,7 @@
 def fabrication(run_conf: confuse.AttrDict, run_data: dict) -> None:
     """Fabrication runner placing elements according to fab_data and conf."""
 
-    compose_up_driver(run_conf.robot_client.controller)
+    daemon = connect_driver(run_conf.robot_client.controller)
 
     # setup fab data
     fab_elements = run_data["fab_data"]
@@ -41,22 +43,41 @@ def fabrication(run_conf: confuse.AttrDict, run_data: dict) -> None:
     pick_station = run_data["pick_station"]
     run_data_path = run_conf.run_data_path
     # this regex strips rotation numbers of file path, i.e test.log.01 --> test.log
-    _clean_file_name = re.sub(r"\.\d+$", "", run_data_path.name)
+    _clean_file_name = ROTATION_PATTERN.sub("", run_data_path.name)
     run_data_path = run_data_path.with_name(_clean_file_name)
 
-    # Uses RotatingFileHandler to do a rollover to keep old versions of run_data_path
-    _handler = RotatingFileHandler(run_data_path, maxBytes=1, backupCount=100)
-    _handler.doRollover()
-    _handler.close()
+    # Keep old versions of run_data_path, together with their checksums
+    rotate_run_data(run_data_path, backup_count=100)
     # Finally dump run_data again to not confuse user with an empty file
     _write_run_data(run_data_path, run_data, fab_elements)
 
-    _edit_fab_data(fab_elements)
+    # Progress is journaled per element and compacted into run_data on exit.
+    # Any journaled progress has been replayed when run_data was loaded and is
+    # included in the file written above, unless run_data was loaded from a
+    # rotated copy. The journal is then discarded.
+    journal = RunDataJournal(get_journal_path(run_data_path))
+    journal.clear()
 
-    prev_elem: Optional[PlaceElement] = None
+    _edit_fab_data(fab_elements)
 
-    # Start abb client
-    with AbbRcfFabricationClient(run_conf.robot_client, pick_station) as rob_client:
+    # Pick and place instructions are compiled before connecting, or loaded if
+    # compiled from the same fab_data and configuration before
+    programs = InstructionPrograms.load_or_compile(
+        get_programs_path(run_data_path),
+        run_conf.robot_client,
+        pick_station,
+        fab_elements,
+    )
+
+    # Elements sent to the robot, waiting for their cycle times
+    pipeline = ElementPipeline()
+    look_ahead = max(run_conf.robot_client.look_ahead, 1)
+
+    # Start abb client and the writer persisting progress in the background, so
+    # that instructions to the robot are not delayed by disk writes
+    with AbbRcfFabricationClient(
+        run_conf.robot_client, pick_station, daemon=daemon
+    ) as rob_client, RunDataWriter(journal) as writer:
         rob_client.ensure_connection()
 
         # Confirm start on flexpendant
@@ -65,103 +86,106 @@ def fabrication(run_conf: confuse.AttrDict, run_data: dict) -> None:
         # Set speed, accel, tool, wobj and move to start pos
         rob_client.pre_procedure()
 
-        i = 0
-        # Fabrication loop
-        for i, elem in enumerate(fab_elements):
-            if elem.skip:
-                continue
-
-            # Setup log message and flex pendant message
-            log_msg = f"{i}/{len(fab_elements) - 1}, id {elem.id_}."
-            log.info(f"Sending {log_msg}")
-
-            # Having this as an f-string should mean that the timestamp will
-            # be set when the PrintText command is sent
-            pendant_msg = f"{datetime.now().strftime('%H:%M')}: Executing {log_msg}"
-
-            rob_client.send(PrintTextNoErase(pendant_msg))
-
-            # Start clock and send instructions
-            rob_client.send(compas_rrc.StartWatch())
-
-            if (
-                not elem.skip_pick_movement
-                and not run_conf.robot_client.skip_all_pick_movements
-            ):
-                rob_client.pick_element()
-
-            # Save cycle time from last run
-            # The main reason though is to stop the fabrication loop until
-            # confirmation that last loop finished. It is done between pick
-            # instructions and place instructions to (hopefully) make sure the
-            # robot always has instructions to execute
-
-            if prev_elem and prev_elem.cycle_time_future:  # Is there a clock to check?
-                prev_elem.cycle_time = _wait_and_return_future(
-                    prev_elem.cycle_time_future
-                )
-
-                # TODO: Move sysexit to _wait_and_return_future here?
-                if not prev_elem.cycle_time:  # If KeyboardInterrupt was raised
-                    log.info("Exiting script, breaking loop and saving run_data.")
-                    _write_run_data(run_data_path, run_data, fab_elements)
-                    sys.exit(0)
-
-                cycle_time_msg = f"Last cycle time was: {prev_elem.cycle_time:0.0f}"
+        def report_done(until_in_flight: int) -> None:
+            """Wait on elements in pipeline and save their cycle times."""
+            for done_idx, done_elem in pipeline.wait(until_in_flight):
+                cycle_time_msg = f"Last cycle time was: {done_elem.cycle_time:0.0f}"
                 log.info(cycle_time_msg)
                 rob_client.send(PrintTextNoErase(cycle_time_msg))
 
-                prev_elem.time_placed = datetime.now().timestamp()
-                log.debug(f"Time prev elem was placed: {elem.time_placed}")
-
-            rob_client.place_element(elem)
-            rob_client.send(compas_rrc.StopWatch())
-
-            elem.cycle_time_future = rob_client.send(compas_rrc.ReadWatch())
-
-            # set placed to mark progress
-            elem.placed = True
-
-            # Write progress to json while waiting for robot
+                log.debug(f"Time elem {done_idx} was placed: {done_elem.time_placed}")
+                if done_elem.phase_times:
+                    log.debug(
+                        f"Phase times of elem {done_idx}: {done_elem.phase_times}"
+                    )
+
+                writer.append(done_idx, done_elem)
+
+        try:
+            # Fabrication loop
+            for i, elem in enumerate(fab_elements):
+                if elem.skip:
+                    continue
+
+                # Setup log message and flex pendant message
+                log_msg = f"{i}/{len(fab_elements) - 1}, id {elem.id_}."
+                log.info(f"Sending {log_msg}")
+
+                # Having this as an f-string should mean that the timestamp will
+                # be set when the PrintText command is sent
+                pendant_msg = f"{datetime.now().strftime('%H:%M')}: Executing {log_msg}"
+
+                # Instructions are buffered and published together at the end of
+                # each batch
+                with rob_client.batch():
+                    rob_client.send(PrintTextNoErase(pendant_msg))
+
+                    # Start clock and send instructions
+                    rob_client.send(compas_rrc.StartWatch())
+
+                    pick_futures = []
+                    if (
+                        not elem.skip_pick_movement
+                        and not run_conf.robot_client.skip_all_pick_movements
+                    ):
+                        pick_futures = rob_client.send_program(
+                            programs.get_pick_program(pick_station)
+                        )
+
+                # Stop the fabrication loop until less than look_ahead elements
+                # are left to be placed. It is done between pick instructions
+                # and place instructions to (hopefully) make sure the robot
+                # always has instructions to execute
+                report_done(look_ahead - 1)
+
+                with rob_client.batch():
+                    place_futures = rob_client.send_program(programs.place_programs[i])
+                    rob_client.send(compas_rrc.StopWatch())
+
+                    elem.cycle_time_future = rob_client.send(compas_rrc.ReadWatch())
+                    elem.phase_futures = rob_client.get_phase_futures(
+                        pick_futures, place_futures
+                    )
+
+                # set placed to mark progress
+                elem.placed = True
+
+                # Journal progress while waiting for robot
+                writer.append(i, elem)
+
+                pipeline.add(i, elem)
+
+            # Wait on last elements
+            report_done(0)
+
+        except KeyboardInterrupt:
+            log.info("Exiting script, breaking loop and saving run_data.")
+            writer.close()
             _write_run_data(run_data_path, run_data, fab_elements)
+            journal.clear()
+            sys.exit(0)
 
-            prev_elem = elem
-
-        # Wait on last element
-        if prev_elem and prev_elem.cycle_time_future:
-            prev_elem.cycle_time = _wait_and_return_future(prev_elem.cycle_time_future)
+        # Write progress of last run of loop, compacting the journal into
+        # run_data_path before it is cleared
+        writer.close()
+        _write_run_data(run_data_path, run_data, fab_elements)
 
-        # Write progress of last run of loop
-        # First figure out if the file should be labeled done though.
-        _placed_is_true = filter(lambda x: x.placed, fab_elements)
-        if len(list(_placed_is_true)) == len(fab_elements):
+        # Also label a copy as done if all elements are placed
+        if all(elem.placed for elem in fab_elements):
             _file = run_data_path.with_name(run_data_path.name + ".99done")
-        else:
-            _file = run_data_path
+            _write_run_data(_file, run_data, fab_elements)
 
-        _write_run_data(_file, run_data, fab_elements)
+        journal.clear()
 
         # Send robot to safe end position and close connection
         rob_client.post_procedure()
 
 
-def _wait_and_return_future(future: compas_rrc.FutureResult) -> Any:
-    try:
-        while future.done is False:
-            time.sleep(3)
-    except KeyboardInterrupt:
-        return
-
-    return future.result()
-
-
 def _write_run_data(
     file_: Path, run_data: dict, fab_elements: List[PlaceElement]
 ) -> None:
     run_data["fab_data"] = fab_elements
-    with file_.open(mode="w") as fp:
-        json.dump(run_data, fp, cls=DataEncoder)
-    log.debug(f"Wrote run_data to {file_}.")
+    write_run_data(file_, run_data)
 
 
 def _edit_fab_data(fab_elems: List[PlaceElement]) -> None:
@@ -14,7 +14,7 @@
 from compas_rrc import Zone
 
 from rapid_clay_formations_fab.robots import AbbRcfClient
-from rapid_clay_formations_fab.robots._scripts import compose_up_driver
+from rapid_clay_formations_fab.robots._scripts import connect_driver
 
 log: logging.Logger = logging.getLogger(__name__)
 
@@ -42,7 +42,7 @@ def go_to_joint_pos(args: argparse.Namespace) -> None:
         "Travel position": TRAVEL_JOINT_POSITION,
     }
 
-    compose_up_driver(args.controller)
+    daemon = connect_driver(args.controller)
 
     selection = questionary.select(
         "Select joint position to go to", selection_instructions.keys()
@@ -50,7 +50,7 @@ def go_to_joint_pos(args: argparse.Namespace) -> None:
 
     log.debug(f"{selection} selected.")
 
-    with AbbRcfClient(ros_port=9090) as client:
+    with AbbRcfClient(ros_port=9090, daemon=daemon) as client:
         client.ensure_connection()
 
         client.send(SetAcceleration(ACCEL, ACCEL_RAMP))
@@ -6,7 +6,6 @@
 import argparse
 import json
 import logging
-import time
 import typing
 from datetime import datetime
 from pathlib import Path
@@ -17,7 +16,8 @@
 from rapid_clay_formations_fab.robots import AbbRcfClient
 from rapid_clay_formations_fab.robots import PrintTextNoErase
 from rapid_clay_formations_fab.robots import StopAll
-from rapid_clay_formations_fab.robots._scripts import compose_up_driver
+from rapid_clay_formations_fab.robots import wait_for_future
+from rapid_clay_formations_fab.robots._scripts import connect_driver
 from rapid_clay_formations_fab.robots._scripts import warn_about_scipy_fortran_ctrl_c
 
 log: logging.Logger = logging.getLogger(__name__)
@@ -40,7 +40,7 @@ def record_poses(args: argparse.Namespace) -> None:
 
     log.info("Starting ROS ABB Driver")
 
-    compose_up_driver(args.controller)
+    daemon = connect_driver(args.controller)
 
     poses: typing.List[compas.geometry.Frame] = []
 
@@ -48,7 +48,7 @@ def record_poses(args: argparse.Namespace) -> None:
     output_file = OUTPUT_DIR / file_name
     output_file.touch()
 
-    with AbbRcfClient() as client:
+    with AbbRcfClient(daemon=daemon) as client:
 
         client.send(compas_rrc.SetTool("t_A057_ClayTool02_Prism"))
         client.send(compas_rrc.SetWorkObject("wobj0"))
@@ -64,17 +64,11 @@ def record_poses(args: argparse.Namespace) -> None:
             pose_future = client.send(compas_rrc.GetFrame())
 
             try:
-                # Wait for result
-                # Sleeping allows catching KeyboardInterrupt
-                while pose_future.done is False:
-                    time.sleep(3)
-
+                pose = wait_for_future(pose_future)
             except KeyboardInterrupt:
                 log.info("Exiting script.")
                 break
 
-            pose = pose_future.result()
-
             if pose in poses:
                 error_msg = "Position already recorded."
                 client.send(PrintTextNoErase(error_msg))
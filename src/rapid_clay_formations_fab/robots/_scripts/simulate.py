@@ -0,0 +1,61 @@
+"""Offline cycle time estimate for RCF fabrication process.
+
+Invoked by ``rcf simulate /path/to/run_data.json``. No robot controller or
+driver is needed.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import logging
+
+import confuse
+
+from rapid_clay_formations_fab.fab_data import ROTATION_PATTERN
+from rapid_clay_formations_fab.robots import InstructionPrograms
+from rapid_clay_formations_fab.robots import estimate_cycle_times
+from rapid_clay_formations_fab.robots import get_programs_path
+
+log: logging.Logger = logging.getLogger(__name__)
+
+
+def simulate(run_conf: confuse.AttrDict, run_data: dict) -> None:
+    """Estimate cycle times of all elements and log them."""
+    fab_elements = run_data["fab_data"]
+    pick_station = run_data["pick_station"]
+
+    # Estimate for placing all elements, skip is set when fabrication starts
+    elements = [e.copy() for e in fab_elements]
+    for elem in elements:
+        elem.skip = False
+
+    # Same cache as the fabrication script uses
+    run_data_path = run_conf.run_data_path
+    run_data_path = run_data_path.with_name(
+        ROTATION_PATTERN.sub("", run_data_path.name)
+    )
+    programs = InstructionPrograms.load_or_compile(
+        get_programs_path(run_data_path),
+        run_conf.robot_client,
+        pick_station,
+        fab_elements,
+    )
+
+    estimate = estimate_cycle_times(
+        run_conf.robot_client, pick_station, elements, programs=programs
+    )
+
+    for i, cycle_time in enumerate(estimate.cycle_times):
+        if cycle_time is not None:
+            log.debug(f"{i}, id {elements[i].id_}: {cycle_time:.1f} s")
+
+    log.info(f"{len(elements)} elements.")
+    if estimate.mean is not None:
+        log.info(f"Mean cycle time: {estimate.mean:.1f} s")
+    log.info(f"Total: {estimate.total / 3600:.2f} h ({estimate.total:.0f} s)")
+
+    if estimate.untimed_transitions:
+        log.info(
+            f"{estimate.untimed_transitions} motions between joint and frame "
+            + "targets were not timed."
+        )
@@ -18,7 +18,7 @@
 from compas_rrc import Zone
 
 from rapid_clay_formations_fab.robots import AbbRcfFabricationClient
-from rapid_clay_formations_fab.robots._scripts import compose_up_driver
+from rapid_clay_formations_fab.robots._scripts import connect_driver
 
 log = logging.getLogger(__name__)
 
@@ -64,15 +64,15 @@
 def test_speeds(run_conf, run_data):
     rob_conf = run_conf.robot_client
 
-    # Compose up master, driver, bridge
-    compose_up_driver(rob_conf.controller)
+    # Compose up master, driver, bridge unless driver daemon is running
+    daemon = connect_driver(rob_conf.controller)
 
     pick_station = run_data["pick_station"]
 
     # This context manager sets up RosClient, inherits from AbbClient
     # with added fabrication specific methods
     # On exit it unadvertises topics and stops RosClient
-    with AbbRcfFabricationClient(rob_conf, pick_station) as client:
+    with AbbRcfFabricationClient(rob_conf, pick_station, daemon=daemon) as client:
         # Sends ping (noop) and restarts container if no response
         client.ensure_connection()
 
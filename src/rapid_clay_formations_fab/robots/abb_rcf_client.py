@@ -3,30 +3,50 @@
 from __future__ import division
 from __future__ import print_function
 
+import concurrent.futures
+import contextlib
 import logging
+import socket
+import threading
 import time
 import typing
+import urllib.parse
 
 import compas_rrc
 import confuse
+import roslibpy
 from compas_fab.backends.ros import RosClient
+from compas_fab.backends.ros.messages import ROSmsg
 from compas_fab.robots import Configuration
 from compas_fab.robots import to_radians
 from compas_rrc import Motion
 from compas_rrc import MoveToJoints
 from compas_rrc import MoveToRobtarget
+from compas_rrc.client import SequenceCounter
+from compas_rrc.client import _get_key
+from roslibpy.event_emitter import EventEmitterMixin
 
+from rapid_clay_formations_fab import metrics
+from rapid_clay_formations_fab.docker import get_container_health
 from rapid_clay_formations_fab.docker import restart_container
 from rapid_clay_formations_fab.fab_data import PlaceElement
 from rapid_clay_formations_fab.robots import DRIVER_CONTAINER_NAME
 from rapid_clay_formations_fab.robots import MinimalTrajectories
 from rapid_clay_formations_fab.robots import MinimalTrajectory
 from rapid_clay_formations_fab.robots import PickStation
+from rapid_clay_formations_fab.robots.futures import INTERRUPT_CHECK_INTERVAL
+from rapid_clay_formations_fab.robots.futures import _NotifyingEvent
+
+if typing.TYPE_CHECKING:
+    from rapid_clay_formations_fab.robots.driver_daemon import DriverDaemonConnection
 
 log = logging.getLogger(__name__)
 
 T = typing.TypeVar("T", bound="AbbRcfClient")
 
+# Instruction name of compas_rrc.ReadWatch, to parse its feedback in programs
+_READ_WATCH_INSTRUCTION = compas_rrc.ReadWatch().instruction
+
 
 class AbbRcfClient(compas_rrc.AbbClient):
     """Robot communication client for RCF.
@@ -37,6 +57,14 @@ class AbbRcfClient(compas_rrc.AbbClient):
     ----------
     ros_port : :obj:`int`, optional
         ROS client port for communcation with ABB controller, defaults to 9090.
+    daemon : :class:`DriverDaemonConnection`, optional
+        Connection to a running driver daemon. If given, instructions and
+        feedback go through the daemon's ROS connection instead of a new one.
+
+    Notes
+    -----
+    Instructions sent inside :meth:`batch` are buffered and published
+    together when the batch ends or :meth:`flush` is called.
 
     Class attributes
     ----------------
@@ -51,17 +79,169 @@ class AbbRcfClient(compas_rrc.AbbClient):
     # Define external axes, will not be used but required in move cmds
     EXTERNAL_AXES_DUMMY = compas_rrc.ExternalAxes()
 
-    def __init__(self, ros_port: int = 9090) -> None:
-        super().__init__(RosClient(port=ros_port))
+    def __init__(
+        self,
+        ros_port: int = 9090,
+        daemon: typing.Optional["DriverDaemonConnection"] = None,
+    ) -> None:
+        self._daemon = daemon
+        if daemon:
+            self._init_attached()
+        else:
+            super().__init__(RosClient(port=ros_port))
+
+        # List of buffered instruction messages while batching, otherwise None
+        self._batch: typing.Optional[typing.List[dict]] = None
+
+    def _init_attached(self) -> None:
+        """Set up client attached to a driver daemon.
+
+        No ROS connection is made and no topics are subscribed or advertised,
+        feedback routed by the daemon is emitted on :class:`_AttachedRos`.
+        """
+        self.ros = _AttachedRos()
+        self.counter = SequenceCounter()
+        self.futures: typing.Dict[str, dict] = {}
+        self._version_checked = True  # Checked by the daemon
+
+        namespace = "/rob1/"
+        self.topic = roslibpy.Topic(
+            self.ros,
+            namespace + "robot_command",
+            "compas_rrc_driver/RobotMessage",
+            queue_size=None,
+        )
+        self.feedback = roslibpy.Topic(
+            self.ros,
+            namespace + "robot_response",
+            "compas_rrc_driver/RobotMessage",
+            queue_size=0,
+        )
+        self.ros.on(self.feedback.name, self.feedback_callback)
 
     def __enter__(self: T) -> T:
-        self.ros.__enter__()
+        if self._daemon:
+            # Feedback is emitted like messages received on the feedback topic
+            self._daemon.start(lambda msg: self.ros.emit(self.feedback.name, msg))
+        else:
+            self.ros.__enter__()
         return self
 
     def __exit__(self, *args):
+        if self._daemon:
+            self._daemon.close()
+            return
+
         self.close()
         self.terminate()
 
+    def send(self, instruction: ROSmsg) -> typing.Optional[compas_rrc.FutureResult]:
+        """Send instruction, or buffer it if inside :meth:`batch`.
+
+        See :meth:`compas_rrc.AbbClient.send`.
+        """
+        if self._batch is None and not self._daemon:
+            return super().send(instruction)
+
+        # Same as compas_rrc.AbbClient.send except for the publishing
+        self.ensure_protocol_version()
+        instruction.sequence_id = self.counter.increment()
+
+        result = None
+        if instruction.feedback_level > 0:
+            result = compas_rrc.FutureResult()
+            parser = getattr(instruction, "parse_feedback", None)
+            key = _get_key(instruction)
+            self.futures[key] = dict(result=result, parser=parser)
+
+        if self._batch is None:
+            self._publish([instruction.msg])
+        else:
+            self._batch.append(instruction.msg)
+
+        return result
+
+    def send_and_wait(self, instruction: ROSmsg, timeout: float = None) -> typing.Any:
+        """Send instruction and wait for feedback.
+
+        Buffered instructions are published first if inside :meth:`batch`.
+
+        See :meth:`compas_rrc.AbbClient.send_and_wait`.
+        """
+        if instruction.feedback_level == 0:
+            instruction.feedback_level = 1
+
+        future = self.send(instruction)
+        self.flush()
+        return future.result(timeout)
+
+    @contextlib.contextmanager
+    def batch(self) -> typing.Iterator[None]:
+        """Buffer instructions sent in context and publish them when it exits.
+
+        Nested batches are published when the outermost batch exits.
+
+        Examples
+        --------
+        >>> with client.batch():  # doctest: +SKIP
+        ...     client.pick_element()
+        """
+        if self._batch is not None:
+            yield
+            return
+
+        self._batch = []
+        try:
+            yield
+        finally:
+            self.flush()
+            self._batch = None
+
+    def flush(self) -> None:
+        """Publish instructions buffered inside :meth:`batch`.
+
+        The messages are passed to the websocket connection in one call so
+        that they are sent back to back.
+        """
+        if not self._batch:
+            return
+
+        instruction_msgs = self._batch
+        self._batch = []
+
+        log.debug(f"Publishing {len(instruction_msgs)} buffered instructions.")
+        self._publish(instruction_msgs)
+
+    def _publish(self, instruction_msgs: typing.List[dict]) -> None:
+        """Publish instruction messages back to back."""
+        if self._daemon:
+            self._daemon.publish(instruction_msgs)
+            return
+
+        messages = [self._get_publish_message(msg) for msg in instruction_msgs]
+
+        def _send_batch(proto):
+            for message in messages:
+                proto.send_ros_message(message)
+            return proto
+
+        self.ros.factory.on_ready(_send_batch)
+
+    def _get_publish_message(self, instruction_msg: dict) -> roslibpy.Message:
+        """Get rosbridge message, see :meth:`roslibpy.Topic.publish`."""
+        if not self.topic.is_advertised:
+            self.topic.advertise()
+
+        return roslibpy.Message(
+            {
+                "op": "publish",
+                "id": f"publish:{self.topic.name}:{self.ros.id_counter}",
+                "topic": self.topic.name,
+                "msg": dict(roslibpy.Message(instruction_msg)),
+                "latch": self.topic.latch,
+            }
+        )
+
     def confirm_start(self) -> None:
         """Stop program and prompt user to press play on pendant to resume."""
         self.send(compas_rrc.PrintText("Press play when ready."))
@@ -95,46 +275,193 @@ def ping(self, timeout: float = None) -> None:
     def ensure_connection(
         self,
         timeout_ping: float = None,
-        wait_after_up: float = 2,
-        tries: int = 10,
-    ):
+        deadline: float = 60,
+        backoff_initial: float = 0.1,
+        backoff_max: float = 2,
+    ) -> float:
         """Check connection to ABB controller and restart abb-driver if necessary.
 
+        Pings are sent with exponentially increasing intervals while the
+        health of the `abb-driver` container and the rosbridge port are
+        checked in parallel. Pings are only sent when both are up, and the
+        container is restarted as soon as it is found stopped or unhealthy, or
+        when no ping has been answered within ``timeout_ping``.
+
+        The time until the controller replied is logged and recorded as the
+        metric ``robot.time_to_ready``, see :mod:`rapid_clay_formations_fab.metrics`.
+
         Parameters
         ----------
         timeout_ping
-            Timeout for ping response.
-        wait_after_up
-            Time to wait to ping after `abb-driver` container started.
-        tries
-            How many times to ping before raising error.
+            Time to wait for a reply before restarting `abb-driver`. Defaults
+            to :attr:`TIMEOUT_SHORT`.
+        deadline
+            Total time to wait for a reply before raising error.
+        backoff_initial
+            Interval after the first ping.
+        backoff_max
+            Longest interval between pings.
+
+        Returns
+        -------
+        :obj:`float`
+            Seconds until the controller replied.
 
         Raises
         ------
         :exc:`compas_rrc.TimeoutException`
-            If no reply is returned to second ping before timeout.
+            If no reply is returned before deadline.
+        :exc:`RuntimeError`
+            If there is no `abb-driver` container to restart.
+
+        Notes
+        -----
+        When attached to a driver daemon the check is done by the daemon.
         """
+        if self._daemon:
+            return self._daemon.ensure_connection(
+                timeout_ping=timeout_ping, deadline=deadline
+            )
+
         if not timeout_ping:
             timeout_ping = self.TIMEOUT_SHORT
 
+        start = time.monotonic()
+        deadline_at = start + deadline
+        restart_at = start + timeout_ping
+        restarted = False
+
+        ready = threading.Event()
+        interval = backoff_initial
+
+        # Keys of sent pings, unanswered ones are removed from self.futures
+        ping_keys: typing.List[str] = []
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=2
+        ) as executor, _removing_futures(self.futures, ping_keys):
+            while True:
+                health_check = executor.submit(_get_driver_health)
+                port_check = executor.submit(self._is_rosbridge_port_open)
+                health = health_check.result()
+                port_open = port_check.result()
+                log.debug(f"abb-driver: {health}, rosbridge port open: {port_open}")
+
+                if health is None:
+                    raise RuntimeError(
+                        f"No {DRIVER_CONTAINER_NAME} container found, start the "
+                        + "driver with docker-compose up first."
+                    )
+
+                now = time.monotonic()
+                if not restarted and (
+                    health in _FAILED_CONTAINER_STATES or now >= restart_at
+                ):
+                    log.info("No response from controller, restarting abb-driver.")
+                    restart_container(DRIVER_CONTAINER_NAME)
+                    metrics.increment("docker.driver_restarts")
+                    restarted = True
+                    interval = backoff_initial
+                    continue
+
+                if port_open and health not in _FAILED_CONTAINER_STATES:
+                    ping_keys.append(self._send_ping(ready))
+
+                if _wait_for_event(ready, min(interval, deadline_at - now)):
+                    break
+
+                if time.monotonic() >= deadline_at:
+                    raise compas_rrc.TimeoutException(
+                        f"No response from controller after {deadline} s."
+                    )
+
+                interval = min(interval * 2, backoff_max)
+
+        time_to_ready = time.monotonic() - start
+        metrics.record("robot.time_to_ready", time_to_ready)
+        log.info(f"Controller ready after {time_to_ready:.2f} s.")
+
+        return time_to_ready
+
+    def _send_ping(self, ready: threading.Event) -> str:
+        """Send Noop and set event when it is answered, return its future's key."""
+        instruction = compas_rrc.Noop(feedback_level=compas_rrc.FeedbackLevel.DONE)
+        future = self.send(instruction)
+        self.flush()
+
+        future.event = _NotifyingEvent(future.event, ready.set)
+        if future.done:  # Answered before the event was replaced
+            ready.set()
+
+        return _get_key(instruction)
+
+    def _is_rosbridge_port_open(self, timeout: float = 0.5) -> bool:
+        """Check if rosbridge accepts connections."""
+        url = urllib.parse.urlsplit(self.ros.factory.url)
         try:
-            log.debug("Pinging robot")
-            self.ping(timeout=timeout_ping)
-        except compas_rrc.TimeoutException:
-            log.info("No response from controller, restarting abb-driver service.")
-            restart_container(DRIVER_CONTAINER_NAME)
+            with socket.create_connection((url.hostname, url.port), timeout=timeout):
+                return True
+        except OSError:
+            return False
 
-            time.sleep(wait_after_up)
 
-            for _ in range(tries - 1):
-                try:
-                    self.ping(timeout_ping)
-                except compas_rrc.TimeoutException:
-                    pass
-                else:
-                    return
+class _AttachedRos(EventEmitterMixin):
+    """Stand-in for the ROS client of a client attached to a driver daemon.
+
+    Events are only emitted locally, nothing is connected or sent.
+    """
 
-            raise  # If there's still no response after n tries, raise exception
+    def __init__(self) -> None:
+        super().__init__()
+        self._id_counter = 0
+
+    @property
+    def id_counter(self) -> int:
+        """See :attr:`roslibpy.Ros.id_counter`."""
+        self._id_counter += 1
+        return self._id_counter
+
+    def on_ready(
+        self, callback: typing.Callable[[], None], run_in_thread: bool = True
+    ) -> None:
+        """Call callback right away, the daemon's connection is already up."""
+        callback()
+
+
+# Container states where pinging is pointless
+_FAILED_CONTAINER_STATES = ("exited", "dead", "unhealthy")
+
+
+def _get_driver_health() -> typing.Optional[str]:
+    """Get health of abb-driver, ``"unknown"`` if docker can't be reached."""
+    try:
+        return get_container_health(DRIVER_CONTAINER_NAME)
+    except Exception as e:
+        log.debug(f"Could not get health of {DRIVER_CONTAINER_NAME}: {e}")
+        return "unknown"
+
+
+@contextlib.contextmanager
+def _removing_futures(
+    futures: typing.Dict[str, dict], keys: typing.List[str]
+) -> typing.Iterator[None]:
+    """Remove futures of keys when context exits, answered ones are already gone."""
+    try:
+        yield
+    finally:
+        for key in keys:
+            futures.pop(key, None)
+
+
+def _wait_for_event(event: threading.Event, timeout: float) -> bool:
+    """Wait on event in short waits to allow Ctrl+C."""
+    deadline = time.monotonic() + timeout
+    while not event.is_set():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        event.wait(min(INTERRUPT_CHECK_INTERVAL, remaining))
+    return True
 
 
 class AbbRcfFabricationClient(AbbRcfClient):
@@ -151,16 +478,31 @@ class AbbRcfFabricationClient(AbbRcfClient):
         arguments.
     pick_station : :class:`rapid_clay_formations_fab.fab_data.PickStation`
         Pick station for fabrication elements.
+    ros_port : :obj:`int`, optional
+        ROS client port for communcation with ABB controller, defaults to 9090.
+    daemon : :class:`DriverDaemonConnection`, optional
+        Connection to a running driver daemon, see :class:`AbbRcfClient`.
     """
 
+    # Phases ended by a watch reading if robot_client.record_phase_times is
+    # set, in the order they are read. The last phase of
+    # rapid_clay_formations_fab.fab_data.CYCLE_PHASES ends with the cycle.
+    PICK_PHASES = ("pick_approach", "needles_extend")
+    PLACE_PHASES = ("travel", "egress_wait", "press")
+
     def __init__(
         self,
         rob_conf: confuse.AttrDict,
         pick_station: PickStation,
         ros_port: int = 9090,
+        daemon: typing.Optional["DriverDaemonConnection"] = None,
     ):
-        super().__init__(ros_port=ros_port)
+        super().__init__(ros_port=ros_port, daemon=daemon)
+
+        self._setup(rob_conf, pick_station)
 
+    def _setup(self, rob_conf: confuse.AttrDict, pick_station: PickStation) -> None:
+        """Set attributes from configuration, separate from ROS setup."""
         self.rob_conf = rob_conf
 
         self.pick_place_tool = rob_conf.tools.get("pick_place")
@@ -200,31 +542,36 @@ def __init__(
     def ensure_connection(
         self,
         timeout_ping: typing.Optional[float] = None,
-        wait_after_up: typing.Optional[float] = None,
-        tries: int = 10,
-    ) -> None:
+        deadline: typing.Optional[float] = None,
+    ) -> float:
         """Check connection to ABB controller and restart abb-driver if necessary.
 
+        Defaults are read from configuration namespace ``robot_client.docker``,
+        see :meth:`AbbRcfClient.ensure_connection`.
+
         Parameters
         ----------
-        tries : :obj:`int`, optional
-            Connection tries, defaults to 3.
+        timeout_ping
+            Time to wait for a reply before restarting `abb-driver`.
+        deadline
+            Total time to wait for a reply before raising error.
+
+        Returns
+        -------
+        :obj:`float`
+            Seconds until the controller replied.
 
         Raises
         ------
-        :exc:`TimeoutError`
-            If no reply is returned before timeout.
+        :exc:`compas_rrc.TimeoutException`
+            If no reply is returned before deadline.
         """
         if timeout_ping is None:
             timeout_ping = self.docker_cfg.timeout_ping
-        if wait_after_up is None:
-            wait_after_up = self.docker_cfg.sleep_after_up
+        if deadline is None:
+            deadline = self.docker_cfg.deadline
 
-        super().ensure_connection(
-            timeout_ping=timeout_ping,
-            wait_after_up=wait_after_up,
-            tries=tries,
-        )
+        return super().ensure_connection(timeout_ping=timeout_ping, deadline=deadline)
 
     def pre_procedure(self) -> None:
         """Pre fabrication setup, speed, acceleration and initial pose."""
@@ -276,6 +623,72 @@ def post_procedure(self) -> None:
 
         self.send(compas_rrc.PrintText("Finished"))
 
+    def send_program(
+        self, program: typing.List[dict]
+    ) -> typing.List[compas_rrc.FutureResult]:
+        """Send instruction messages compiled ahead of time.
+
+        Parameters
+        ----------
+        program
+            Instruction messages, see
+            :class:`rapid_clay_formations_fab.robots.InstructionPrograms`.
+
+        Returns
+        -------
+        :obj:`list` of :class:`compas_rrc.FutureResult`
+            Futures of instructions with feedback, in the order sent. Watch
+            readings are resolved with the watch value in seconds.
+        """
+        futures = []
+        for msg in program:
+            if msg["instruction"] == _READ_WATCH_INSTRUCTION:
+                # Instance with parser for watch value
+                instruction = compas_rrc.ReadWatch()
+            else:
+                instruction = ROSmsg.from_msg(msg)
+
+            future = self.send(instruction)
+            if future:
+                futures.append(future)
+
+        return futures
+
+    def get_phase_futures(
+        self,
+        pick_futures: typing.List[compas_rrc.FutureResult],
+        place_futures: typing.List[compas_rrc.FutureResult],
+    ) -> typing.Dict[str, compas_rrc.FutureResult]:
+        """Get watch readings ending cycle phases by phase name.
+
+        Parameters
+        ----------
+        pick_futures
+            Futures returned by :meth:`send_program` for the pick program,
+            empty if the pick movement was skipped.
+        place_futures
+            Futures returned by :meth:`send_program` for the place program.
+
+        Returns
+        -------
+        :obj:`dict`
+            Empty if ``robot_client.record_phase_times`` is not set, see
+            :attr:`PlaceElement.phase_futures`.
+        """
+        phase_futures = dict(zip(self.PICK_PHASES, pick_futures))
+        phase_futures.update(zip(self.PLACE_PHASES, place_futures))
+        return phase_futures
+
+    def _end_phase(self) -> None:
+        """Read watch at end of cycle phase if phase times are recorded.
+
+        The watch is read when the robot controller's program pointer reaches
+        the instruction, which is before the robot arrives if the preceding
+        motion ends in a fly-by zone.
+        """
+        if self.rob_conf.record_phase_times:
+            self.send(compas_rrc.ReadWatch())
+
     def pick_element(self) -> None:
         """Send movement and IO instructions to pick up fabrication element."""
         self.send(compas_rrc.SetTool(self.pick_place_tool.name))
@@ -302,9 +715,11 @@ def pick_element(self) -> None:
                 compas_rrc.Zone.FINE,
             )
         )
+        self._end_phase()  # pick_approach
 
         self.extend_needles()
         self.send(compas_rrc.WaitTime(self.pick_place_tool.needles_pause))
+        self._end_phase()  # needles_extend
 
         self.send(
             MoveToRobtarget(
@@ -357,9 +772,11 @@ def place_element(self, element: PlaceElement) -> compas_rrc.FutureResult:
             # Stop if wait_at_place_egress is larger than 0
             stop_at_last=self.rob_conf.wait_at_place_egress > 0,
         )
+        self._end_phase()  # travel
 
         # Wait here if wait_at_place_egress is not 0
         self.send(compas_rrc.WaitTime(self.rob_conf.wait_at_place_egress))
+        self._end_phase()  # egress_wait
 
         # Execute all trajectories between first and last
         for trajectory in place_trajectories[1:-1]:
@@ -379,6 +796,7 @@ def place_element(self, element: PlaceElement) -> compas_rrc.FutureResult:
             self.zone.place,
             motion_type=Motion.LINEAR,
         )
+        self._end_phase()  # press
 
         return_place_trajectories = self._get_return_place_trajectories(element)
         self.execute_trajectory(
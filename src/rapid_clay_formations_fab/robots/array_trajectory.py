@@ -0,0 +1,279 @@
+"""Trajectory stored as a NumPy array, a drop-in for :class:`MinimalTrajectory`.
+
+Not available in IronPython.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import compas_rrc
+import numpy as np
+from compas.geometry import Frame
+from compas_fab.robots import Configuration
+
+from rapid_clay_formations_fab.robots.trajectories import MinimalTrajectory
+
+try:
+    import typing
+
+    if typing.TYPE_CHECKING:
+        from typing import Any
+        from typing import Callable
+        from typing import Iterable
+        from typing import List
+        from typing import Optional
+        from typing import Tuple
+        from typing import Union
+except ImportError:
+    pass
+
+# Point, then quaternion (w, x, y, z) like compas_rrc robtargets
+POSE_WIDTH = 7
+
+
+class ArrayTrajectory(MinimalTrajectory):
+    """Trajectory with its points stored in one contiguous array.
+
+    Joint trajectories are stored as an array of shape (N, number of joints)
+    with joint values in radians, frame trajectories as an array of shape
+    (N, 7) of points followed by quaternions (w, x, y, z).
+
+    The trajectory type is set when the first point is added and checked on
+    every change, adding a point of the other type raises
+    :exc:`RuntimeError` unless it replaces all points. Indexing returns new :class:`compas.geometry.Frame`
+    or :class:`compas_fab.robots.Configuration` objects, configurations only
+    keep their joint values. Slicing returns an :class:`ArrayTrajectory`
+    sharing memory with this one, like a NumPy view, use :meth:`copy` to get
+    an independent trajectory.
+
+    Appending points one at a time reallocates the array, create the
+    trajectory from all points at once or use :meth:`extend`.
+
+    Parameters
+    ----------
+    points : :obj:`list` or :class:`numpy.ndarray`
+        Frames or configurations, or an array of joint values or poses.
+    trajectory_type : :obj:`int`, optional
+        :attr:`JOINT_TRAJECTORY` or :attr:`FRAME_TRAJECTORY`. Required if
+        ``points`` is an array, otherwise taken from the points.
+
+    Examples
+    --------
+    >>> trajectory = ArrayTrajectory(np.zeros((2, 6)), MinimalTrajectory.JOINT_TRAJECTORY)
+    >>> trajectory.append(Configuration.from_revolute_values([0.1] * 6))
+    >>> trajectory.array.shape
+    (3, 6)
+    >>> trajectory.append(Frame.worldXY())
+    Traceback (most recent call last):
+    ...
+    RuntimeError: Trajectory contains more than one type of objects: ...
+    """  # noqa: E501
+
+    __slots__ = "_array"
+
+    def __init__(  # skipcq
+        self, points, trajectory_type=None
+    ):  # type: (Union[np.ndarray, Iterable[Union[Frame, Configuration]]], Optional[int]) -> None  # noqa: E501
+        self._trajectory_type = trajectory_type  # type: Optional[int]
+        self._array = np.empty((0, 0))  # type: np.ndarray
+
+        if isinstance(points, ArrayTrajectory):
+            self._trajectory_type = points._trajectory_type
+            self._array = points.array.copy()
+        elif isinstance(points, np.ndarray):
+            if trajectory_type is None:
+                raise ValueError("trajectory_type is required for arrays.")
+            self._array = self._check_array(points)
+        else:
+            self._array = self._to_array(list(points))
+
+    def __repr__(self):
+        return "ArrayTrajectory({!r}, trajectory_type={})".format(
+            self._array, self._trajectory_type
+        )
+
+    def __getitem__(self, index):  # type: (Union[int, slice]) -> Any
+        if isinstance(index, slice):
+            return self._view(self._array[index])
+        return self._to_points(self._array[index][np.newaxis])[0]
+
+    def __setitem__(self, index, item):  # type: (Union[int, slice], Any) -> None
+        if not isinstance(index, slice):
+            index = range(len(self))[index]  # Raise IndexError like lists
+            index, item = slice(index, index + 1), [item]
+
+        selected = range(*index.indices(len(self)))
+        trajectory_type = self._trajectory_type
+
+        if len(selected) == len(self) and not isinstance(item, np.ndarray):
+            # No points are left, the type is the one of the new points
+            if not isinstance(item, ArrayTrajectory):
+                item = ArrayTrajectory(item)
+            if len(item):
+                trajectory_type = item.trajectory_type
+
+        if trajectory_type == self._trajectory_type:
+            rows = self._to_array(item)
+        else:
+            rows = item.array
+
+        if len(rows) == len(selected):
+            if trajectory_type != self._trajectory_type:
+                self._array = np.empty_like(rows)
+            self._array[index] = rows
+        elif index.step in (None, 1):
+            start, stop = selected.start, max(selected.start, selected.stop)
+            self._array = self._concatenate(
+                self._array[:start], rows, self._array[stop:]
+            )
+        else:
+            raise ValueError(
+                "attempt to assign sequence of size {} to extended slice of "
+                "size {}".format(len(rows), len(selected))
+            )
+
+        self._trajectory_type = trajectory_type
+
+    def __delitem__(self, index):  # type: (Union[int, slice]) -> None
+        if not isinstance(index, slice):
+            index = range(len(self))[index]  # Raise IndexError like lists
+        self._array = np.delete(self._array, index, axis=0)
+
+    def __len__(self):  # type: () -> int
+        return len(self._array)
+
+    def insert(self, index, item):  # type: (int, Any) -> None
+        """Insert point at specified index."""
+        row = self._to_array([item])
+        index = min(max(index + len(self) if index < 0 else index, 0), len(self))
+        self._array = self._concatenate(self._array[:index], row, self._array[index:])
+
+    def extend(self, points):  # type: (Iterable[Union[Frame, Configuration]]) -> None
+        """Append points, reallocating the array once."""
+        self._array = self._concatenate(self._array, self._to_array(points))
+
+    def reverse(self):  # type: () -> None
+        """Reverse trajectory in place."""
+        self._array = self._array[::-1]
+
+    @property
+    def array(self):  # type: () -> np.ndarray
+        """:class:`numpy.ndarray` : Joint values in radians or poses."""
+        return self._array
+
+    @property
+    def points(self):  # type: () -> List[Union[Frame, Configuration]]
+        """:obj:`list` : New list of trajectory points."""
+        return self._to_points(self._array)
+
+    @points.setter
+    def points(self, points):  # type: (List[Union[Frame, Configuration]]) -> None
+        self._trajectory_type = None
+        self._array = np.empty((0, 0))
+        self._array = self._to_array(points)
+
+    @property
+    def trajectory_type(self):  # type: () -> int
+        """:obj:`int` : Type of points in the trajectory."""
+        if self._trajectory_type is None:
+            raise RuntimeError("Trajectory has no points to get the type from.")
+        return self._trajectory_type
+
+    def copy(self):  # type: () -> ArrayTrajectory
+        """Get an independent copy of object."""
+        return self._view(self._array.copy())
+
+    def to_compas_rrc(
+        self,
+    ):  # type: () -> Tuple[Callable, List[Union[Frame, compas_rrc.RobotJoints]]]
+        if self.trajectory_type == self.FRAME_TRAJECTORY:
+            return compas_rrc.MoveToRobtarget, self.points
+
+        degrees = np.degrees(self._array).tolist()
+        return compas_rrc.MoveToJoints, [compas_rrc.RobotJoints(*d) for d in degrees]
+
+    def _view(self, array):  # type: (np.ndarray) -> ArrayTrajectory
+        view = type(self).__new__(type(self))
+        view._array = array
+        view._trajectory_type = self._trajectory_type
+        return view
+
+    @staticmethod
+    def _concatenate(*arrays):  # type: (np.ndarray) -> np.ndarray
+        # Skip empty arrays, they may not have the width of the others yet
+        arrays = tuple(a for a in arrays if len(a)) or arrays[:1]
+        return np.concatenate(arrays) if len(arrays) > 1 else arrays[0].copy()
+
+    def _check_array(self, array):  # type: (np.ndarray) -> np.ndarray
+        array = np.asarray(array, dtype=np.float64)
+
+        if array.ndim != 2:
+            raise ValueError("Expected 2D array, got shape {}.".format(array.shape))
+        if self._trajectory_type == self.FRAME_TRAJECTORY and (
+            array.shape[1] != POSE_WIDTH
+        ):
+            raise ValueError(
+                "Expected poses of {} values, got shape {}.".format(
+                    POSE_WIDTH, array.shape
+                )
+            )
+        if len(self._array) and array.shape[1] != self._array.shape[1]:
+            raise ValueError(
+                "Expected {} values per point, got shape {}.".format(
+                    self._array.shape[1], array.shape
+                )
+            )
+
+        return array
+
+    def _to_array(self, points):  # type: (Any) -> np.ndarray
+        """Get rows for points, setting the trajectory type if not set."""
+        if isinstance(points, ArrayTrajectory):
+            if len(points) == 0:
+                return self._array[:0]
+            self._set_type(points.trajectory_type)
+            return self._check_array(points.array)
+        if isinstance(points, np.ndarray):
+            if self._trajectory_type is None:
+                raise ValueError("Trajectory has no type to check array against.")
+            return self._check_array(points)
+
+        points = list(points)
+        if not points:
+            return self._array[:0]
+
+        self._check_points(points)
+
+        if self._trajectory_type == self.JOINT_TRAJECTORY:
+            rows = [pt.values for pt in points]
+        else:
+            rows = [list(pt.point) + list(pt.quaternion) for pt in points]
+
+        return self._check_array(rows)
+
+    def _to_points(self, array):
+        # type: (np.ndarray) -> List[Union[Frame, Configuration]]
+        if self._trajectory_type == self.JOINT_TRAJECTORY:
+            return [Configuration.from_revolute_values(v) for v in array.tolist()]
+
+        points, xaxes, yaxes = _poses_to_axes(array)
+        return [
+            Frame(pt, xaxis, yaxis)
+            for pt, xaxis, yaxis in zip(points.tolist(), xaxes.tolist(), yaxes.tolist())
+        ]
+
+
+def _poses_to_axes(poses):
+    # type: (np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]
+    """Get points, x axes and y axes of poses, see :attr:`ArrayTrajectory.array`."""
+    q = poses[:, 3:] / np.linalg.norm(poses[:, 3:], axis=1)[:, np.newaxis]
+    w, x, y, z = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+
+    xaxes = np.stack(
+        (1 - 2 * (y * y + z * z), 2 * (x * y + w * z), 2 * (x * z - w * y)), axis=1
+    )
+    yaxes = np.stack(
+        (2 * (x * y - w * z), 1 - 2 * (x * x + z * z), 2 * (y * z + w * x)), axis=1
+    )
+
+    return poses[:, :3], xaxes, yaxes
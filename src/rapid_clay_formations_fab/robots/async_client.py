@@ -0,0 +1,187 @@
+"""asyncio interface for the RCF robot clients."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import asyncio
+import typing
+
+import compas_rrc
+from compas_fab.backends.ros.messages import ROSmsg
+
+from rapid_clay_formations_fab.fab_data import PlaceElement
+from rapid_clay_formations_fab.robots.abb_rcf_client import AbbRcfClient
+from rapid_clay_formations_fab.robots.abb_rcf_client import AbbRcfFabricationClient
+from rapid_clay_formations_fab.robots.futures import wrap_future
+
+T = typing.TypeVar("T", bound="AsyncAbbRcfClient")
+
+
+class AsyncAbbRcfClient(object):
+    """asyncio interface to :class:`AbbRcfClient`.
+
+    Instructions are sent from the event loop and feedback is awaited without
+    blocking it, so that other tasks can run in the same loop.
+
+    Parameters
+    ----------
+    client
+        Client used to send instructions, should only be used through this
+        object while the event loop runs.
+    """
+
+    def __init__(self, client: AbbRcfClient) -> None:
+        self.client = client
+
+    async def __aenter__(self: T) -> T:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.client.__enter__)
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.client.__exit__, *args)
+
+    def send(self, instruction: ROSmsg) -> typing.Optional[asyncio.Future]:
+        """Send instruction.
+
+        Parameters
+        ----------
+        instruction
+
+        Returns
+        -------
+        :class:`asyncio.Future` or :obj:`None`
+            Future resolved with feedback, or ``None`` if the instruction's
+            ``feedback_level`` is ``0``.
+        """
+        future = self.client.send(instruction)
+        if future is None:
+            return None
+
+        return wrap_future(future)
+
+    async def send_and_wait(
+        self, instruction: ROSmsg, timeout: typing.Optional[float] = None
+    ) -> typing.Any:
+        """Send instruction and wait for feedback.
+
+        Parameters
+        ----------
+        instruction
+        timeout
+            Seconds to wait for feedback, defaults to waiting until it arrives.
+
+        Raises
+        ------
+        :exc:`compas_rrc.TimeoutException`
+            If no feedback is returned before timeout.
+        """
+        if instruction.feedback_level == 0:
+            instruction.feedback_level = compas_rrc.FeedbackLevel.DONE
+
+        future = self.send(instruction)
+        self.client.flush()
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise compas_rrc.TimeoutException("Timeout: future result not available")
+
+    async def ping(self, timeout: typing.Optional[float] = None) -> None:
+        """Ping ABB robot controller.
+
+        Parameters
+        ----------
+        timeout
+            Timeout for reply. Defaults to
+            :attr:`AbbRcfClient.TIMEOUT_SHORT`.
+
+        Raises
+        ------
+        :exc:`compas_rrc.TimeoutException`
+            If no reply is returned before timeout.
+        """
+        await self.send_and_wait(
+            compas_rrc.Noop(feedback_level=compas_rrc.FeedbackLevel.DONE),
+            timeout=timeout or self.client.TIMEOUT_SHORT,
+        )
+
+    async def feedback(self) -> typing.AsyncIterator[dict]:
+        """Iterate over feedback messages from the robot as they arrive.
+
+        Yields
+        ------
+        :obj:`dict`
+            Feedback message, containing e.g. ``feedback_id`` (sequence id of
+            the instruction) and ``feedback``.
+
+        Examples
+        --------
+        >>> async for msg in async_client.feedback():  # doctest: +SKIP
+        ...     print(msg["feedback"])
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def on_feedback(msg: dict) -> None:
+            loop.call_soon_threadsafe(queue.put_nowait, msg)
+
+        # Same event the compas_rrc client uses for its futures
+        topic_name = self.client.feedback.name
+        self.client.ros.on(topic_name, on_feedback)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.client.ros.off(topic_name, on_feedback)
+
+
+class AsyncAbbRcfFabricationClient(AsyncAbbRcfClient):
+    """asyncio interface to :class:`AbbRcfFabricationClient`.
+
+    Parameters
+    ----------
+    client
+        Client used to send instructions, should only be used through this
+        object while the event loop runs.
+
+    Examples
+    --------
+    >>> async def place(client, elements):  # doctest: +SKIP
+    ...     async with AsyncAbbRcfFabricationClient(client) as async_client:
+    ...         await async_client.ping()
+    ...         for elem in elements:
+    ...             await async_client.pick_element()
+    ...             await async_client.place_element(elem)
+    """
+
+    client: AbbRcfFabricationClient
+
+    async def pick_element(self) -> None:
+        """Pick element and wait until the robot has executed the instructions.
+
+        See :meth:`AbbRcfFabricationClient.pick_element`.
+        """
+        await self._send_batch_and_wait(self.client.pick_element)
+
+    async def place_element(self, element: PlaceElement) -> None:
+        """Place element and wait until the robot has executed the instructions.
+
+        See :meth:`AbbRcfFabricationClient.place_element`.
+
+        Parameters
+        ----------
+        element
+        """
+        await self._send_batch_and_wait(self.client.place_element, element)
+
+    async def _send_batch_and_wait(
+        self, send_instructions: typing.Callable, *args: typing.Any
+    ) -> None:
+        with self.client.batch():
+            send_instructions(*args)
+            done = self.send(
+                compas_rrc.Noop(feedback_level=compas_rrc.FeedbackLevel.DONE)
+            )
+        await done
@@ -3,9 +3,13 @@
 from __future__ import division
 from __future__ import print_function
 
+import logging
 from os.path import join
 
 from rapid_clay_formations_fab import DOCKER_COMPOSE_DIR
+from rapid_clay_formations_fab.docker import get_container_attrs
+
+log = logging.getLogger(__name__)
 
 _compose_file_name = "docker-compose.yml"
 _driver_compose_dir = "abb-driver"
@@ -19,4 +23,52 @@
 DRIVER_CONTAINER_NAME = "abb-driver"
 DRIVER_IMAGE_NAME = "tetov/compas_rrc_driver:1.0.0"
 
+# All containers in driver compose file
+DRIVER_STACK_CONTAINER_NAMES = (
+    "ros-master-driver",
+    "ros-bridge-driver",
+    DRIVER_CONTAINER_NAME,
+)
+
 ROBOT_IPS = {"real": "192.168.125.1", "virtual": "host.docker.internal"}
+
+
+def is_driver_running(robot_ip):  # type: (str) -> bool
+    """Check if driver containers are running as ``docker-compose up`` would start them.
+
+    All containers in the driver compose file need to be running from
+    :data:`DRIVER_IMAGE_NAME`, and ``abb-driver`` needs to connect to
+    ``robot_ip``.
+
+    Parameters
+    ----------
+    robot_ip : :obj:`str`
+        IP of controller, see :data:`ROBOT_IPS`.
+
+    Returns
+    -------
+    :obj:`bool`
+        ``False`` also if docker could not be reached.
+    """
+    for name in DRIVER_STACK_CONTAINER_NAMES:
+        try:
+            attrs = get_container_attrs(name)
+        except Exception as e:
+            log.debug("Could not get state of {}: {}".format(name, e))
+            return False
+
+        if not attrs or not attrs["State"].get("Running"):
+            log.debug("{} is not running.".format(name))
+            return False
+
+        if attrs["Config"]["Image"] != DRIVER_IMAGE_NAME:
+            log.debug("{} runs image {}.".format(name, attrs["Config"]["Image"]))
+            return False
+
+        # ROBOT_IP is passed to the driver as a launch argument
+        robot_ip_arg = "robot_ip:={}".format(robot_ip)
+        if name == DRIVER_CONTAINER_NAME and robot_ip_arg not in attrs["Args"]:
+            log.debug("{} is not connecting to {}.".format(name, robot_ip))
+            return False
+
+    return True
@@ -0,0 +1,436 @@
+"""Offline estimate of cycle times, without a robot controller.
+
+The instruction programs sent by the fabrication script are walked and each
+motion is timed using a kinematic model, see :class:`CycleTimeModel`.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import logging
+import math
+import typing
+
+import confuse
+from compas.geometry import Frame
+from compas.geometry import distance_point_point
+
+from rapid_clay_formations_fab.fab_data import PlaceElement
+from rapid_clay_formations_fab.robots.instruction_programs import InstructionPrograms
+from rapid_clay_formations_fab.robots.instruction_programs import Program
+from rapid_clay_formations_fab.robots.pick_station import PickStation
+
+log = logging.getLogger(__name__)
+
+# RAPID procedure names of instructions that affect timing
+_INSTRUCTION_PREFIX = "r_RRC_"
+_MOVE_TO_FRAME = _INSTRUCTION_PREFIX + "MoveTo"
+_MOVE_TO_JOINTS = _INSTRUCTION_PREFIX + "MoveToJoints"
+_WAIT_TIME = _INSTRUCTION_PREFIX + "WaitTime"
+_SET_MAX_SPEED = _INSTRUCTION_PREFIX + "SetMaxSpeed"
+_SET_ACCELERATION = _INSTRUCTION_PREFIX + "SetAcceleration"
+
+# Zone value of compas_rrc.Zone.FINE
+_ZONE_FINE = -1
+
+ForwardKinematics = typing.Callable[[typing.List[float]], Frame]
+
+
+class CycleTimeModel(object):
+    """Robot specific parameters of the kinematic time model.
+
+    Motions follow a trapezoidal speed profile, extended by the time needed to
+    ramp the acceleration up and down. Motions ending in a fly-by zone do not
+    slow down before the next motion, motions ending in ``Zone.FINE`` or
+    followed by a ``WaitTime`` come to a stop.
+
+    The defaults are rough values for a large industrial robot and should be
+    calibrated against cycle times measured with ``rcf test``.
+
+    Parameters
+    ----------
+    tcp_accel
+        TCP acceleration in mm/s² at 100 % of ``SetAcceleration``.
+    tcp_jerk
+        TCP jerk in mm/s³ at 100 % ramp of ``SetAcceleration``.
+    reach
+        Distance in mm from the base axis to the TCP, used to convert the TCP
+        speed of joint motions to joint speed.
+    joint_speed_max
+        Maximum speed in °/s of the fastest moving axis in joint motions.
+    """
+
+    def __init__(
+        self,
+        tcp_accel: float = 3000.0,
+        tcp_jerk: float = 30000.0,
+        reach: float = 1500.0,
+        joint_speed_max: float = 175.0,
+    ) -> None:
+        self.tcp_accel = tcp_accel
+        self.tcp_jerk = tcp_jerk
+        self.reach = reach
+        self.joint_speed_max = joint_speed_max
+
+    def __repr__(self) -> str:
+        return (
+            f"CycleTimeModel(tcp_accel={self.tcp_accel}, tcp_jerk={self.tcp_jerk}, "
+            + f"reach={self.reach}, joint_speed_max={self.joint_speed_max})"
+        )
+
+
+class CycleTimeEstimate(object):
+    """Estimated cycle times of fabrication elements.
+
+    Parameters
+    ----------
+    cycle_times
+        Seconds from start of pick to end of return motion, ``None`` for
+        skipped elements.
+    untimed_transitions
+        Number of motions between a joint target and a frame target that
+        could not be timed without forward kinematics and were counted as
+        taking no time.
+    """
+
+    def __init__(
+        self,
+        cycle_times: typing.List[typing.Optional[float]],
+        untimed_transitions: int = 0,
+    ) -> None:
+        self.cycle_times = cycle_times
+        self.untimed_transitions = untimed_transitions
+
+    def __repr__(self) -> str:
+        return (
+            f"CycleTimeEstimate({len(self.cycle_times)} elements, "
+            + f"total={self.total:.1f} s)"
+        )
+
+    @property
+    def total(self) -> float:
+        """Seconds to place all elements not skipped."""
+        return sum(t for t in self.cycle_times if t is not None)
+
+    @property
+    def mean(self) -> typing.Optional[float]:
+        """Mean cycle time in seconds, ``None`` if all elements are skipped."""
+        times = [t for t in self.cycle_times if t is not None]
+        if not times:
+            return None
+        return sum(times) / len(times)
+
+
+class CycleTimeSimulator(object):
+    """Time instruction programs using a kinematic model.
+
+    Frames are assumed to be given in the same coordinate system, i.e. the
+    pick and place work objects are assumed to coincide.
+
+    Parameters
+    ----------
+    rob_conf
+        Configuration namespace ``robot_client``.
+    model
+        Robot specific parameters, defaults to :class:`CycleTimeModel` with
+        default values.
+    forward_kinematics
+        Function returning the TCP frame for joint values in degrees. Used to
+        time motions between joint targets and frame targets, which are
+        otherwise counted as taking no time. That is a good approximation for
+        travel trajectories planned between the egress frames.
+    """
+
+    def __init__(
+        self,
+        rob_conf: confuse.AttrDict,
+        model: typing.Optional[CycleTimeModel] = None,
+        forward_kinematics: typing.Optional[ForwardKinematics] = None,
+    ) -> None:
+        self.model = model or CycleTimeModel()
+        self.forward_kinematics = forward_kinematics
+
+        speed_accel = rob_conf.robot_movement.global_speed_accel
+        self.set_max_speed(speed_accel.speed_override, speed_accel.speed_max_tcp)
+        self.set_acceleration(speed_accel.accel, speed_accel.accel_ramp)
+
+        # Robot is at start position after AbbRcfFabricationClient.pre_procedure
+        self._joints: typing.Optional[typing.List[float]] = list(
+            rob_conf.robot_movement.joint_positions.start
+        )
+        self._point: typing.Optional[typing.List[float]] = self._get_tcp_point(
+            self._joints
+        )
+
+        # Speed, acceleration and jerk of last motion if robot has not stopped
+        self._moving: typing.Optional[typing.Tuple[float, float, float]] = None
+
+        # Motion sent but not timed until it is known if the robot stops after
+        self._pending_motion: typing.Optional[typing.Tuple[float, float, float]] = None
+        self._pending_space = "joint"
+
+        self.untimed_transitions = 0
+
+    def set_max_speed(self, override: float, max_tcp: float) -> None:
+        """Apply ``SetMaxSpeed``.
+
+        Parameters
+        ----------
+        override
+            Speed override in percent.
+        max_tcp
+            Maximum TCP speed in mm/s.
+        """
+        self._speed_factor = override / 100
+        self._speed_max_tcp = max_tcp
+
+    def set_acceleration(self, accel: float, ramp: float) -> None:
+        """Apply ``SetAcceleration``.
+
+        Parameters
+        ----------
+        accel
+            Acceleration in percent of :attr:`CycleTimeModel.tcp_accel`.
+        ramp
+            Ramp in percent of :attr:`CycleTimeModel.tcp_jerk`.
+        """
+        self._accel = self.model.tcp_accel * accel / 100
+        self._jerk = self.model.tcp_jerk * ramp / 100
+
+    def run_program(self, program: Program) -> float:
+        """Time instruction messages.
+
+        The last motion is timed as if the robot continues without stopping,
+        unless it ends in ``Zone.FINE``, since the next program is expected to
+        be sent before the robot gets there. Use :meth:`stop` after the last
+        program.
+
+        Parameters
+        ----------
+        program
+            Instruction messages, see :class:`InstructionPrograms`.
+
+        Returns
+        -------
+        :obj:`float`
+            Seconds until the robot has executed the messages.
+        """
+        seconds = 0.0
+
+        for msg in program:
+            instruction = msg["instruction"]
+            values = msg["float_values"]
+
+            if instruction == _MOVE_TO_FRAME:
+                seconds += self._time_pending_motion(stops=False)
+                self._add_frame_motion(values[:3], values[13], values[14])
+            elif instruction == _MOVE_TO_JOINTS:
+                seconds += self._time_pending_motion(stops=False)
+                self._add_joint_motion(values[:6], values[12], values[13])
+            elif instruction == _WAIT_TIME:
+                # Program execution waits for the robot to reach the target
+                # before the wait starts
+                seconds += self._time_pending_motion(stops=True)
+                seconds += values[0]
+            elif instruction == _SET_MAX_SPEED:
+                self.set_max_speed(*values)
+            elif instruction == _SET_ACCELERATION:
+                self.set_acceleration(*values)
+
+        if self._pending_motion and self._pending_motion[2] == _ZONE_FINE:
+            seconds += self._time_pending_motion(stops=True)
+        else:
+            seconds += self._time_pending_motion(stops=False)
+
+        return seconds
+
+    def stop(self) -> float:
+        """Get seconds needed to stop after the last program.
+
+        Returns
+        -------
+        :obj:`float`
+        """
+        if not self._moving:
+            return 0.0
+
+        # Only the deceleration of the motion already timed remains
+        seconds = self._ramp_time(*self._moving)
+        self._moving = None
+        return seconds
+
+    def _add_frame_motion(
+        self, point: typing.List[float], speed: float, zone: float
+    ) -> None:
+        distance = 0.0
+        start = self._point
+        if start is None and self._joints is not None:
+            self.untimed_transitions += 1
+        elif start is not None:
+            distance = distance_point_point(start, point)
+
+        self._point = list(point)
+        self._joints = None
+
+        speed = min(speed, self._speed_max_tcp) * self._speed_factor
+        self._pending_motion = (distance, speed, zone)
+        self._pending_space = "tcp"
+
+    def _add_joint_motion(
+        self, joints: typing.List[float], speed: float, zone: float
+    ) -> None:
+        end_point = self._get_tcp_point(joints)
+
+        if self._joints is not None:
+            distance = max(abs(a - b) for a, b in zip(joints, self._joints))
+            space = "joint"
+        elif end_point is not None and self._point is not None:
+            distance = distance_point_point(self._point, end_point)
+            space = "tcp"
+        else:
+            distance = 0.0
+            space = "joint"
+            self.untimed_transitions += 1
+
+        self._joints = list(joints)
+        self._point = end_point
+
+        speed = min(speed, self._speed_max_tcp)
+        if space == "joint":
+            # TCP speed to speed of the fastest moving axis in °/s
+            speed = min(
+                math.degrees(speed / self.model.reach), self.model.joint_speed_max
+            )
+        self._pending_motion = (distance, speed * self._speed_factor, zone)
+        self._pending_space = space
+
+    def _get_tcp_point(
+        self, joints: typing.List[float]
+    ) -> typing.Optional[typing.List[float]]:
+        if not self.forward_kinematics:
+            return None
+        return list(self.forward_kinematics(list(joints)).point)
+
+    def _time_pending_motion(self, stops: bool) -> float:
+        motion = self._pending_motion
+        self._pending_motion = None
+
+        if not motion or motion[0] <= 0:
+            return self.stop() if stops else 0.0
+
+        distance, speed, _ = motion
+
+        accel, jerk = self._accel, self._jerk
+        if self._pending_space == "joint":
+            # Axis acceleration corresponding to TCP acceleration at reach
+            accel = math.degrees(accel / self.model.reach)
+            jerk = math.degrees(jerk / self.model.reach)
+
+        starts = self._moving is None
+        seconds = self._motion_time(distance, speed, accel, jerk, starts, stops)
+
+        self._moving = None if stops else (speed, accel, jerk)
+
+        return seconds
+
+    @classmethod
+    def _motion_time(
+        cls,
+        distance: float,
+        speed: float,
+        accel: float,
+        jerk: float,
+        starts: bool,
+        stops: bool,
+    ) -> float:
+        if distance <= 0:
+            return 0.0
+
+        n_ramps = int(starts) + int(stops)
+        if n_ramps == 0:
+            return distance / speed
+
+        # Speed is not reached if the motion is too short
+        ramp_distance = speed ** 2 / (2 * accel)
+        if distance < n_ramps * ramp_distance:
+            speed = math.sqrt(2 * accel * distance / n_ramps)
+            return n_ramps * (speed / accel + accel / (2 * jerk))
+
+        return distance / speed + n_ramps * cls._ramp_time(speed, accel, jerk)
+
+    @staticmethod
+    def _ramp_time(speed: float, accel: float, jerk: float) -> float:
+        """Time lost accelerating to or decelerating from speed."""
+        return speed / (2 * accel) + accel / (2 * jerk)
+
+
+def estimate_cycle_times(
+    rob_conf: confuse.AttrDict,
+    pick_station: PickStation,
+    fab_elements: typing.List[PlaceElement],
+    programs: typing.Optional[InstructionPrograms] = None,
+    model: typing.Optional[CycleTimeModel] = None,
+    forward_kinematics: typing.Optional[ForwardKinematics] = None,
+) -> CycleTimeEstimate:
+    """Estimate cycle times of fabrication elements without a robot.
+
+    Elements are walked like in the fabrication script, skipping elements
+    marked ``skip`` and pick motions if ``skip_pick_movement`` or
+    ``robot_client.skip_all_pick_movements`` is set.
+
+    Parameters
+    ----------
+    rob_conf
+        Configuration namespace ``robot_client``.
+    pick_station
+        Pick station, not modified.
+    fab_elements
+    programs
+        Instruction programs compiled from the same inputs, compiled if not
+        given. See :meth:`InstructionPrograms.load_or_compile`.
+    model
+        See :class:`CycleTimeSimulator`.
+    forward_kinematics
+        See :class:`CycleTimeSimulator`.
+
+    Returns
+    -------
+    :class:`CycleTimeEstimate`
+    """
+    if programs is None:
+        programs = InstructionPrograms.compile(rob_conf, pick_station, fab_elements)
+
+    # Fresh pick station to pick from the frames in order
+    pick_station = PickStation.from_data(pick_station.data)
+
+    simulator = CycleTimeSimulator(
+        rob_conf, model=model, forward_kinematics=forward_kinematics
+    )
+
+    cycle_times: typing.List[typing.Optional[float]] = []
+    for i, elem in enumerate(fab_elements):
+        if elem.skip:
+            cycle_times.append(None)
+            continue
+
+        cycle_time = 0.0
+        if not elem.skip_pick_movement and not rob_conf.skip_all_pick_movements:
+            cycle_time += simulator.run_program(programs.get_pick_program(pick_station))
+        cycle_time += simulator.run_program(programs.place_programs[i])
+
+        cycle_times.append(cycle_time)
+
+    # Robot stops after last element placed
+    placed_idxs = [i for i, t in enumerate(cycle_times) if t is not None]
+    if placed_idxs:
+        cycle_times[placed_idxs[-1]] += simulator.stop()
+
+    if simulator.untimed_transitions:
+        log.debug(
+            f"{simulator.untimed_transitions} motions between joint and frame "
+            + "targets counted as taking no time."
+        )
+
+    return CycleTimeEstimate(
+        cycle_times, untimed_transitions=simulator.untimed_transitions
+    )
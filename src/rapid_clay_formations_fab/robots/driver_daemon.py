@@ -0,0 +1,335 @@
+"""Daemon keeping the driver and its ROS connection up between commands.
+
+The daemon is started with ``rcf daemon``. Commands attach to it over a local
+socket instead of running ``docker-compose up``, connecting to ROS and
+pinging the controller themselves.
+
+Messages are JSON objects, one per line. Commands send ``publish`` (a list of
+instruction messages) and ``ensure_connection`` requests, the daemon sends
+``hello`` when a command attaches, ``feedback`` for published instructions
+and ``ready`` or ``error`` as replies to ``ensure_connection``.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import logging
+import queue
+import socket
+import socketserver
+import threading
+import typing
+
+import compas_rrc
+from compas.utilities import DataEncoder
+
+from rapid_clay_formations_fab import __version__
+from rapid_clay_formations_fab.robots.abb_rcf_client import AbbRcfClient
+from rapid_clay_formations_fab.robots.futures import INTERRUPT_CHECK_INTERVAL
+
+log = logging.getLogger(__name__)
+
+DRIVER_DAEMON_HOST = "127.0.0.1"
+DRIVER_DAEMON_PORT = 12458
+
+
+def _dumps(obj: dict) -> bytes:
+    return (json.dumps(obj, cls=DataEncoder) + "\n").encode("utf-8")
+
+
+class DriverDaemon(object):
+    """Daemon sharing a connected client with commands attached over a socket.
+
+    Instructions from attached commands get sequence ids from the daemon's
+    client, and feedback is routed back to the command that sent the
+    instruction with the command's own sequence id.
+
+    Parameters
+    ----------
+    client
+        Client connected to the driver.
+    controller
+        Target controller of the driver, either ``"real"`` or ``"virtual"``.
+    port
+        Port to listen on, on localhost only.
+    """
+
+    def __init__(
+        self, client: AbbRcfClient, controller: str, port: int = DRIVER_DAEMON_PORT
+    ) -> None:
+        self.client = client
+        self.controller = controller
+
+        # Daemon sequence id to attached command and its sequence id
+        self._routes: typing.Dict[int, typing.Tuple[_DaemonHandler, int]] = {}
+        self._routes_lock = threading.Lock()
+
+        self._server = _DaemonServer((DRIVER_DAEMON_HOST, port), _DaemonHandler)
+        self._server.driver_daemon = self
+
+    @property
+    def port(self) -> int:
+        """Port the daemon listens on."""
+        return self._server.server_address[1]
+
+    def serve_forever(self) -> None:
+        """Handle commands until :meth:`shutdown` is called or Ctrl+C is pressed."""
+        topic_name = self.client.feedback.name
+        self.client.ros.on(topic_name, self._on_feedback)
+        try:
+            self._server.serve_forever(poll_interval=INTERRUPT_CHECK_INTERVAL)
+        finally:
+            self.client.ros.off(topic_name, self._on_feedback)
+            self._server.server_close()
+
+    def shutdown(self) -> None:
+        """Stop :meth:`serve_forever`, from another thread."""
+        self._server.shutdown()
+
+    def publish(
+        self, handler: "_DaemonHandler", instruction_msgs: typing.List[dict]
+    ) -> None:
+        """Publish instruction messages from attached command."""
+        msgs = []
+        for msg in instruction_msgs:
+            sequence_id = self.client.counter.increment()
+
+            if msg.get("feedback_level", 0) > 0:
+                with self._routes_lock:
+                    self._routes[sequence_id] = (handler, msg["sequence_id"])
+
+            msgs.append(dict(msg, sequence_id=sequence_id))
+
+        self.client._publish(msgs)
+
+    def forget(self, handler: "_DaemonHandler") -> None:
+        """Remove routes to detached command."""
+        with self._routes_lock:
+            for key, (route_handler, _) in list(self._routes.items()):
+                if route_handler is handler:
+                    del self._routes[key]
+
+    def _on_feedback(self, msg: dict) -> None:
+        with self._routes_lock:
+            route = self._routes.pop(msg["feedback_id"], None)
+
+        if not route:  # Feedback to the daemon's own instructions
+            return
+
+        handler, sequence_id = route
+        handler.write({"op": "feedback", "msg": dict(msg, feedback_id=sequence_id)})
+
+
+class _DaemonServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    driver_daemon: DriverDaemon
+
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    """Connection to an attached command."""
+
+    server: _DaemonServer
+
+    def setup(self) -> None:
+        super().setup()
+        self._write_lock = threading.Lock()
+
+    def write(self, obj: dict) -> None:
+        try:
+            with self._write_lock:
+                self.wfile.write(_dumps(obj))
+        except OSError as e:
+            log.debug(f"Could not write to attached command: {e}")
+
+    def handle(self) -> None:
+        daemon = self.server.driver_daemon
+        log.info(f"Command attached from {self.client_address}.")
+
+        self.write(
+            {"op": "hello", "controller": daemon.controller, "version": __version__}
+        )
+
+        for line in self.rfile:
+            request = json.loads(line)
+
+            if request["op"] == "publish":
+                daemon.publish(self, request["msgs"])
+            elif request["op"] == "ensure_connection":
+                self.write(self._ensure_connection(daemon.client, request))
+            else:
+                log.warning(f"Unknown request from attached command: {request}")
+
+    def finish(self) -> None:
+        self.server.driver_daemon.forget(self)
+        log.info(f"Command detached from {self.client_address}.")
+        super().finish()
+
+    @staticmethod
+    def _ensure_connection(client: AbbRcfClient, request: dict) -> dict:
+        kwargs = {
+            key: request[key]
+            for key in ("timeout_ping", "deadline")
+            if request.get(key) is not None
+        }
+        try:
+            time_to_ready = client.ensure_connection(**kwargs)
+        except compas_rrc.TimeoutException as e:
+            return {"op": "error", "timeout": True, "message": str(e)}
+        except Exception as e:
+            log.exception("Connection check failed.")
+            return {"op": "error", "timeout": False, "message": str(e)}
+
+        return {"op": "ready", "time_to_ready": time_to_ready}
+
+
+class DriverDaemonConnection(object):
+    """Connection from a command to a running :class:`DriverDaemon`.
+
+    Pass to :class:`AbbRcfClient` to send instructions through the daemon.
+
+    Parameters
+    ----------
+    sock
+        Connected socket.
+    """
+
+    def __init__(self, sock: socket.socket) -> None:
+        self._sock = sock
+        self._rfile = sock.makefile("rb")
+        self._write_lock = threading.Lock()
+        self._replies: queue.Queue = queue.Queue()
+
+    @classmethod
+    def attach(
+        cls,
+        controller: str,
+        port: int = DRIVER_DAEMON_PORT,
+        timeout: float = 0.5,
+    ) -> typing.Optional["DriverDaemonConnection"]:
+        """Attach to daemon if one is running.
+
+        Parameters
+        ----------
+        controller
+            Target controller, either ``"real"`` or ``"virtual"``.
+        port
+            Port the daemon listens on.
+        timeout
+            Seconds to wait for the daemon to accept the connection.
+
+        Returns
+        -------
+        :class:`DriverDaemonConnection` or :obj:`None`
+            ``None`` if no daemon is running.
+
+        Raises
+        ------
+        :exc:`RuntimeError`
+            If the daemon is running for another controller.
+        """
+        try:
+            sock = socket.create_connection((DRIVER_DAEMON_HOST, port), timeout=timeout)
+        except OSError:
+            return None
+
+        connection = cls(sock)
+        try:
+            hello = json.loads(connection._rfile.readline())
+        except (OSError, ValueError):  # Not a driver daemon
+            connection.close()
+            return None
+
+        sock.settimeout(None)
+
+        if hello["controller"] != controller:
+            connection.close()
+            raise RuntimeError(
+                f"Driver daemon is running for {hello['controller']} controller, "
+                + f"not {controller}. Stop the daemon or change controller."
+            )
+
+        log.debug(f"Attached to driver daemon version {hello['version']}.")
+
+        return connection
+
+    def start(self, on_feedback: typing.Callable[[dict], None]) -> None:
+        """Start receiving messages from the daemon.
+
+        Parameters
+        ----------
+        on_feedback
+            Called from a background thread with each feedback message.
+        """
+
+        def receive() -> None:
+            for line in self._rfile:
+                message = json.loads(line)
+                if message["op"] == "feedback":
+                    on_feedback(message["msg"])
+                else:
+                    self._replies.put(message)
+
+            self._replies.put(
+                {"op": "error", "timeout": False, "message": "Daemon disconnected."}
+            )
+
+        threading.Thread(target=receive, daemon=True).start()
+
+    def publish(self, instruction_msgs: typing.List[dict]) -> None:
+        """Publish instruction messages through the daemon.
+
+        Parameters
+        ----------
+        instruction_msgs
+            Messages as returned by ``instruction.msg``.
+        """
+        self._write({"op": "publish", "msgs": instruction_msgs})
+
+    def ensure_connection(
+        self,
+        timeout_ping: typing.Optional[float] = None,
+        deadline: typing.Optional[float] = None,
+    ) -> float:
+        """Let daemon check connection to controller.
+
+        See :meth:`AbbRcfClient.ensure_connection`.
+
+        Returns
+        -------
+        :obj:`float`
+            Seconds until the controller replied.
+        """
+        self._write(
+            {
+                "op": "ensure_connection",
+                "timeout_ping": timeout_ping,
+                "deadline": deadline,
+            }
+        )
+
+        while True:
+            try:
+                # Short waits to allow Ctrl+C
+                reply = self._replies.get(timeout=INTERRUPT_CHECK_INTERVAL)
+            except queue.Empty:
+                continue
+            break
+
+        if reply["op"] == "ready":
+            return reply["time_to_ready"]
+        if reply["timeout"]:
+            raise compas_rrc.TimeoutException(reply["message"])
+        raise RuntimeError(reply["message"])
+
+    def close(self) -> None:
+        """Detach from daemon."""
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:  # Already disconnected
+            pass
+        self._sock.close()
+
+    def _write(self, obj: dict) -> None:
+        with self._write_lock:
+            self._sock.sendall(_dumps(obj))
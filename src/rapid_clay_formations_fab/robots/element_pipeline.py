@@ -0,0 +1,124 @@
+"""Tracking of fabrication elements sent to the robot but not yet placed."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import logging
+import typing
+from datetime import datetime
+
+from rapid_clay_formations_fab.fab_data import CYCLE_PHASES
+from rapid_clay_formations_fab.fab_data import PlaceElement
+from rapid_clay_formations_fab.robots.futures import wait_for_future
+
+log = logging.getLogger(__name__)
+
+
+class ElementPipeline(object):
+    """Fabrication elements with instructions sent, in the order they were sent.
+
+    Elements leave the pipeline when the robot returns their cycle time, i.e.
+    when the robot has executed all their instructions.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: typing.Deque[
+            typing.Tuple[int, PlaceElement]
+        ] = collections.deque()
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    def add(self, idx: int, element: PlaceElement) -> None:
+        """Add element after its instructions have been sent.
+
+        Parameters
+        ----------
+        idx
+            Index of element in fab_data.
+        element
+            Element with :attr:`PlaceElement.cycle_time_future` set.
+        """
+        if not element.cycle_time_future:
+            raise ValueError(f"Element {idx} has no cycle_time_future.")
+
+        self._in_flight.append((idx, element))
+
+    def wait(
+        self, max_in_flight: int = 0
+    ) -> typing.Iterator[typing.Tuple[int, PlaceElement]]:
+        """Wait until at most ``max_in_flight`` elements are left in pipeline.
+
+        Elements that are done are yielded in order after their
+        :attr:`PlaceElement.cycle_time`, :attr:`PlaceElement.time_placed` and,
+        if phases were timed, :attr:`PlaceElement.phase_times` have been set,
+        including elements already done that did not need to
+        be waited on.
+
+        Parameters
+        ----------
+        max_in_flight
+            Number of elements allowed to be left in pipeline. Defaults to
+            ``0``, waiting for all elements.
+
+        Yields
+        ------
+        :obj:`tuple` of :obj:`int` and :class:`PlaceElement`
+            Index and element.
+        """
+        while self._in_flight:
+            idx, element = self._in_flight[0]
+            future = element.cycle_time_future
+
+            if len(self._in_flight) <= max_in_flight and not future.done:
+                return
+
+            element.cycle_time = wait_for_future(future)
+            element.time_placed = datetime.now().timestamp()
+
+            if element.phase_futures:
+                phase_ends = {
+                    phase: wait_for_future(phase_future)
+                    for phase, phase_future in element.phase_futures.items()
+                }
+                element.phase_times = get_phase_times(phase_ends, element.cycle_time)
+
+            self._in_flight.popleft()
+            yield idx, element
+
+
+def get_phase_times(
+    phase_ends: typing.Dict[str, float], cycle_time: float
+) -> typing.Dict[str, typing.Optional[float]]:
+    """Get time spent in each cycle phase from watch readings at phase ends.
+
+    Parameters
+    ----------
+    phase_ends
+        Watch value in seconds at the end of phases, by phase name. The last
+        phase of :data:`~rapid_clay_formations_fab.fab_data.CYCLE_PHASES`
+        ends with the cycle.
+    cycle_time
+        Watch value in seconds at the end of the cycle.
+
+    Returns
+    -------
+    :obj:`dict`
+        Seconds by phase name, ``None`` for phases without reading. A phase
+        following a phase without reading starts at the last reading before.
+    """
+    phase_ends = dict(phase_ends, **{CYCLE_PHASES[-1]: cycle_time})
+
+    phase_times: typing.Dict[str, typing.Optional[float]] = {}
+    start = 0.0
+    for phase in CYCLE_PHASES:
+        end = phase_ends.get(phase)
+        if end is None:
+            phase_times[phase] = None
+            continue
+
+        phase_times[phase] = round(end - start, 3)
+        start = end
+
+    return phase_times
@@ -0,0 +1,122 @@
+"""Waiting on feedback from the robot controller."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import asyncio
+import threading
+import time
+import typing
+
+import compas_rrc
+
+# Longest time a wait blocks without checking for KeyboardInterrupt
+INTERRUPT_CHECK_INTERVAL = 0.2
+
+
+def wait_for_future(
+    future: compas_rrc.FutureResult, timeout: typing.Optional[float] = None
+) -> typing.Any:
+    """Wait for result of future, can be interrupted using Ctrl+C.
+
+    The wait returns as soon as the result is set, it is split up in short
+    waits on the future's event since waits on locks can not be interrupted
+    on Windows.
+
+    Parameters
+    ----------
+    future
+        Future returned when sending an instruction.
+    timeout
+        Seconds to wait before raising :exc:`compas_rrc.TimeoutException`.
+        Defaults to waiting until the result is set.
+
+    Returns
+    -------
+    Result of future.
+
+    Raises
+    ------
+    :exc:`compas_rrc.TimeoutException`
+        If no result is set before timeout.
+    :exc:`KeyboardInterrupt`
+        If interrupted while waiting.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    while not future.done:
+        wait_time = INTERRUPT_CHECK_INTERVAL
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise compas_rrc.TimeoutException(
+                    "Timeout: future result not available"
+                )
+            wait_time = min(wait_time, remaining)
+
+        future.event.wait(wait_time)
+
+    return future.result()
+
+
+def wrap_future(
+    future: compas_rrc.FutureResult,
+    loop: typing.Optional[asyncio.AbstractEventLoop] = None,
+) -> asyncio.Future:
+    """Get an :class:`asyncio.Future` resolved when the result of future is set.
+
+    No thread is used for waiting, the :class:`asyncio.Future` is resolved
+    from the thread receiving the feedback.
+
+    Parameters
+    ----------
+    future
+        Future returned when sending an instruction.
+    loop
+        Event loop of the returned future. Defaults to the running loop.
+
+    Returns
+    -------
+    :class:`asyncio.Future`
+    """
+    loop = loop or asyncio.get_running_loop()
+    asyncio_future = loop.create_future()
+
+    def transfer_result() -> None:
+        if asyncio_future.done():  # Cancelled or already transferred
+            return
+        try:
+            asyncio_future.set_result(future.result(timeout=0))
+        except Exception as e:
+            asyncio_future.set_exception(e)
+
+    def on_result_set() -> None:
+        loop.call_soon_threadsafe(transfer_result)
+
+    # Threads already waiting hold the original event, it is set as well
+    future.event = _NotifyingEvent(future.event, on_result_set)
+
+    # Result might have been set before the event was replaced
+    if future.done:
+        on_result_set()
+
+    return asyncio_future
+
+
+class _NotifyingEvent(threading.Event):
+    """Event setting the event it replaces and calling a function when set."""
+
+    def __init__(
+        self, event: threading.Event, callback: typing.Callable[[], None]
+    ) -> None:
+        super().__init__()
+        self._event = event
+        self._callback = callback
+
+        if event.is_set():
+            super().set()
+
+    def set(self) -> None:
+        super().set()
+        self._event.set()
+        self._callback()
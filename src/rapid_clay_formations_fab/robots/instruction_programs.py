@@ -0,0 +1,270 @@
+"""Instruction programs for picking and placing, compiled ahead of fabrication."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import hashlib
+import json
+import logging
+import os
+import typing
+
+import compas_rrc
+import confuse
+from compas.utilities import DataEncoder
+
+from rapid_clay_formations_fab import __version__
+from rapid_clay_formations_fab.fab_data import PlaceElement
+from rapid_clay_formations_fab.fab_data.run_data import _write_atomic
+from rapid_clay_formations_fab.robots.abb_rcf_client import AbbRcfFabricationClient
+from rapid_clay_formations_fab.robots.pick_station import PickStation
+
+log = logging.getLogger(__name__)
+
+PROGRAMS_SUFFIX = ".programs"
+
+# Configuration not affecting pick and place instructions
+_RUNTIME_CONF_KEYS = ("controller", "docker", "skip_all_pick_movements", "look_ahead")
+
+# Element data used to create place instructions
+_PROGRAM_ELEMENT_KEYS = (
+    "location",
+    "radius",
+    "height",
+    "egress_frame_distance",
+    "compression_ratio",
+    "travel_trajectories",
+    "place_trajectories",
+    "return_travel_trajectories",
+    "return_place_trajectories",
+)
+
+Program = typing.List[dict]
+
+
+def get_programs_path(run_data_path: os.PathLike) -> str:
+    """Get path of compiled instruction programs belonging to a run data file.
+
+    Parameters
+    ----------
+    run_data_path
+        Path to run data file.
+    """
+    return str(run_data_path) + PROGRAMS_SUFFIX
+
+
+def get_programs_key(
+    rob_conf: confuse.AttrDict,
+    pick_station: PickStation,
+    fab_elements: typing.List[PlaceElement],
+) -> str:
+    """Get hash of everything the instruction programs are compiled from.
+
+    Run specific data, e.g. if elements are placed, is not included.
+
+    Parameters
+    ----------
+    rob_conf
+        Configuration namespace ``robot_client``.
+    pick_station
+    fab_elements
+    """
+    hash_ = hashlib.sha256()
+
+    conf = {k: v for k, v in rob_conf.items() if k not in _RUNTIME_CONF_KEYS}
+    header = [__version__, compas_rrc.__version__, conf, pick_station.data]
+    hash_.update(_dumps(header))
+
+    for elem in fab_elements:
+        data = elem.data
+        hash_.update(_dumps([data[key] for key in _PROGRAM_ELEMENT_KEYS]))
+
+    return hash_.hexdigest()
+
+
+def _dumps(obj: typing.Any) -> bytes:
+    return json.dumps(obj, cls=DataEncoder, sort_keys=True).encode("utf-8")
+
+
+class InstructionPrograms(object):
+    """Instruction messages for picking and placing, compiled ahead of time.
+
+    Programs are lists of instruction messages, sent using
+    :meth:`AbbRcfFabricationClient.send_program`. The messages are the same
+    as those sent by :meth:`AbbRcfFabricationClient.pick_element` and
+    :meth:`AbbRcfFabricationClient.place_element`, without sequence ids.
+
+    Parameters
+    ----------
+    pick_programs
+        Program for each pick frame of the pick station.
+    place_programs
+        Program for each fabrication element.
+    key
+        Hash of inputs, see :func:`get_programs_key`.
+    """
+
+    def __init__(
+        self,
+        pick_programs: typing.List[Program],
+        place_programs: typing.List[Program],
+        key: str = None,
+    ) -> None:
+        self.pick_programs = pick_programs
+        self.place_programs = place_programs
+        self.key = key
+
+    def __repr__(self) -> str:
+        return (
+            f"InstructionPrograms({len(self.pick_programs)} pick programs, "
+            + f"{len(self.place_programs)} place programs)"
+        )
+
+    def get_pick_program(self, pick_station: PickStation) -> Program:
+        """Get program picking from the next pick frame of pick station.
+
+        Parameters
+        ----------
+        pick_station
+        """
+        return self.pick_programs[pick_station.get_next_pick_idx()]
+
+    @classmethod
+    def compile(
+        cls,
+        rob_conf: confuse.AttrDict,
+        pick_station: PickStation,
+        fab_elements: typing.List[PlaceElement],
+    ) -> "InstructionPrograms":
+        """Compile programs for pick station and fabrication elements.
+
+        Parameters
+        ----------
+        rob_conf
+            Configuration namespace ``robot_client``.
+        pick_station
+        fab_elements
+        """
+        # Fresh pick station to record pick frames in order
+        recorder = _InstructionRecorder(
+            rob_conf, PickStation.from_data(pick_station.data)
+        )
+
+        pick_programs = []
+        for _ in pick_station.pick_frames:
+            recorder.pick_element()
+            pick_programs.append(recorder.pop_recorded())
+
+        place_programs = []
+        for elem in fab_elements:
+            recorder.place_element(elem)
+            place_programs.append(recorder.pop_recorded())
+
+        key = get_programs_key(rob_conf, pick_station, fab_elements)
+        return cls(pick_programs, place_programs, key=key)
+
+    @classmethod
+    def load_or_compile(
+        cls,
+        path: os.PathLike,
+        rob_conf: confuse.AttrDict,
+        pick_station: PickStation,
+        fab_elements: typing.List[PlaceElement],
+    ) -> "InstructionPrograms":
+        """Load programs from file if compiled from the same inputs, else compile.
+
+        Newly compiled programs are written to the file.
+
+        Parameters
+        ----------
+        path
+            Cache file, see :func:`get_programs_path`.
+        rob_conf
+            Configuration namespace ``robot_client``.
+        pick_station
+        fab_elements
+        """
+        key = get_programs_key(rob_conf, pick_station, fab_elements)
+
+        try:
+            programs = cls.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            log.debug(f"Could not load instruction programs from {path}: {e}")
+        else:
+            if programs.key == key:
+                log.info(f"Instruction programs loaded from {path}.")
+                return programs
+            log.debug(f"Instruction programs in {path} are outdated.")
+
+        programs = cls.compile(rob_conf, pick_station, fab_elements)
+        programs.dump(path)
+        log.info(f"Instruction programs compiled and written to {path}.")
+
+        return programs
+
+    @property
+    def data(self) -> dict:
+        """The data dictionary that represents the instruction programs."""
+        return {
+            "key": self.key,
+            "pick_programs": self.pick_programs,
+            "place_programs": self.place_programs,
+        }
+
+    @data.setter
+    def data(self, data: dict) -> None:
+        self.key = data["key"]
+        self.pick_programs = data["pick_programs"]
+        self.place_programs = data["place_programs"]
+
+    def to_data(self) -> dict:
+        """Get :obj:`dict` representation of :class:`InstructionPrograms`."""
+        return self.data
+
+    @classmethod
+    def from_data(cls, data: dict) -> "InstructionPrograms":
+        """Construct an instance from its data representation."""
+        obj = cls([], [])
+        obj.data = data
+        return obj
+
+    def dump(self, path: os.PathLike) -> None:
+        """Write programs to file.
+
+        Parameters
+        ----------
+        path
+        """
+        _write_atomic(str(path), json.dumps(self.data).encode("utf-8"))
+
+    @classmethod
+    def load(cls, path: os.PathLike) -> "InstructionPrograms":
+        """Read programs from file.
+
+        Parameters
+        ----------
+        path
+        """
+        with open(path, mode="r") as fp:
+            return cls.from_data(json.load(fp))
+
+
+class _InstructionRecorder(AbbRcfFabricationClient):
+    """Fabrication client recording instruction messages instead of sending."""
+
+    def __init__(self, rob_conf: confuse.AttrDict, pick_station: PickStation):
+        # No connection to ROS
+        self._setup(rob_conf, pick_station)
+        self._batch = None
+        self.recorded: Program = []
+
+    def send(self, instruction):
+        self.recorded.append(instruction.msg)
+
+    def send_and_wait(self, instruction, timeout=None):
+        raise RuntimeError("Programs can not wait for feedback.")
+
+    def pop_recorded(self) -> Program:
+        recorded = self.recorded
+        self.recorded = []
+        return recorded
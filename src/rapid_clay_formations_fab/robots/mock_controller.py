@@ -0,0 +1,296 @@
+"""In-process stand-in for the ABB controller, driver and rosbridge.
+
+Used to run the clients and the fabrication script without Docker,
+RobotStudio or the robot cell, e.g. to benchmark the host side.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import collections
+import json
+import logging
+import queue
+import threading
+import time
+import typing
+
+import compas_rrc
+
+from rapid_clay_formations_fab.robots.futures import INTERRUPT_CHECK_INTERVAL
+
+log = logging.getLogger(__name__)
+
+_INSTRUCTION_PREFIX = "r_RRC_"
+_MOVE_TO_FRAME = _INSTRUCTION_PREFIX + "MoveTo"
+_MOVE_TO_JOINTS = _INSTRUCTION_PREFIX + "MoveToJoints"
+_WAIT_TIME = _INSTRUCTION_PREFIX + "WaitTime"
+_START_WATCH = _INSTRUCTION_PREFIX + "StartWatch"
+_STOP_WATCH = _INSTRUCTION_PREFIX + "StopWatch"
+_READ_WATCH = _INSTRUCTION_PREFIX + "ReadWatch"
+_GET_ROBTARGET = _INSTRUCTION_PREFIX + "GetRobtarget"
+_GET_JOINTS = _INSTRUCTION_PREFIX + "GetJoints"
+_STOP = _INSTRUCTION_PREFIX + "Stop"
+
+# Value RAPID uses for unset external axes
+_RAPID_NONE = 9e9
+
+
+class MockController(object):
+    """Fake controller executing instructions in a background thread.
+
+    Implements the interface of
+    :class:`~rapid_clay_formations_fab.robots.DriverDaemonConnection`, pass
+    it as ``daemon`` to :class:`AbbRcfClient` or
+    :class:`AbbRcfFabricationClient`. Instructions are executed in order,
+    each taking the time given in ``delays``. ``WaitTime`` takes its own
+    time. ``Stop`` is resumed right away, as if play was pressed.
+
+    Instructions with ``feedback_level`` above ``0`` get feedback after they
+    are executed. ``ReadWatch`` returns simulated time since ``StartWatch``,
+    ``GetFrame``/``GetRobtarget`` the last frame target and ``GetJoints`` the
+    last joint target.
+
+    Parameters
+    ----------
+    delays
+        Seconds to execute instructions, by instruction name, e.g.
+        ``{"r_RRC_MoveTo": 0.5}``. Defaults to ``default_delay``.
+    default_delay
+        Seconds to execute instructions not in ``delays``.
+    time_scale
+        Factor applied to all delays when waiting, e.g. ``0.01`` to run a
+        hundred times faster. The watch still reports unscaled seconds.
+    buffer_size
+        Number of instructions the controller accepts before
+        :meth:`publish` blocks, unlimited if ``None``.
+    serialize
+        Encode and decode messages as JSON, like rosbridge does.
+
+    Examples
+    --------
+    >>> controller = MockController(delays={"r_RRC_MoveTo": 1.0}, time_scale=0)
+    >>> with AbbRcfClient(daemon=controller) as client:  # doctest: +SKIP
+    ...     client.ping()
+    >>> controller.get_counters()["executed"]  # doctest: +SKIP
+    1
+    """
+
+    def __init__(
+        self,
+        delays: typing.Optional[typing.Dict[str, float]] = None,
+        default_delay: float = 0.0,
+        time_scale: float = 1.0,
+        buffer_size: typing.Optional[int] = None,
+        serialize: bool = True,
+    ) -> None:
+        self.delays = delays or {}
+        self.default_delay = default_delay
+        self.time_scale = time_scale
+        self.serialize = serialize
+
+        # Messages and the time they were published
+        self._queue: queue.Queue = queue.Queue(maxsize=buffer_size or 0)
+        self._on_feedback: typing.Optional[typing.Callable[[dict], None]] = None
+        self._thread: typing.Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._idle = threading.Condition()
+
+        # Controller state, in simulated seconds
+        self._time = 0.0
+        self._watch_start: typing.Optional[float] = None
+        self._watch_stop: typing.Optional[float] = None
+        self._robtarget = [0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0] + [_RAPID_NONE] * 6
+        self._joints = [0.0] * 6 + [_RAPID_NONE] * 6
+
+        self._lock = threading.Lock()
+        self._instructions: typing.Counter[str] = collections.Counter()
+        self._counters = {
+            "received": 0,
+            "executed": 0,
+            "feedback": 0,
+            "stops": 0,
+            "max_queue_depth": 0,
+        }
+        self._blocked_time = 0.0
+        self.latencies: typing.List[float] = []
+
+    def start(self, on_feedback: typing.Callable[[dict], None]) -> None:
+        """Start executing instructions.
+
+        Parameters
+        ----------
+        on_feedback
+            Called from a background thread with each feedback message.
+        """
+        self._on_feedback = on_feedback
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def publish(self, instruction_msgs: typing.List[dict]) -> None:
+        """Queue instruction messages for execution.
+
+        Blocks while the buffer is full.
+
+        Parameters
+        ----------
+        instruction_msgs
+            Messages as returned by ``instruction.msg``.
+        """
+        if self.serialize:
+            instruction_msgs = json.loads(json.dumps(instruction_msgs))
+
+        for msg in instruction_msgs:
+            start = time.monotonic()
+            self._queue.put((msg, start))
+            blocked = time.monotonic() - start
+
+            with self._lock:
+                self._counters["received"] += 1
+                self._instructions[msg["instruction"]] += 1
+                self._counters["max_queue_depth"] = max(
+                    self._counters["max_queue_depth"], self._queue.qsize()
+                )
+                self._blocked_time += blocked
+
+    def ensure_connection(
+        self,
+        timeout_ping: typing.Optional[float] = None,
+        deadline: typing.Optional[float] = None,
+    ) -> float:
+        """Controller is always ready.
+
+        Returns
+        -------
+        :obj:`float`
+            ``0.0`` seconds until ready.
+        """
+        return 0.0
+
+    def close(self) -> None:
+        """Stop executing instructions, instructions left are dropped."""
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def wait_until_idle(self, timeout: typing.Optional[float] = None) -> bool:
+        """Wait until all queued instructions are executed.
+
+        Parameters
+        ----------
+        timeout
+            Seconds to wait, defaults to waiting until idle.
+
+        Returns
+        -------
+        :obj:`bool`
+            ``False`` if timed out.
+        """
+        with self._idle:
+            return self._idle.wait_for(
+                lambda: self._queue.unfinished_tasks == 0, timeout=timeout
+            )
+
+    def get_counters(self) -> dict:
+        """Get copy of counters.
+
+        Returns
+        -------
+        :obj:`dict`
+            Number of instructions ``received``, ``executed``, ``feedback``
+            messages sent, ``stops`` resumed, ``max_queue_depth``, seconds
+            :meth:`publish` was ``blocked`` by a full buffer, simulated
+            ``controller_time`` and ``instructions`` received by name.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            counters["blocked"] = self._blocked_time
+            counters["controller_time"] = self._time
+            counters["instructions"] = dict(self._instructions)
+        return counters
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                msg, published = self._queue.get(timeout=INTERRUPT_CHECK_INTERVAL)
+            except queue.Empty:
+                continue
+
+            try:
+                self._execute(msg)
+            except Exception:
+                log.exception(f"Mock controller could not execute {msg}.")
+
+            with self._lock:
+                self._counters["executed"] += 1
+                self.latencies.append(time.monotonic() - published)
+
+            with self._idle:
+                self._queue.task_done()
+                self._idle.notify_all()
+
+    def _execute(self, msg: dict) -> None:
+        instruction = msg["instruction"]
+        values = msg["float_values"]
+
+        if instruction == _WAIT_TIME:
+            delay = values[0]
+        else:
+            delay = self.delays.get(instruction, self.default_delay)
+
+        if delay > 0 and self.time_scale > 0:
+            self._stopped.wait(delay * self.time_scale)
+        self._time += delay
+
+        feedback_values: typing.List[float] = []
+
+        if instruction == _MOVE_TO_FRAME:
+            self._robtarget = values[:13]
+        elif instruction == _MOVE_TO_JOINTS:
+            self._joints = values[:12]
+        elif instruction == _START_WATCH:
+            self._watch_start, self._watch_stop = self._time, None
+        elif instruction == _STOP_WATCH:
+            self._watch_stop = self._time
+        elif instruction == _READ_WATCH:
+            feedback_values = [self._read_watch()]
+        elif instruction == _GET_ROBTARGET:
+            feedback_values = list(self._robtarget)
+        elif instruction == _GET_JOINTS:
+            feedback_values = list(self._joints)
+        elif instruction == _STOP:
+            with self._lock:
+                self._counters["stops"] += 1
+
+        if msg.get("feedback_level", 0) > compas_rrc.FeedbackLevel.NONE:
+            self._send_feedback(msg, feedback_values)
+
+    def _read_watch(self) -> float:
+        if self._watch_start is None:
+            return 0.0
+
+        end = self._time if self._watch_stop is None else self._watch_stop
+        return end - self._watch_start
+
+    def _send_feedback(self, msg: dict, float_values: typing.List[float]) -> None:
+        feedback = {
+            "instruction": msg["instruction"],
+            "sequence_id": msg["sequence_id"],
+            "feedback_id": msg["sequence_id"],
+            "feedback": "Done",
+            "exec_level": msg.get("exec_level", 0),
+            "feedback_level": msg["feedback_level"],
+            "string_values": [],
+            "float_values": float_values,
+        }
+
+        if self.serialize:
+            feedback = json.loads(json.dumps(feedback))
+
+        with self._lock:
+            self._counters["feedback"] += 1
+
+        if self._on_feedback:
+            self._on_feedback(feedback)
@@ -68,10 +68,19 @@ def data(self, data):  # type: (dict) -> None
         self.elem_height = data["elem_height"]
         self.elem_egress_distance = data["elem_egress_distance"]
 
-    def _get_next_pick_frame(self):  # type: () -> Frame
-        frame = self.pick_frames[self._pick_counter % len(self.pick_frames)]
+    def get_next_pick_idx(self):  # type: () -> int
+        """Get index of next pick frame and advance to the following one.
+
+        Returns
+        -------
+        :obj:`int`
+        """
+        idx = self._pick_counter % len(self.pick_frames)
         self._pick_counter += 1
-        return frame
+        return idx
+
+    def _get_next_pick_frame(self):  # type: () -> Frame
+        return self.pick_frames[self.get_next_pick_idx()]
 
     def get_next_pick_elem(self):  # type: () -> fab_data.FabricationElement
         """Get next pick element.
@@ -87,10 +96,31 @@ def get_next_pick_elem(self):  # type: () -> fab_data.FabricationElement
             egress_frame_distance=self.elem_egress_distance,
         )
 
-    def copy(self):  # type: () -> PickStation
-        """Create a copy of this :class:`PickStation`."""
+    def copy(self, deep=True):  # type: (bool) -> PickStation
+        """Create a copy of this :class:`PickStation`.
+
+        The copy starts picking from the first pick frame.
+
+        Parameters
+        ----------
+        deep
+            Copy pick frames, defaults to ``True``. If ``False`` the pick
+            frames are shared with the copy, so transforming one transforms
+            both.
+
+        Returns
+        -------
+        :class:`PickStation`
+        """
         cls = type(self)
-        return cls.from_data(self.data)
+        obj = cls.__new__(cls)
+        obj.__dict__.update(self.__dict__)
+        obj._pick_counter = 0
+
+        if deep:
+            obj.pick_frames = [frame.copy() for frame in self.pick_frames]
+
+        return obj
 
     def transform(self, transformation):  # type: (Transformation) -> None
         """Transform a :class:`PickStation`.
@@ -113,8 +143,8 @@ def transformed(self, transformation):  # type: (Transformation) -> PickStation
         -------
         :class:`PickStation`
         """
-        copy = self.copy()
-        copy.transform(transformation)
+        copy = self.copy(deep=False)
+        copy.pick_frames = [f.transformed(transformation) for f in self.pick_frames]
         return copy
 
     def to_data(self):  # type: () -> dict
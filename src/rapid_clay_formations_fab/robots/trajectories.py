@@ -21,6 +21,7 @@
     from typing import Any
     from typing import Callable
     from typing import List
+    from typing import Optional
     from typing import Tuple
     from typing import Union
 except ImportError:
@@ -90,7 +91,10 @@ def data(self):  # type: () -> dict
 
     @data.setter
     def data(self, data):  # type: (dict) -> None
-        self.trajectories = data["trajectories"]
+        self.trajectories = [
+            MinimalTrajectory.from_data(t) if isinstance(t, dict) else t
+            for t in data["trajectories"]
+        ]
 
     def reverse_recursively(self):  # type: () -> None
         """Reverse list and the lists elements."""
@@ -138,13 +142,17 @@ class MinimalTrajectory(_ListLike):
     :obj:`list` implementing methods such as ``index``, ``__iter__`` and
     reveresed.
 
+    The trajectory type is kept up to date when points are added, adding a
+    point of another type than the points in the trajectory raises
+    :exc:`RuntimeError`. Replacing all points sets the type of the new points.
+
     Parameters
     ----------
     points : :obj:`list`
         Trajectory points.
     """
 
-    __slots__ = "_list"
+    __slots__ = ("_list", "_trajectory_type")
 
     JOINT_TRAJECTORY = 0
     FRAME_TRAJECTORY = 1
@@ -153,17 +161,51 @@ def __init__(  # skipcq
         self, points
     ):  # type: (List[Union[Frame, Configuration]]) -> None
         super(MinimalTrajectory, self).__init__(points)
+        self._trajectory_type = self._get_points_type(self._list)  # type: Optional[int]
+
+    def __setitem__(self, index, item):  # type: (Union[int, slice], Any) -> None
+        if isinstance(index, slice):
+            item = list(item)
+            points = item
+            replaced = len(range(*index.indices(len(self))))
+        else:
+            points = [item]
+            replaced = 1
+
+        points_type = self._get_points_type(points)
+
+        if replaced == len(self):
+            # No points are left, the type is the one of the new points
+            self._list[index] = item
+            self._trajectory_type = points_type
+        else:
+            self._set_type(points_type)
+            self._list[index] = item
+
+    def insert(self, index, item):  # type: (int, Any) -> None
+        """Insert point at specified index."""
+        self._check_points([item])
+        self._list.insert(index, item)
+
+    def reverse(self):  # type: () -> None
+        """Reverse trajectory in place."""
+        self._list.reverse()
 
     def __repr__(self):
         return "MinimalTrajectory({})".format(self.points)
 
     @property
     def points(self):  # type: () -> List[Union[Frame, Configuration]]
-        """:obj:`list` : List of trajectory points."""
+        """:obj:`list` : List of trajectory points.
+
+        Points added to the list directly are not type checked, add them to
+        the trajectory instead.
+        """
         return self._list
 
     @points.setter
     def points(self, points):  # type: (List[Union[Frame, Configuration]]) -> None
+        self._trajectory_type = self._get_points_type(points)
         self._list = points
 
     @property
@@ -177,24 +219,56 @@ def data(self, data):  # type: (dict) -> None
 
     @property
     def trajectory_type(self):  # type: () -> int
-        """:obj:`type` : Return the type of elements in the trajectory."""
-        self._raise_if_mixed_types()
-        if isinstance(self[0], Configuration):
-            return self.JOINT_TRAJECTORY
-        if isinstance(self[0], Frame):
-            return self.FRAME_TRAJECTORY
-
-        raise NotImplementedError("Trajectory not recognized: {}".format(self))
-
-    def _raise_if_mixed_types(self):
-        """Raise error if the list contains mixed types of objects."""
-        types = (type(pt) for pt in self)
+        """:obj:`int` : Return the type of elements in the trajectory."""
+        if len(self) == 0 or self._trajectory_type is None:
+            raise RuntimeError("Trajectory has no points to get the type from.")
+        return self._trajectory_type
+
+    def _check_points(self, points):  # type: (List[Any]) -> None
+        """Raise error if points to add are not of the trajectory's type."""
+        self._set_type(self._get_points_type(points))
+
+    def _set_type(self, trajectory_type):  # type: (Optional[int]) -> None
+        if trajectory_type is None:
+            return
+        if len(self) == 0 or self._trajectory_type is None:
+            self._trajectory_type = trajectory_type
+        elif self._trajectory_type != trajectory_type:
+            raise RuntimeError(
+                "Trajectory contains more than one type of objects: {}".format(
+                    sorted((self._trajectory_type, trajectory_type))
+                )
+            )
 
-        if len(set(types)) != 1:
+    @classmethod
+    def _get_points_type(cls, points):  # type: (List[Any]) -> Optional[int]
+        """Get type of points, ``None`` if empty.
+
+        Raises
+        ------
+        :exc:`RuntimeError`
+            If points are of more than one type.
+        :exc:`NotImplementedError`
+            If points are not frames or configurations.
+        """
+        types = set()
+        for pt in points:
+            if isinstance(pt, Configuration):
+                types.add(cls.JOINT_TRAJECTORY)
+            elif isinstance(pt, Frame):
+                types.add(cls.FRAME_TRAJECTORY)
+            else:
+                raise NotImplementedError("Trajectory not recognized: {}".format(pt))
+
+        if len(types) > 1:
             raise RuntimeError(
-                "Trajectory contains more than one type of objects: {}".format(types)
+                "Trajectory contains more than one type of objects: {}".format(
+                    sorted(types)
+                )
             )
 
+        return types.pop() if types else None
+
     def copy(self):  # type: () -> MinimalTrajectory
         """Get an independent copy of object."""
         cls = type(self)
@@ -155,6 +155,25 @@ def test(ctx, checks=False, doctest=False, verbose=True):
         ctx.run(" ".join(cmd))
 
 
+@task(
+    help={
+        "element_counts": "Comma separated numbers of elements to benchmark with.",
+        "compare": "Compare with last saved run and fail on mean regressions "
+        + "above 10%.",
+    }
+)
+def benchmark(ctx, element_counts=None, compare=False):
+    """Run benchmarks and save results in .benchmarks for later comparison."""
+    with chdir(BASE_FOLDER):
+        cmd = ["pytest", "benchmarks", "--benchmark-autosave"]
+        if element_counts:
+            cmd.append("--element-counts {}".format(element_counts))
+        if compare:
+            cmd.extend(["--benchmark-compare", "--benchmark-compare-fail=mean:10%"])
+
+        ctx.run(" ".join(cmd))
+
+
 @task
 def prepare_changelog(ctx):
     """Prepare changelog for next release."""
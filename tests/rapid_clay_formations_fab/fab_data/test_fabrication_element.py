@@ -0,0 +1,85 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import pytest
+from compas.geometry import Frame
+from compas.geometry import Translation
+
+from rapid_clay_formations_fab.fab_data import PlaceElement
+
+
+@pytest.fixture
+def elem():
+    return PlaceElement(Frame([100, 0, 0], [1, 0, 0], [0, -1, 0]), "elem")
+
+
+def test_cached_frames(elem):
+    assert elem.get_egress_frame() is elem.get_egress_frame()
+    assert elem.get_compressed_top_frame() is elem.get_compressed_top_frame()
+
+
+@pytest.mark.parametrize(
+    "attr, value",
+    [("height", 100), ("egress_frame_distance", 50), ("compression_ratio", 0.2)],
+)
+def test_cache_invalidated_by_attrs(elem, attr, value):
+    egress_frame = elem.get_egress_frame()
+    compressed_top_frame = elem.get_compressed_top_frame()
+
+    setattr(elem, attr, value)
+
+    assert elem.get_egress_frame() is not egress_frame
+    assert elem.get_compressed_top_frame() is not compressed_top_frame
+
+    fresh = PlaceElement.from_data(elem.to_data())
+    assert elem.get_egress_frame() == fresh.get_egress_frame()
+    assert elem.get_compressed_top_frame() == fresh.get_compressed_top_frame()
+
+
+def test_cache_invalidated_by_transform(elem):
+    top_frame = elem.get_top_frame()
+
+    elem.transform(Translation.from_vector([0, 0, 100]))
+
+    assert elem.get_top_frame() is not top_frame
+    assert elem.get_top_frame().point.z == pytest.approx(top_frame.point.z + 100)
+
+
+def test_copy_shallow(elem):
+    elem.get_top_frame()
+    copy = elem.copy(deep=False)
+
+    assert copy.to_data() == elem.to_data()
+    assert copy.location is elem.location
+    assert copy.get_top_frame() is elem.get_top_frame()
+
+    copy.height = 10
+    assert elem.height == 150
+    assert copy.get_top_frame() is not elem.get_top_frame()
+
+
+def test_copy(elem):
+    elem.attrs["layer"] = [1]
+    copy = elem.copy()
+
+    assert copy.to_data() == elem.to_data()
+    assert copy.location is not elem.location
+    assert copy.attrs["layer"] is not elem.attrs["layer"]
+
+
+def test_transform_copy(elem):
+    point = list(elem.location.point)
+
+    elem.copy().transform(Translation.from_vector([0, 0, 100]))
+    assert list(elem.location.point) == point
+
+    elem.transformed(Translation.from_vector([0, 0, 100]))
+    assert list(elem.location.point) == point
+
+
+def test_transformed(elem):
+    transformed = elem.transformed(Translation.from_vector([0, 0, 100]))
+
+    assert transformed.location.point.z == pytest.approx(100)
+    assert elem.location.point.z == pytest.approx(0)
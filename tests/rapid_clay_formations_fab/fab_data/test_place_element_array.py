@@ -0,0 +1,109 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import pytest
+from compas.geometry import Frame
+from compas.geometry import Rotation
+from compas.geometry import Translation
+from compas_fab.robots import Configuration
+
+from rapid_clay_formations_fab.fab_data import PlaceElement
+from rapid_clay_formations_fab.fab_data import PlaceElementArray
+from rapid_clay_formations_fab.fab_data import matrices_to_frames
+from rapid_clay_formations_fab.fab_data import transform_elements
+from rapid_clay_formations_fab.robots import ArrayTrajectory
+from rapid_clay_formations_fab.robots import MinimalTrajectories
+from rapid_clay_formations_fab.robots import MinimalTrajectory
+from rapid_clay_formations_fab.robots import PickStation
+
+
+@pytest.fixture
+def elements():
+    return [
+        PlaceElement(
+            Frame([i * 100, i * 10, 20], [1, 0.1 * i, 0], [0, -1, 0.2]),
+            "elem{}".format(i),
+            radius=40 + i,
+            height=150 - i,
+            compression_ratio=0.4 + 0.05 * i,
+            egress_frame_distance=100 + i,
+        )
+        for i in range(6)
+    ]
+
+
+@pytest.fixture
+def elem_array(elements):
+    return PlaceElementArray(elements)
+
+
+def _assert_frames_close(frames, other_frames):
+    for frame, other in zip(frames, other_frames):
+        for a, b in ((frame.point, other.point), (frame.xaxis, other.xaxis)):
+            assert list(a) == pytest.approx(list(b))
+
+
+@pytest.mark.parametrize(
+    "method, elem_method",
+    [
+        ("get_top_frames", "get_top_frame"),
+        ("get_egress_frames", "get_egress_frame"),
+        ("get_compressed_top_frames", "get_compressed_top_frame"),
+    ],
+)
+def test_derived_frames(elem_array, elements, method, elem_method):
+    frames = matrices_to_frames(getattr(elem_array, method)())
+    _assert_frames_close(frames, [getattr(e, elem_method)() for e in elements])
+
+
+def test_derived_values(elem_array, elements):
+    assert elem_array.get_compressed_radii().tolist() == pytest.approx(
+        [e.get_compressed_radius() for e in elements]
+    )
+    for normal, elem in zip(elem_array.get_normals().tolist(), elements):
+        assert normal == pytest.approx(list(elem.get_normal()))
+
+
+def test_views(elem_array, elements):
+    assert elem_array[2] is elements[2]
+    assert len(elem_array[1:3]) == 2
+    assert list(elem_array) == elements
+
+
+@pytest.mark.parametrize("trajectory_cls", [MinimalTrajectory, ArrayTrajectory])
+@pytest.mark.parametrize("copy", [False, True])
+def test_transform_elements(elements, copy, trajectory_cls):
+    T = Translation.from_vector([100, -20, 5]) * Rotation.from_axis_and_angle(
+        [0, 0.2, 1], 0.3
+    )
+    config = Configuration.from_revolute_values([0, 1, 2, 3, 4, 5])
+    frame_trajectory = trajectory_cls([Frame.worldXY(), Frame.worldYZ()])
+    elements[0].travel_trajectories = MinimalTrajectories(
+        [frame_trajectory, MinimalTrajectory([config])]
+    )
+    pick_station = PickStation(
+        [Frame.worldZX(), Frame([1, 2, 3], [0, 1, 0], [1, 0, 0])]
+    )
+
+    expected_locations = [e.location.transformed(T) for e in elements]
+    expected_trajectory = [f.transformed(T) for f in frame_trajectory]
+    expected_pick_frames = [f.transformed(T) for f in pick_station.pick_frames]
+    original_locations = [e.location.copy() for e in elements]
+
+    result, result_station = transform_elements(
+        elements, T, pick_station=pick_station, copy=copy
+    )
+
+    _assert_frames_close([e.location for e in result], expected_locations)
+    _assert_frames_close(result[0].travel_trajectories[0], expected_trajectory)
+    _assert_frames_close(result_station.pick_frames, expected_pick_frames)
+    assert result[0].travel_trajectories[1][0] is config
+
+    if copy:
+        assert result[0] is not elements[0]
+        _assert_frames_close([e.location for e in elements], original_locations)
+        assert elements[0].travel_trajectories[0][0] == Frame.worldXY()
+    else:
+        assert result[0] is elements[0]
+        assert result_station is pick_station
@@ -0,0 +1,261 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import os
+
+import pytest
+from compas.geometry import Frame
+from compas.utilities import DataDecoder
+from compas.utilities import DataEncoder
+from compas_fab.robots import Configuration
+
+from rapid_clay_formations_fab.fab_data import EncodedData
+from rapid_clay_formations_fab.fab_data import PlaceElement
+from rapid_clay_formations_fab.fab_data import RunDataJournal
+from rapid_clay_formations_fab.fab_data import RunDataWriter
+from rapid_clay_formations_fab.fab_data import get_checksum_path
+from rapid_clay_formations_fab.fab_data import get_journal_path
+from rapid_clay_formations_fab.fab_data import get_run_data_rotations
+from rapid_clay_formations_fab.fab_data import iter_fab_data
+from rapid_clay_formations_fab.fab_data import read_run_data
+from rapid_clay_formations_fab.fab_data import rotate_run_data
+from rapid_clay_formations_fab.fab_data import write_run_data
+from rapid_clay_formations_fab.robots import MinimalTrajectories
+from rapid_clay_formations_fab.robots import MinimalTrajectory
+
+
+@pytest.fixture
+def fab_elements():
+    return [
+        PlaceElement(Frame([i * 100, 0, 0], [1, 0, 0], [0, 1, 0]), "elem{}".format(i))
+        for i in range(5)
+    ]
+
+
+@pytest.fixture
+def run_data(fab_elements):
+    return {"fab_data": fab_elements, "pick_station": None, "conf_path": None}
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return RunDataJournal(get_journal_path(tmp_path / "run_data.json"))
+
+
+def test_replay(journal, fab_elements):
+    fab_elements[1].placed = True
+    fab_elements[1].cycle_time = 12.5
+    journal.append(1, fab_elements[1])
+
+    fab_elements[1].time_placed = 1600000000.0
+    journal.append(1, fab_elements[1])
+
+    loaded = [elem.copy() for elem in fab_elements]
+    loaded[1].placed, loaded[1].cycle_time, loaded[1].time_placed = False, None, None
+
+    assert journal.replay(loaded) == 2
+    assert loaded[1].placed
+    assert loaded[1].cycle_time == 12.5
+    assert loaded[1].time_placed == 1600000000.0
+
+
+def test_replay_skips_mismatched_and_truncated(journal, fab_elements):
+    fab_elements[2].placed = True
+    journal.append(2, fab_elements[2])
+
+    with open(journal.path, mode="a") as fp:
+        fp.write('{"idx": 3, "id_": "elem3", "pla')
+
+    fab_elements[2].placed = False
+    fab_elements[2].id_ = "renamed"
+
+    assert journal.replay(fab_elements) == 0
+    assert not fab_elements[2].placed
+
+
+def test_compact(tmp_path, journal, run_data, fab_elements):
+    run_data_path = tmp_path / "run_data.json"
+
+    fab_elements[0].placed = True
+    journal.append(0, fab_elements[0])
+    journal.compact(run_data_path, run_data)
+
+    assert not journal.exists()
+    with run_data_path.open(mode="r") as fp:
+        loaded = json.load(fp, cls=DataDecoder)
+    assert loaded["fab_data"][0].placed
+
+
+def test_writer_coalesces_and_flushes_on_exit(tmp_path, journal, run_data):
+    fab_elements = run_data["fab_data"]
+    run_data_path = tmp_path / "run_data.json"
+
+    with RunDataWriter(journal) as writer:
+        for i, elem in enumerate(fab_elements):
+            elem.placed = True
+            writer.append(i, elem)
+            elem.cycle_time = i * 2.0
+            writer.append(i, elem)
+            writer.write_snapshot(run_data_path, run_data)
+
+    assert writer.closed
+    assert run_data_path.exists()
+
+    records = journal.read()
+    assert {record["idx"] for record in records} == set(range(len(fab_elements)))
+    assert all(record["placed"] for record in records)
+    assert records[-1]["cycle_time"] == (len(fab_elements) - 1) * 2.0
+
+
+def test_write_read_run_data(tmp_path, run_data):
+    run_data_path = tmp_path / "run_data.json"
+    write_run_data(run_data_path, run_data)
+
+    assert (tmp_path / get_checksum_path("run_data.json")).exists()
+    assert not (tmp_path / "run_data.json.tmp").exists()
+
+    loaded = read_run_data(run_data_path)
+    assert [e.id_ for e in loaded["fab_data"]] == [e.id_ for e in run_data["fab_data"]]
+
+
+def test_read_run_data_falls_back_to_rotation(tmp_path, run_data):
+    run_data_path = tmp_path / "run_data.json"
+
+    write_run_data(tmp_path / "run_data.json.2", run_data)
+    run_data["fab_data"][0].placed = True
+    write_run_data(tmp_path / "run_data.json.1", run_data)
+
+    write_run_data(run_data_path, run_data)
+    with run_data_path.open(mode="r+") as fp:  # simulate interrupted write
+        fp.truncate(100)
+
+    loaded = read_run_data(run_data_path)
+    assert loaded["fab_data"][0].placed
+
+    with pytest.raises(ValueError):
+        read_run_data(run_data_path, fallback=False)
+
+
+def test_rotate_run_data(tmp_path, run_data):
+    run_data_path = tmp_path / "run_data.json"
+
+    write_run_data(run_data_path, run_data)
+    rotate_run_data(run_data_path)
+    run_data["fab_data"][0].placed = True
+    write_run_data(run_data_path, run_data)
+    rotate_run_data(run_data_path)
+
+    assert get_run_data_rotations(run_data_path) == [
+        str(tmp_path / "run_data.json.1"),
+        str(tmp_path / "run_data.json.2"),
+    ]
+    for name in ("run_data.json.1", "run_data.json.2"):
+        assert (tmp_path / get_checksum_path(name)).exists()
+    assert not (tmp_path / get_checksum_path("run_data.json")).exists()
+
+    run_data_path.write_text("{")
+    assert read_run_data(run_data_path)["fab_data"][0].placed
+
+    # Altered rotated copy, still valid JSON, is rejected
+    rotation = tmp_path / "run_data.json.1"
+    rotation.write_text(
+        rotation.read_text().replace('"placed": true', '"placed": false')
+    )
+    assert not read_run_data(run_data_path)["fab_data"][0].placed
+
+    # Truncated rotated copy too
+    rotation = tmp_path / "run_data.json.2"
+    rotation.write_bytes(rotation.read_bytes()[:-1])
+    with pytest.raises(ValueError):
+        read_run_data(run_data_path)
+
+
+def test_rotate_run_data_without_checksum(tmp_path, run_data):
+    run_data_path = tmp_path / "run_data.json"
+    run_data_path.write_text(json.dumps(run_data, cls=DataEncoder))
+
+    rotate_run_data(run_data_path)
+
+    run_data_path.write_text("{")
+    loaded = read_run_data(run_data_path)
+    assert len(loaded["fab_data"]) == len(run_data["fab_data"])
+
+
+def test_read_run_data_replays_journal(tmp_path, journal, run_data, fab_elements):
+    run_data_path = tmp_path / "run_data.json"
+    write_run_data(run_data_path, run_data)
+    write_run_data(tmp_path / "run_data.json.1", run_data)
+
+    fab_elements[0].placed = True
+    journal.append(0, fab_elements[0])
+
+    loaded = read_run_data(run_data_path, replay_journal=True)
+    assert loaded["fab_data"][0].placed
+
+    # Journal belongs to the corrupt file, not to the rotated copy
+    run_data_path.write_text("{")
+    loaded = read_run_data(run_data_path, replay_journal=True)
+    assert not loaded["fab_data"][0].placed
+
+
+@pytest.fixture
+def run_data_with_trajectories(run_data):
+    for elem in run_data["fab_data"]:
+        configurations = [Configuration.from_revolute_values([0.1] * 6)] * 3
+        frames = [elem.get_egress_frame(), elem.get_compressed_top_frame()]
+        elem.travel_trajectories = MinimalTrajectories(
+            [MinimalTrajectory(configurations)]
+        )
+        elem.place_trajectories = MinimalTrajectories([MinimalTrajectory(frames)])
+    return run_data
+
+
+def test_iter_fab_data(tmp_path, run_data_with_trajectories):
+    run_data_path = tmp_path / "run_data.json"
+    write_run_data(run_data_path, run_data_with_trajectories)
+
+    elements = list(iter_fab_data(run_data_path))
+    assert len(elements) == len(run_data_with_trajectories["fab_data"])
+
+    elem = elements[0]
+    assert isinstance(elem._place_trajectories, EncodedData)
+    assert elem.return_place_trajectories is None
+
+    place_trajectory = elem.place_trajectories[0]
+    assert isinstance(place_trajectory, MinimalTrajectory)
+    assert place_trajectory.trajectory_type == MinimalTrajectory.FRAME_TRAJECTORY
+    assert not isinstance(elem._place_trajectories, EncodedData)
+
+
+def test_read_run_data_lazy_round_trip(tmp_path, run_data_with_trajectories):
+    run_data_path = tmp_path / "run_data.json"
+    write_run_data(run_data_path, run_data_with_trajectories)
+
+    eager = read_run_data(run_data_path)
+    lazy = read_run_data(run_data_path, lazy=True)
+
+    def dumps(obj):
+        return json.dumps(obj, cls=DataEncoder, sort_keys=True)
+
+    assert dumps(lazy) == dumps(eager)
+
+
+def test_read_run_data_lazy_truncated(tmp_path, run_data_with_trajectories):
+    run_data_path = tmp_path / "run_data.json"
+    write_run_data(run_data_path, run_data_with_trajectories)
+    write_run_data(tmp_path / "run_data.json.1", run_data_with_trajectories)
+
+    # Without checksum only parsing can tell the file is truncated
+    os.remove(str(tmp_path / get_checksum_path("run_data.json")))
+    content = run_data_path.read_bytes()
+
+    for cut in (1, len(content) // 2, len(content) - 2, len(content) - 1):
+        run_data_path.write_bytes(content[:cut])
+
+        with pytest.raises(ValueError):
+            read_run_data(run_data_path, fallback=False, lazy=True)
+
+        loaded = read_run_data(run_data_path, lazy=True)
+        assert len(loaded["fab_data"]) == len(run_data_with_trajectories["fab_data"])
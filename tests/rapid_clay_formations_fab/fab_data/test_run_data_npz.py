@@ -0,0 +1,88 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+
+import pytest
+from compas.geometry import Frame
+from compas.utilities import DataEncoder
+from compas_fab.robots import Configuration
+
+from rapid_clay_formations_fab.fab_data import CYCLE_PHASES
+from rapid_clay_formations_fab.fab_data import PlaceElement
+from rapid_clay_formations_fab.fab_data import read_run_data
+from rapid_clay_formations_fab.fab_data import write_run_data
+from rapid_clay_formations_fab.robots import MinimalTrajectories
+from rapid_clay_formations_fab.robots import MinimalTrajectory
+
+
+@pytest.fixture
+def run_data():
+    elements = []
+    for i in range(4):
+        elem = PlaceElement(
+            Frame([i * 100.0, 50.0, 0.0], [0, 1, 0], [-1, 0, 0]),
+            "elem{}".format(i) if i % 2 else i,
+            radius=40.0 + i,
+            attrs={"density": 1.8, "frame": Frame.worldXY()},
+        )
+        elem.placed = bool(i % 2)
+        elem.cycle_time = 15.0 + i if elem.placed else None
+        if elem.placed:
+            elem.phase_times = {p: 2.5 for p in CYCLE_PHASES}
+            elem.phase_times["pick_approach"] = None
+
+        configurations = [
+            Configuration.from_revolute_values([0.1 * j] * 6) for j in range(3)
+        ]
+        elem.travel_trajectories = MinimalTrajectories(
+            [MinimalTrajectory(configurations), MinimalTrajectory([])]
+        )
+        elem.place_trajectories = MinimalTrajectories(
+            [MinimalTrajectory([elem.get_egress_frame(), elem.get_top_frame()])]
+        )
+        elements.append(elem)
+
+    return {"fab_data": elements, "conf_path": "conf.yaml", "pick_station": None}
+
+
+def test_npz_round_trip(tmp_path, run_data):
+    run_data_path = tmp_path / "run_data.npz"
+    write_run_data(run_data_path, run_data)
+
+    loaded = read_run_data(run_data_path)
+
+    # Trajectories are left packed until accessed
+    elem = loaded["fab_data"][0]
+    assert not isinstance(elem._travel_trajectories, MinimalTrajectories)
+    assert isinstance(elem.travel_trajectories, MinimalTrajectories)
+    assert isinstance(elem._travel_trajectories, MinimalTrajectories)
+
+    def encode(obj):
+        return json.loads(json.dumps(obj, cls=DataEncoder))
+
+    _assert_equal_data(encode(loaded), encode(run_data))
+
+    for elem, loaded_elem in zip(run_data["fab_data"], loaded["fab_data"]):
+        assert PlaceElement.from_data(loaded_elem.to_data()).id_ == elem.id_
+        assert loaded_elem.return_place_trajectories is None
+        assert (
+            loaded_elem.travel_trajectories[0].trajectory_type
+            == MinimalTrajectory.JOINT_TRAJECTORY
+        )
+
+
+def _assert_equal_data(a, b):
+    if isinstance(a, dict):
+        assert a.keys() == b.keys()
+        for key in a:
+            _assert_equal_data(a[key], b[key])
+    elif isinstance(a, list):
+        assert len(a) == len(b)
+        for a_, b_ in zip(a, b):
+            _assert_equal_data(a_, b_)
+    elif isinstance(a, float) or isinstance(b, float):
+        assert a == pytest.approx(b, abs=1e-12)
+    else:
+        assert a == b
@@ -0,0 +1,64 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import confuse
+import pytest
+from compas.geometry import Frame
+
+from rapid_clay_formations_fab.fab_data import ABB_RCF_CONF_TEMPLATE
+from rapid_clay_formations_fab.fab_data import PlaceElement
+from rapid_clay_formations_fab.robots import AbbRcfClient
+from rapid_clay_formations_fab.robots import PickStation
+
+
+class _Protocol(object):
+    def __init__(self):
+        self.sent = []
+
+    def send_ros_message(self, message):
+        self.sent.append(message)
+
+
+@pytest.fixture
+def client():
+    client = AbbRcfClient()
+    client._version_checked = True
+    client.topic._advertise_id = "advertise"
+
+    proto = _Protocol()
+    client.ros.factory.on_ready = lambda callback: callback(proto)
+    client.sent = proto.sent
+
+    return client
+
+
+@pytest.fixture
+def rob_conf():
+    conf = confuse.Configuration(
+        "rapid_clay_formations_fab",
+        modname="rapid_clay_formations_fab.fab_data.fab_conf",
+        read=False,
+    )
+    conf.read(user=False, defaults=True)
+    conf["run_data_path"] = "run_data.json"
+    conf["robot_client"]["skip_all_pick_movements"] = False
+    conf["robot_client"]["robot_movement"]["joint_positions"]["travel_trajectory"] = [
+        [-127.0, 54.0, 9.0, -2.0, 30.0, 7.0]
+    ]
+    return conf.get(ABB_RCF_CONF_TEMPLATE).robot_client
+
+
+@pytest.fixture
+def pick_station():
+    return PickStation(
+        [Frame([0, i * 100, 0], [1, 0, 0], [0, -1, 0]) for i in range(3)]
+    )
+
+
+@pytest.fixture
+def fab_elements():
+    return [
+        PlaceElement(Frame([i * 100, 500, 0], [1, 0, 0], [0, -1, 0]), str(i))
+        for i in range(4)
+    ]
@@ -0,0 +1,125 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+import time
+
+import compas_rrc
+import pytest
+
+from rapid_clay_formations_fab import metrics
+from rapid_clay_formations_fab.robots import abb_rcf_client
+
+
+def test_batch(client):
+    with client.batch():
+        client.send(compas_rrc.PrintText("1"))
+        future = client.send(compas_rrc.ReadWatch())
+        with client.batch():
+            client.send(compas_rrc.PrintText("2"))
+
+        assert client.sent == []
+        assert isinstance(future, compas_rrc.FutureResult)
+
+    assert [m["msg"]["instruction"] for m in client.sent] == [
+        "r_RRC_PrintText",
+        "r_RRC_ReadWatch",
+        "r_RRC_PrintText",
+    ]
+    assert [m["msg"]["sequence_id"] for m in client.sent] == [1, 2, 3]
+
+    client.send(compas_rrc.PrintText("3"))
+    assert len(client.sent) == 4
+
+
+def test_batch_flushed_before_wait(client):
+    with client.batch():
+        client.send(compas_rrc.PrintText("1"))
+        with pytest.raises(compas_rrc.TimeoutException):
+            client.send_and_wait(compas_rrc.Noop(), timeout=0.01)
+
+        assert len(client.sent) == 2
+
+
+@pytest.fixture
+def driver(monkeypatch, client):
+    """Fake abb-driver container, replying to pings when running."""
+
+    class Driver(object):
+        health = "running"
+        health_after_restart = "running"
+        restarts = 0
+
+        def get_health(self, name):
+            return self.health
+
+        def restart(self, name):
+            self.restarts += 1
+            self.health = self.health_after_restart
+
+        def reply(self, message):
+            if self.health == "running":
+                feedback = {"feedback_id": message["msg"]["sequence_id"]}
+                feedback["feedback"] = "Done"
+                threading.Timer(
+                    0.01, client.ros.emit, [client.feedback.name, feedback]
+                ).start()
+
+    driver = Driver()
+    monkeypatch.setattr(abb_rcf_client, "get_container_health", driver.get_health)
+    monkeypatch.setattr(abb_rcf_client, "restart_container", driver.restart)
+    monkeypatch.setattr(client, "_is_rosbridge_port_open", lambda: True)
+
+    proto_send = client.ros.factory.on_ready
+
+    def on_ready(callback):
+        proto = proto_send(callback)
+        driver.reply(client.sent[-1])
+        return proto
+
+    monkeypatch.setattr(client.ros.factory, "on_ready", on_ready)
+
+    return driver
+
+
+def test_ensure_connection(client, driver):
+    metrics.reset_metrics()
+
+    time_to_ready = client.ensure_connection(timeout_ping=1, deadline=2)
+
+    assert time_to_ready < 0.5
+    assert driver.restarts == 0
+    assert metrics.get_metrics()["robot.time_to_ready"] == [time_to_ready]
+
+
+def test_ensure_connection_restarts_stopped_driver(client, driver):
+    driver.health = "exited"
+
+    # Restarted without waiting for ping timeout
+    assert client.ensure_connection(timeout_ping=10, deadline=2) < 0.5
+    assert driver.restarts == 1
+
+
+def test_ensure_connection_deadline(client, driver):
+    # Docker not reachable and controller not replying
+    driver.health = driver.health_after_restart = "unknown"
+
+    start = time.monotonic()
+    with pytest.raises(compas_rrc.TimeoutException):
+        client.ensure_connection(timeout_ping=0.1, deadline=0.5)
+
+    assert time.monotonic() - start < 1
+    assert driver.restarts == 1
+
+    # Unanswered pings are not kept
+    assert client.futures == {}
+
+
+def test_ensure_connection_without_driver_container(client, driver):
+    driver.health = None
+
+    with pytest.raises(RuntimeError):
+        client.ensure_connection(timeout_ping=0.1, deadline=0.5)
+
+    assert driver.restarts == 0
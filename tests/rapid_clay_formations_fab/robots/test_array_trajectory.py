@@ -0,0 +1,157 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import json
+import math
+
+import compas_rrc
+import numpy as np
+import pytest
+from compas.geometry import Frame
+from compas.utilities import DataDecoder
+from compas.utilities import DataEncoder
+from compas_fab.robots import Configuration
+
+from rapid_clay_formations_fab.robots import ArrayTrajectory
+from rapid_clay_formations_fab.robots import MinimalTrajectory
+
+
+@pytest.fixture
+def frames():
+    return [
+        Frame([0, 0, 0], [1, 0, 0], [0, 1, 0]),
+        Frame([100, 0, 50], [0, 1, 0], [-1, 0, 0]),
+        Frame([200, 0, 50], [1, 0, 0], [0, 0, 1]),
+    ]
+
+
+@pytest.fixture
+def configurations():
+    return [Configuration.from_revolute_values([0.1 * i] * 6) for i in range(4)]
+
+
+def test_frame_trajectory(frames):
+    trajectory = ArrayTrajectory(frames)
+
+    assert trajectory.trajectory_type == MinimalTrajectory.FRAME_TRAJECTORY
+    assert trajectory.array.shape == (3, 7)
+    assert len(trajectory) == 3
+
+    for frame, expected in zip(trajectory, frames):
+        assert np.allclose(list(frame.point), list(expected.point))
+        assert np.allclose(list(frame.xaxis), list(expected.xaxis))
+        assert np.allclose(list(frame.yaxis), list(expected.yaxis))
+
+    instruction, points = trajectory.to_compas_rrc()
+    assert instruction is compas_rrc.MoveToRobtarget
+    assert np.allclose(list(points[1].xaxis), [0, 1, 0])
+
+
+def test_joint_trajectory(configurations):
+    trajectory = ArrayTrajectory(configurations)
+
+    assert trajectory.trajectory_type == MinimalTrajectory.JOINT_TRAJECTORY
+    assert trajectory.array.shape == (4, 6)
+    assert trajectory[-1].values == pytest.approx(configurations[-1].values)
+
+    instruction, points = trajectory.to_compas_rrc()
+    assert instruction is compas_rrc.MoveToJoints
+    assert list(points[1].values) == pytest.approx([math.degrees(0.1)] * 6)
+
+    _, expected = MinimalTrajectory(configurations).to_compas_rrc()
+    for joints, expected_joints in zip(points, expected):
+        assert list(joints.values) == pytest.approx(list(expected_joints.values))
+
+
+def test_slices_share_memory(configurations):
+    trajectory = ArrayTrajectory(configurations)
+
+    view = trajectory[1:3]
+    assert isinstance(view, ArrayTrajectory)
+    assert np.shares_memory(view.array, trajectory.array)
+
+    view[0] = Configuration.from_revolute_values([1.0] * 6)
+    assert trajectory[1].values == pytest.approx([1.0] * 6)
+
+    copy = trajectory.copy()
+    copy[0] = Configuration.from_revolute_values([2.0] * 6)
+    assert trajectory[0].values == pytest.approx([0.0] * 6)
+
+
+def test_mutations(configurations):
+    trajectory = ArrayTrajectory(configurations[:2])
+    trajectory.append(configurations[2])
+    trajectory.insert(0, configurations[3])
+    trajectory.extend(configurations[:1])
+    del trajectory[1]
+
+    values = [round(c.values[0], 6) for c in trajectory]
+    assert values == [0.3, 0.1, 0.2, 0.0]
+
+    trajectory[1:3] = configurations[:1]
+    trajectory.reverse()
+    assert [round(c.values[0], 6) for c in trajectory] == [0.0, 0.0, 0.3]
+
+    reversed_ = trajectory.reversed()
+    assert [round(c.values[0], 6) for c in reversed_] == [0.3, 0.0, 0.0]
+
+    with pytest.raises(IndexError):
+        del trajectory[3]
+
+
+def test_raises_on_mixed_types(frames, configurations):
+    trajectory = ArrayTrajectory(configurations)
+
+    with pytest.raises(RuntimeError):
+        trajectory.append(frames[0])
+    with pytest.raises(RuntimeError):
+        trajectory[0] = frames[0]
+    with pytest.raises(RuntimeError):
+        ArrayTrajectory(frames + configurations)
+
+    assert len(trajectory) == len(configurations)
+
+
+def test_type_changes_when_all_points_replaced(frames, configurations):
+    trajectory = ArrayTrajectory(frames)
+    trajectory[:] = configurations
+    assert trajectory.trajectory_type == MinimalTrajectory.JOINT_TRAJECTORY
+    assert trajectory.array.shape == (4, 6)
+
+    trajectory[::-1] = ArrayTrajectory(frames + frames[:1])
+    assert trajectory.trajectory_type == MinimalTrajectory.FRAME_TRAJECTORY
+    assert np.allclose(trajectory.array[-1], ArrayTrajectory(frames).array[0])
+
+    trajectory = ArrayTrajectory(configurations[:1])
+    trajectory[0] = frames[1]
+    assert trajectory.trajectory_type == MinimalTrajectory.FRAME_TRAJECTORY
+    assert trajectory.array.shape == (1, 7)
+
+    with pytest.raises(ValueError):
+        trajectory[::-1] = configurations[:2]
+    assert trajectory.trajectory_type == MinimalTrajectory.FRAME_TRAJECTORY
+
+
+def test_empty_trajectory(frames):
+    trajectory = ArrayTrajectory([])
+
+    with pytest.raises(RuntimeError):
+        trajectory.trajectory_type
+
+    trajectory.append(frames[0])
+    assert trajectory.trajectory_type == MinimalTrajectory.FRAME_TRAJECTORY
+
+    with pytest.raises(ValueError):
+        ArrayTrajectory(np.zeros((2, 6)))
+    with pytest.raises(ValueError):
+        ArrayTrajectory(np.zeros((2, 6)), MinimalTrajectory.FRAME_TRAJECTORY)
+
+
+def test_serialization(frames):
+    trajectory = ArrayTrajectory(frames)
+
+    decoded = json.loads(json.dumps(trajectory, cls=DataEncoder), cls=DataDecoder)
+
+    assert isinstance(decoded, ArrayTrajectory)
+    assert np.allclose(decoded.array, trajectory.array)
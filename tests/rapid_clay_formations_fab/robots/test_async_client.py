@@ -0,0 +1,102 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import asyncio
+import threading
+
+import compas_rrc
+import pytest
+
+from rapid_clay_formations_fab.robots import AsyncAbbRcfClient
+from rapid_clay_formations_fab.robots import wrap_future
+
+
+def _send_feedback(client, feedback="Done"):
+    """Emit feedback for last sent instruction as if received from ROS."""
+    sequence_id = client.sent[-1]["msg"]["sequence_id"]
+    msg = {"feedback_id": sequence_id, "feedback": feedback}
+    client.ros.emit(client.feedback.name, msg)
+
+
+def test_wrap_future():
+    async def wait(future):
+        loop = asyncio.get_running_loop()
+        wrapped = wrap_future(future)
+        loop.run_in_executor(None, future._set_result, "done")
+        return await wrapped
+
+    assert asyncio.run(wait(compas_rrc.FutureResult())) == "done"
+
+
+def test_wrap_future_done():
+    async def wait(future):
+        return await wrap_future(future)
+
+    future = compas_rrc.FutureResult()
+    future._set_result("done")
+    assert asyncio.run(wait(future)) == "done"
+
+
+def test_wrap_future_wakes_waiting_threads():
+    future = compas_rrc.FutureResult()
+    results = []
+    waiting = threading.Thread(target=lambda: results.append(future.result(5)))
+    waiting.start()
+
+    async def wait():
+        wrapped = wrap_future(future)
+        asyncio.get_running_loop().run_in_executor(None, future._set_result, "done")
+        return await wrapped
+
+    assert asyncio.run(wait()) == "done"
+    waiting.join(timeout=5)
+    assert results == ["done"]
+
+
+def test_ping(client):
+    async def ping():
+        async_client = AsyncAbbRcfClient(client)
+        task = asyncio.create_task(async_client.ping(timeout=1))
+        await asyncio.sleep(0)
+
+        threading.Thread(target=_send_feedback, args=(client,)).start()
+        await task
+
+    asyncio.run(ping())
+    assert client.sent[-1]["msg"]["instruction"] == "r_RRC_Noop"
+
+
+def test_ping_timeout(client):
+    async_client = AsyncAbbRcfClient(client)
+    with pytest.raises(compas_rrc.TimeoutException):
+        asyncio.run(async_client.ping(timeout=0.01))
+
+
+def test_feedback(client):
+    async def read_feedback():
+        async_client = AsyncAbbRcfClient(client)
+        received = []
+
+        async for msg in async_client.feedback():
+            received.append(msg["feedback"])
+            if len(received) == 2:
+                break
+            await asyncio.sleep(0)
+
+        return received
+
+    async def run():
+        task = asyncio.create_task(read_feedback())
+        await asyncio.sleep(0)
+
+        for feedback in ("first", "second"):
+            client.send(compas_rrc.Noop(feedback_level=compas_rrc.FeedbackLevel.DONE))
+            _send_feedback(client, feedback)
+
+        return await task
+
+    listeners = client.ros.factory.listeners(client.feedback.name)
+
+    assert asyncio.run(run()) == ["first", "second"]
+    assert client.ros.factory.listeners(client.feedback.name) == listeners
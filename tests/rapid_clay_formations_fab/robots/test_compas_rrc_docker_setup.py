@@ -0,0 +1,41 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import pytest
+
+from rapid_clay_formations_fab.robots import DRIVER_IMAGE_NAME
+from rapid_clay_formations_fab.robots import DRIVER_STACK_CONTAINER_NAMES
+from rapid_clay_formations_fab.robots import ROBOT_IPS
+from rapid_clay_formations_fab.robots import compas_rrc_docker_setup
+from rapid_clay_formations_fab.robots import is_driver_running
+
+
+@pytest.fixture
+def containers(monkeypatch):
+    """Inspect data of driver containers, as started by docker-compose up."""
+    containers = {
+        name: {
+            "State": {"Status": "running", "Running": True},
+            "Config": {"Image": DRIVER_IMAGE_NAME},
+            "Args": ["--wait", "robot_ip:={}".format(ROBOT_IPS["virtual"])],
+        }
+        for name in DRIVER_STACK_CONTAINER_NAMES
+    }
+    monkeypatch.setattr(compas_rrc_docker_setup, "get_container_attrs", containers.get)
+    return containers
+
+
+def test_is_driver_running(containers):
+    assert is_driver_running(ROBOT_IPS["virtual"])
+    assert not is_driver_running(ROBOT_IPS["real"])
+
+
+def test_is_driver_running_stopped(containers):
+    del containers["ros-bridge-driver"]
+    assert not is_driver_running(ROBOT_IPS["virtual"])
+
+
+def test_is_driver_running_other_image(containers):
+    containers["abb-driver"]["Config"]["Image"] = "other:latest"
+    assert not is_driver_running(ROBOT_IPS["virtual"])
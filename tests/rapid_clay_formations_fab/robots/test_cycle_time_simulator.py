@@ -0,0 +1,89 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import compas_rrc
+import pytest
+from compas.geometry import Frame
+
+from rapid_clay_formations_fab.robots import CycleTimeModel
+from rapid_clay_formations_fab.robots import CycleTimeSimulator
+from rapid_clay_formations_fab.robots import estimate_cycle_times
+
+
+@pytest.fixture
+def simulator(rob_conf):
+    # Start at origin of frames, no accel/jerk limit except where set
+    simulator = CycleTimeSimulator(
+        rob_conf,
+        model=CycleTimeModel(tcp_accel=1000.0, tcp_jerk=1e12),
+        forward_kinematics=lambda joints: Frame.worldXY(),
+    )
+    simulator.set_max_speed(100, 1000)
+    simulator.set_acceleration(100, 100)
+    return simulator
+
+
+def _move(x, speed, zone):
+    frame = Frame([x, 0, 0], [1, 0, 0], [0, 1, 0])
+    return compas_rrc.MoveToRobtarget(
+        frame, [0] * 6, speed, zone, motion_type=compas_rrc.Motion.LINEAR
+    ).msg
+
+
+def test_motion_stopping(simulator):
+    # 1000 mm at 100 mm/s from and to rest: 10 s cruising and 2 * 0.05 s ramps
+    seconds = simulator.run_program([_move(1000, 100, compas_rrc.Zone.FINE)])
+    assert seconds == pytest.approx(10.1)
+    assert simulator.stop() == 0
+
+    # Too short to reach speed, 2 * sqrt(d / a)
+    seconds = simulator.run_program([_move(1010, 100, compas_rrc.Zone.FINE)])
+    assert seconds == pytest.approx(2 * (10 / 1000) ** 0.5)
+
+
+def test_fly_by_and_wait(simulator):
+    program = [
+        _move(500, 100, compas_rrc.Zone.Z10),
+        _move(1000, 50, compas_rrc.Zone.Z10),
+        compas_rrc.WaitTime(2).msg,
+    ]
+    # Ramp up at start, no stop between, stop before WaitTime
+    expected = 0.05 + 5 + 10 + 0.025 + 2
+    assert simulator.run_program(program) == pytest.approx(expected)
+
+    # Program not ending in FINE continues moving
+    seconds = simulator.run_program([_move(0, 100, compas_rrc.Zone.Z10)])
+    assert seconds == pytest.approx(0.05 + 10)
+    assert simulator.stop() == pytest.approx(0.05)
+
+
+def test_speed_override(simulator):
+    simulator.run_program([compas_rrc.SetMaxSpeed(50, 1000).msg])
+    seconds = simulator.run_program([_move(1000, 100, compas_rrc.Zone.FINE)])
+    assert seconds == pytest.approx(20 + 0.05)
+
+
+def test_estimate_cycle_times(rob_conf, pick_station, fab_elements):
+    fab_elements[1].skip = True
+    estimate = estimate_cycle_times(rob_conf, pick_station, fab_elements)
+
+    assert estimate.cycle_times[1] is None
+    assert all(t > 0 for i, t in enumerate(estimate.cycle_times) if i != 1)
+    assert estimate.total == pytest.approx(
+        sum(estimate.cycle_times[::2]) + estimate.cycle_times[3]
+    )
+    # Default travel trajectory is in joint space, pick and place in frames
+    assert estimate.untimed_transitions > 0
+
+    # Pick station is not modified
+    assert pick_station.get_next_pick_idx() == 0
+
+    rob_conf["skip_all_pick_movements"] = True
+    without_pick = estimate_cycle_times(rob_conf, pick_station, fab_elements)
+    assert without_pick.total < estimate.total
+
+    rob_conf["skip_all_pick_movements"] = False
+    rob_conf.robot_movement.speed["place"] /= 2
+    slower = estimate_cycle_times(rob_conf, pick_station, fab_elements)
+    assert slower.total > estimate.total
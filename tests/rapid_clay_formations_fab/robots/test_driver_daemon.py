@@ -0,0 +1,86 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+
+import compas_rrc
+import pytest
+import roslibpy
+
+from rapid_clay_formations_fab.robots import AbbRcfClient
+from rapid_clay_formations_fab.robots import DriverDaemon
+from rapid_clay_formations_fab.robots import DriverDaemonConnection
+
+
+@pytest.fixture
+def daemon(client):
+    """Daemon serving in background, its client publishing to fake protocol."""
+    daemon = DriverDaemon(client, "virtual", port=0)
+    thread = threading.Thread(target=daemon.serve_forever)
+    thread.start()
+
+    yield daemon
+
+    daemon.shutdown()
+    thread.join()
+
+
+def test_attach_without_daemon(daemon):
+    port = daemon.port
+    daemon.shutdown()
+
+    assert DriverDaemonConnection.attach("virtual", port=port) is None
+
+
+def test_attach_other_controller(daemon):
+    with pytest.raises(RuntimeError):
+        DriverDaemonConnection.attach("real", port=daemon.port)
+
+
+def test_feedback_routed(daemon):
+    daemon.client.counter.increment(10)  # Daemon's own instructions
+
+    connection = DriverDaemonConnection.attach("virtual", port=daemon.port)
+    with AbbRcfClient(daemon=connection) as client:
+        published = threading.Event()
+        on_ready = daemon.client.ros.factory.on_ready
+
+        def notify_on_ready(callback):
+            on_ready(callback)
+            published.set()
+
+        daemon.client.ros.factory.on_ready = notify_on_ready
+
+        future = client.send(compas_rrc.Noop(feedback_level=1))
+        assert published.wait(1)
+
+        msg = daemon.client.sent[-1]["msg"]
+        assert msg["instruction"] == "r_RRC_Noop"
+        assert msg["sequence_id"] == 11
+
+        feedback = {"feedback_id": 11, "feedback": "Done"}
+        daemon.client.ros.emit(daemon.client.feedback.name, feedback)
+
+        assert future.result(timeout=1) == "Done"
+
+
+def test_ensure_connection(daemon, monkeypatch):
+    monkeypatch.setattr(daemon.client, "ensure_connection", lambda **kwargs: 0.5)
+
+    connection = DriverDaemonConnection.attach("virtual", port=daemon.port)
+    with AbbRcfClient(daemon=connection) as client:
+        assert client.ensure_connection() == 0.5
+
+
+def test_attached_client_does_not_connect(daemon, monkeypatch):
+    def connect(self):
+        raise AssertionError("Attached client connected to rosbridge.")
+
+    monkeypatch.setattr(roslibpy.Ros, "connect", connect)
+
+    connection = DriverDaemonConnection.attach("virtual", port=daemon.port)
+    with AbbRcfClient(daemon=connection) as client:
+        assert not isinstance(client.ros, roslibpy.Ros)
+        assert not client.feedback.is_subscribed
+        assert not client.topic.is_advertised
@@ -0,0 +1,93 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+
+import compas_rrc
+import pytest
+from compas.geometry import Frame
+
+from rapid_clay_formations_fab.fab_data import PlaceElement
+from rapid_clay_formations_fab.robots import ElementPipeline
+from rapid_clay_formations_fab.robots import get_phase_times
+
+
+@pytest.fixture
+def elements():
+    elements = []
+    for i in range(4):
+        elem = PlaceElement(Frame.worldXY(), str(i))
+        elem.cycle_time_future = compas_rrc.FutureResult()
+        elements.append(elem)
+    return elements
+
+
+@pytest.fixture
+def pipeline(elements):
+    pipeline = ElementPipeline()
+    for i, elem in enumerate(elements):
+        pipeline.add(i, elem)
+    return pipeline
+
+
+def test_wait(pipeline, elements):
+    # Done elements are yielded even if not waited on
+    elements[0].cycle_time_future._set_result(10.0)
+    assert [i for i, _ in pipeline.wait(max_in_flight=3)] == [0]
+    assert elements[0].cycle_time == 10.0
+    assert elements[0].time_placed
+
+    # Waits in order
+    timer = threading.Timer(0.05, elements[1].cycle_time_future._set_result, [11.0])
+    timer.start()
+    elements[2].cycle_time_future._set_result(12.0)
+    assert [i for i, _ in pipeline.wait(max_in_flight=1)] == [1, 2]
+    assert len(pipeline) == 1
+
+    elements[3].cycle_time_future._set_result(13.0)
+    assert [e.cycle_time for _, e in pipeline.wait()] == [13.0]
+    assert len(pipeline) == 0
+
+
+def test_wait_sets_phase_times(pipeline, elements):
+    phase_ends = {"travel": 9.5, "egress_wait": 10.0, "press": 12.25}
+    elements[0].phase_futures = {}
+    for phase, end in phase_ends.items():
+        elements[0].phase_futures[phase] = compas_rrc.FutureResult()
+        elements[0].phase_futures[phase]._set_result(end)
+    elements[0].cycle_time_future._set_result(20.0)
+
+    assert [i for i, _ in pipeline.wait(max_in_flight=3)] == [0]
+    assert elements[0].phase_times == get_phase_times(phase_ends, 20.0)
+    assert elements[1].phase_times is None
+
+
+def test_get_phase_times():
+    phase_ends = {
+        "pick_approach": 3.0,
+        "needles_extend": 3.5,
+        "travel": 9.5,
+        "egress_wait": 10.0,
+        "press": 12.25,
+    }
+    assert get_phase_times(phase_ends, 20.0) == {
+        "pick_approach": 3.0,
+        "needles_extend": 0.5,
+        "travel": 6.0,
+        "egress_wait": 0.5,
+        "press": 2.25,
+        "return": 7.75,
+    }
+
+    # Pick movement skipped
+    del phase_ends["pick_approach"], phase_ends["needles_extend"]
+    phase_times = get_phase_times(phase_ends, 20.0)
+    assert phase_times["pick_approach"] is None
+    assert phase_times["needles_extend"] is None
+    assert phase_times["travel"] == 9.5
+
+
+def test_add_without_future():
+    with pytest.raises(ValueError):
+        ElementPipeline().add(0, PlaceElement(Frame.worldXY(), "0"))
@@ -0,0 +1,28 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import threading
+import time
+
+import compas_rrc
+import pytest
+
+from rapid_clay_formations_fab.robots import wait_for_future
+
+
+def test_wait_for_future():
+    future = compas_rrc.FutureResult()
+    timer = threading.Timer(0.05, future._set_result, ["done"])
+
+    start = time.monotonic()
+    timer.start()
+    assert wait_for_future(future) == "done"
+
+    # Woken up by result, not by interrupt check interval
+    assert time.monotonic() - start < 0.15
+
+
+def test_wait_for_future_timeout():
+    with pytest.raises(compas_rrc.TimeoutException):
+        wait_for_future(compas_rrc.FutureResult(), timeout=0.05)
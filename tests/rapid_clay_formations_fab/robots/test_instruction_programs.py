@@ -0,0 +1,90 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from rapid_clay_formations_fab.fab_data import CYCLE_PHASES
+from rapid_clay_formations_fab.robots import AbbRcfFabricationClient
+from rapid_clay_formations_fab.robots import InstructionPrograms
+from rapid_clay_formations_fab.robots import get_programs_path
+
+
+def _get_sent_msgs(rob_conf, pick_station, fab_elements):
+    client = AbbRcfFabricationClient(rob_conf, pick_station)
+    client._version_checked = True
+    sent = []
+    client.send = lambda instruction: sent.append(instruction.msg)
+
+    pick_msgs = []
+    for _ in range(len(pick_station.pick_frames) + 1):
+        client.pick_element()
+        pick_msgs.append(sent[:])
+        del sent[:]
+
+    place_msgs = []
+    for elem in fab_elements:
+        client.place_element(elem)
+        place_msgs.append(sent[:])
+        del sent[:]
+
+    return pick_msgs, place_msgs
+
+
+def test_compile(rob_conf, pick_station, fab_elements):
+    programs = InstructionPrograms.compile(rob_conf, pick_station, fab_elements)
+    pick_msgs, place_msgs = _get_sent_msgs(
+        rob_conf, pick_station.copy(deep=True), fab_elements
+    )
+
+    assert [programs.get_pick_program(pick_station) for _ in pick_msgs] == pick_msgs
+    assert programs.place_programs == place_msgs
+
+
+def test_load_or_compile(tmp_path, monkeypatch, rob_conf, pick_station, fab_elements):
+    path = get_programs_path(tmp_path / "run_data.json")
+    programs = InstructionPrograms.load_or_compile(
+        path, rob_conf, pick_station, fab_elements
+    )
+
+    # Run specific data is not part of key
+    fab_elements[0].placed = True
+    with monkeypatch.context() as m:
+        m.setitem(rob_conf, "look_ahead", rob_conf.look_ahead + 1)
+        m.setattr(InstructionPrograms, "compile", None)
+        loaded = InstructionPrograms.load_or_compile(
+            path, rob_conf, pick_station, fab_elements
+        )
+    assert loaded.data == programs.data
+
+    fab_elements[0].height = 50
+    recompiled = InstructionPrograms.load_or_compile(
+        path, rob_conf, pick_station, fab_elements
+    )
+    assert recompiled.key != programs.key
+    assert recompiled.place_programs[0] != programs.place_programs[0]
+    assert InstructionPrograms.load(path).key == recompiled.key
+
+
+def test_phase_futures(rob_conf, pick_station, fab_elements):
+    rob_conf["record_phase_times"] = True
+    programs = InstructionPrograms.compile(rob_conf, pick_station, fab_elements)
+
+    client = AbbRcfFabricationClient(rob_conf, pick_station)
+    client._version_checked = True
+    sent = []
+    client._publish = sent.extend
+
+    with client.batch():
+        pick_futures = client.send_program(programs.get_pick_program(pick_station))
+        place_futures = client.send_program(programs.place_programs[0])
+    phase_futures = client.get_phase_futures(pick_futures, place_futures)
+
+    assert list(phase_futures) == list(CYCLE_PHASES[:-1])
+
+    # Watch readings are parsed as seconds
+    for msg in sent:
+        if msg["feedback_level"] > 0:
+            client.ros.emit(
+                client.feedback.name,
+                {"feedback_id": msg["sequence_id"], "float_values": [1.2345]},
+            )
+    assert [f.result(0) for f in phase_futures.values()] == [1.234] * 5
@@ -0,0 +1,110 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import importlib
+import os
+import threading
+
+import compas_rrc
+import confuse
+import pytest
+from compas.geometry import Frame
+
+from rapid_clay_formations_fab.fab_data import ABB_RCF_CONF_TEMPLATE
+from rapid_clay_formations_fab.fab_data import get_journal_path
+from rapid_clay_formations_fab.fab_data import read_run_data
+from rapid_clay_formations_fab.robots import AbbRcfClient
+from rapid_clay_formations_fab.robots import MockController
+
+# Module, the package exports the function under the same name
+fabrication_script = importlib.import_module(
+    "rapid_clay_formations_fab.robots._scripts.fabrication"
+)
+
+
+def test_feedback():
+    controller = MockController(time_scale=0)
+    with AbbRcfClient(daemon=controller) as client:
+        client.ping(timeout=1)
+
+        frame = Frame([100, 200, 300], [0, 1, 0], [1, 0, 0])
+        client.send(compas_rrc.StartWatch())
+        client.send(compas_rrc.MoveToFrame(frame, 100, compas_rrc.Zone.FINE))
+        client.send(compas_rrc.WaitTime(2.5))
+        client.send(compas_rrc.StopWatch())
+
+        assert client.send_and_wait(compas_rrc.ReadWatch(), timeout=1) == 2.5
+        assert client.send_and_wait(compas_rrc.GetFrame(), timeout=1) == frame
+
+        joints = compas_rrc.RobotJoints(10, 20, 30, 40, 50, 60)
+        client.send(compas_rrc.MoveToJoints(joints, [], 100, compas_rrc.Zone.FINE))
+        received, _ = client.send_and_wait(compas_rrc.GetJoints(), timeout=1)
+        assert list(received) == list(joints)
+
+    counters = controller.get_counters()
+    assert counters["received"] == counters["executed"] == 9
+    assert counters["feedback"] == 4
+    assert counters["controller_time"] == 2.5
+    assert counters["instructions"]["r_RRC_WaitTime"] == 1
+
+
+def test_back_pressure():
+    controller = MockController(buffer_size=1, default_delay=0.02)
+    controller.start(lambda msg: None)
+
+    msgs = [compas_rrc.Noop().msg for _ in range(5)]
+    for i, msg in enumerate(msgs):
+        msg["sequence_id"] = i
+
+    publisher = threading.Thread(target=controller.publish, args=[msgs])
+    publisher.start()
+    publisher.join(1)
+
+    assert controller.wait_until_idle(timeout=1)
+    controller.close()
+
+    counters = controller.get_counters()
+    assert counters["executed"] == 5
+    assert counters["max_queue_depth"] == 1
+    assert counters["blocked"] > 0
+
+
+@pytest.fixture
+def run_conf(tmp_path):
+    conf = confuse.Configuration(
+        "rapid_clay_formations_fab",
+        modname="rapid_clay_formations_fab.fab_data.fab_conf",
+        read=False,
+    )
+    conf.read(user=False, defaults=True)
+    conf["run_data_path"] = tmp_path / "run_data.json"
+    conf["logfile"] = str(tmp_path / "fab.log")
+    conf["robot_client"]["skip_all_pick_movements"] = False
+    conf["robot_client"]["look_ahead"] = 2
+    conf["robot_client"]["robot_movement"]["joint_positions"]["travel_trajectory"] = [
+        [-127.0, 54.0, 9.0, -2.0, 30.0, 7.0]
+    ]
+    return conf.get(ABB_RCF_CONF_TEMPLATE)
+
+
+def test_fabrication(monkeypatch, run_conf, pick_station, fab_elements):
+    controller = MockController(
+        delays={"r_RRC_MoveTo": 0.5, "r_RRC_MoveToJoints": 1.0}, time_scale=0
+    )
+    monkeypatch.setattr(fabrication_script, "connect_driver", lambda _: controller)
+    monkeypatch.setattr(fabrication_script, "_edit_fab_data", lambda _: None)
+
+    run_data = {"fab_data": fab_elements, "pick_station": pick_station}
+    fabrication_script.fabrication(run_conf, run_data)
+
+    assert all(elem.placed for elem in fab_elements)
+    assert all(elem.cycle_time > 0 for elem in fab_elements)
+    assert controller.get_counters()["stops"] == 1
+
+    # Progress is in run_data file too, not only in the copy labeled done
+    run_data_path = run_conf.run_data_path
+    assert run_data_path.with_name("run_data.json.99done").exists()
+    assert not os.path.exists(get_journal_path(run_data_path))
+    saved = read_run_data(run_data_path, fallback=False)
+    assert all(elem.placed for elem in saved["fab_data"])
@@ -4,6 +4,7 @@
 
 import pytest
 from compas.geometry import Frame
+from compas.geometry import Translation
 
 from rapid_clay_formations_fab.fab_data import FabricationElement
 from rapid_clay_formations_fab.robots import PickStation
@@ -82,3 +83,22 @@ def test_from_data(station2, station2_data):
 def test_to_from_data(station2_data):
     station = PickStation.from_data(station2_data)
     assert station2_data == station.to_data()
+
+
+def test_copy(station1):
+    station1.get_next_pick_elem()
+
+    copy = station1.copy()
+    shallow_copy = station1.copy(deep=False)
+
+    assert copy.pick_frames[0] is not station1.pick_frames[0]
+    assert shallow_copy.pick_frames[0] is station1.pick_frames[0]
+    assert copy.to_data() == station1.to_data()
+    assert copy.get_next_pick_elem().location == station1.pick_frames[0]
+
+
+def test_transform_copy(station1):
+    point = list(station1.pick_frames[0].point)
+
+    station1.copy().transform(Translation.from_vector([0, 0, 100]))
+    assert list(station1.pick_frames[0].point) == point
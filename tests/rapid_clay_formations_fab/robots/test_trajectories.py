@@ -0,0 +1,93 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import pytest
+from compas.geometry import Frame
+from compas_fab.robots import Configuration
+
+from rapid_clay_formations_fab.robots import MinimalTrajectories
+from rapid_clay_formations_fab.robots import MinimalTrajectory
+
+
+@pytest.fixture
+def frames():
+    return [Frame([i, 0, 0], [1, 0, 0], [0, 1, 0]) for i in range(3)]
+
+
+@pytest.fixture
+def configurations():
+    return [Configuration.from_revolute_values([0.1 * i] * 6) for i in range(3)]
+
+
+def test_trajectory_type(frames, configurations):
+    assert MinimalTrajectory(frames).trajectory_type == (
+        MinimalTrajectory.FRAME_TRAJECTORY
+    )
+    assert MinimalTrajectory(configurations).trajectory_type == (
+        MinimalTrajectory.JOINT_TRAJECTORY
+    )
+
+    with pytest.raises(RuntimeError):
+        MinimalTrajectory([]).trajectory_type
+    with pytest.raises(RuntimeError):
+        MinimalTrajectory(frames + configurations)
+    with pytest.raises(NotImplementedError):
+        MinimalTrajectory([[0, 0, 0]])
+
+
+def test_raises_on_mixed_types_when_mutated(frames, configurations):
+    trajectory = MinimalTrajectory(configurations)
+
+    with pytest.raises(RuntimeError):
+        trajectory.append(frames[0])
+    with pytest.raises(RuntimeError):
+        trajectory[0] = frames[0]
+    with pytest.raises(RuntimeError):
+        trajectory[1:] = frames[:1]
+    with pytest.raises(RuntimeError):
+        trajectory.extend(frames)
+
+    assert trajectory.points == configurations
+
+    trajectory[1:] = configurations[:1]
+    trajectory.reverse()
+    assert trajectory.points == [configurations[0], configurations[0]]
+    assert trajectory.trajectory_type == MinimalTrajectory.JOINT_TRAJECTORY
+
+
+def test_type_changes_when_all_points_replaced(frames, configurations):
+    trajectory = MinimalTrajectory(frames)
+    trajectory[:] = configurations
+    assert trajectory.points == configurations
+    assert trajectory.trajectory_type == MinimalTrajectory.JOINT_TRAJECTORY
+
+    trajectory = MinimalTrajectory(frames[:1])
+    trajectory[0] = configurations[0]
+    assert trajectory.trajectory_type == MinimalTrajectory.JOINT_TRAJECTORY
+
+    with pytest.raises(RuntimeError):
+        trajectory[:] = frames + configurations
+    with pytest.raises(ValueError):
+        trajectory[::-1] = frames[:2]
+    assert trajectory.points == configurations[:1]
+    assert trajectory.trajectory_type == MinimalTrajectory.JOINT_TRAJECTORY
+
+
+def test_type_follows_points(frames, configurations):
+    trajectory = MinimalTrajectory([])
+    trajectory.append(frames[0])
+    assert trajectory.trajectory_type == MinimalTrajectory.FRAME_TRAJECTORY
+
+    del trajectory[:]
+    trajectory.extend(configurations)
+    assert trajectory.trajectory_type == MinimalTrajectory.JOINT_TRAJECTORY
+
+    trajectory.points = frames
+    assert trajectory.trajectory_type == MinimalTrajectory.FRAME_TRAJECTORY
+
+    copy = MinimalTrajectories([trajectory]).reversed_recursively()[0]
+    assert copy.trajectory_type == MinimalTrajectory.FRAME_TRAJECTORY
+
+    decoded = MinimalTrajectory.from_data({"points": configurations})
+    assert decoded.trajectory_type == MinimalTrajectory.JOINT_TRAJECTORY
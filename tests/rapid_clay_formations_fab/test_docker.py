@@ -0,0 +1,77 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import docker
+import pytest
+
+from rapid_clay_formations_fab import docker as rcf_docker
+from rapid_clay_formations_fab import metrics
+from rapid_clay_formations_fab.robots import DOCKER_COMPOSE_PATHS
+
+
+class _Container(object):
+    def __init__(self, name, attrs):
+        self.name = name
+        self.attrs = attrs
+        self.restarts = 0
+
+    def restart(self):
+        self.restarts += 1
+
+
+class _Client(object):
+    """Docker client keeping containers in a dict."""
+
+    def __init__(self, containers):
+        self.by_name = {c.name: c for c in containers}
+        self.containers = self
+
+    def get(self, name):
+        if name not in self.by_name:
+            raise docker.errors.NotFound(name)
+        return self.by_name[name]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    client = _Client(
+        [
+            _Container("abb-driver", {"State": {"Status": "running"}}),
+            _Container(
+                "ros-master",
+                {"State": {"Status": "running", "Health": {"Status": "healthy"}}},
+            ),
+        ]
+    )
+    monkeypatch.setattr(rcf_docker, "get_docker_client", lambda: client)
+    return client
+
+
+def test_compose_up_runs_docker_compose(monkeypatch):
+    commands = []
+    monkeypatch.setattr(rcf_docker, "_run", lambda cmd, **kwargs: commands.append(cmd))
+    metrics.reset_metrics()
+
+    path = DOCKER_COMPOSE_PATHS["driver"]
+    rcf_docker.compose_up(path, env_vars={"ROBOT_IP": "1.2.3.4"}, print_output=False)
+    rcf_docker.compose_down(path, print_output=False)
+
+    assert "docker-compose" in commands[0]
+    assert "up" in commands[0]
+    assert "ROBOT_IP=1.2.3.4" in commands[0]
+    assert commands[1][-1] == "down"
+
+    assert len(metrics.get_metrics()["docker.compose_up"]) == 1
+    assert len(metrics.get_metrics()["docker.compose_down"]) == 1
+
+
+def test_container_health(client):
+    assert rcf_docker.get_container_health("abb-driver") == "running"
+    assert rcf_docker.get_container_health("ros-master") == "healthy"
+    assert rcf_docker.get_container_health("missing") is None
+
+
+def test_restart_container(client):
+    rcf_docker.restart_container("abb-driver")
+    assert client.by_name["abb-driver"].restarts == 1
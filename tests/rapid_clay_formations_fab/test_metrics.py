@@ -0,0 +1,39 @@
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import pytest
+
+from rapid_clay_formations_fab import metrics
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    metrics.reset_metrics()
+
+
+def test_metrics():
+    metrics.increment("count")
+    metrics.increment("count", 2)
+    metrics.record("time", 1.5)
+
+    with pytest.raises(RuntimeError):
+        with metrics.timed("time"):
+            raise RuntimeError
+
+    result = metrics.get_metrics()
+    assert result["count"] == 3
+    assert result["time"][0] == 1.5
+    assert len(result["time"]) == 2
+
+
+def test_log_metrics(caplog):
+    metrics.increment("count")
+    metrics.record("time", 1.0)
+    metrics.record("time", 3.0)
+
+    with caplog.at_level("INFO", logger=metrics.__name__):
+        metrics.log_metrics()
+
+    assert "count: 1" in caplog.text
+    assert "time: 2 samples, mean 2.000, max 3.000" in caplog.text